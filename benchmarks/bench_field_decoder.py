@@ -0,0 +1,124 @@
+"""
+응답 필드 디코더 마이크로벤치마크
+기존 문자열 처리 방식(legacy_*) 대비 FieldDecoder 변환 시간 비교
+
+실행: python -m benchmarks.bench_field_decoder
+"""
+
+import random
+import timeit
+from typing import Dict, List
+
+from src.kiwoom.rest_client import _QUOTE_FIELDS as QUOTE_FIELDS, _RANKING_FIELDS as RANKING_FIELDS
+
+
+def make_ranking_rows(count: int = 100) -> List[Dict[str, str]]:
+    """거래대금 상위(ka10032) 형식 응답 행"""
+    rng = random.Random(0)
+    rows = []
+    for i in range(count):
+        sign = rng.choice(["+", "-"])
+        rows.append({
+            "stk_cd": f"{rng.randint(0, 999999):06d}",
+            "now_rank": str(i + 1),
+            "pred_rank": str(rng.randint(1, 200)),
+            "stk_nm": f"종목{i}",
+            "cur_prc": f"{sign}{rng.randint(1000, 500000)}",
+            "pred_pre_sig": "2" if sign == "+" else "5",
+            "pred_pre": f"{sign}{rng.randint(10, 5000)}",
+            "flu_rt": f"{sign}{rng.uniform(0, 30):.2f}",
+            "sel_bid": f"{sign}{rng.randint(1000, 500000)}",
+            "buy_bid": f"{sign}{rng.randint(1000, 500000)}",
+            "now_trde_qty": str(rng.randint(1000, 50_000_000)),
+            "pred_trde_qty": str(rng.randint(1000, 50_000_000)),
+            "trde_prica": str(rng.randint(100, 2_000_000)),
+        })
+    return rows
+
+
+def make_quote() -> Dict[str, str]:
+    """주식기본정보(ka10001) 형식 응답"""
+    return {
+        "stk_cd": "005930", "stk_nm": "삼성전자", "cur_prc": "+70100", "flu_rt": "+0.86",
+        "trde_qty": "9263135", "high_pric": "+70500", "low_pric": "-69600", "open_pric": "-69800",
+    }
+
+
+def legacy_parse_ranking(items: List[Dict[str, str]]) -> List[Dict]:
+    """기존 _parse_ranking_result 방식"""
+    parsed = []
+    for item in items:
+        cur_prc = item.get("cur_prc", "0").replace("+", "").replace("-", "")
+        trde_qty = item.get("trde_qty", item.get("now_trde_qty", "0"))
+        trde_amt_str = item.get("trde_amt", item.get("trde_prica", "0"))
+        try:
+            price = int(cur_prc) if cur_prc else 0
+            volume = int(trde_qty) if trde_qty else 0
+            trading_value_raw = int(trde_amt_str) if trde_amt_str else 0
+            if "trde_prica" in item:
+                trading_value = trading_value_raw * 1_000_000
+            else:
+                trading_value = trading_value_raw
+        except (ValueError, TypeError):
+            continue
+        parsed.append({
+            "code": item.get("stk_cd", ""),
+            "name": item.get("stk_nm", ""),
+            "price": price,
+            "price_change": float(item.get("flu_rt", "0").replace("+", "").replace("-", "")),
+            "volume": volume,
+            "trading_value": trading_value,
+            "status": ""
+        })
+    return parsed
+
+
+def legacy_quote(result: Dict[str, str]) -> Dict:
+    """기존 get_quote 정규화 방식"""
+    current = int(result.get("cur_prc", "0").replace("+", "").replace("-", ""))
+    high = int(result.get("high_pric", "0").replace("+", "").replace("-", ""))
+    return {
+        "code": result.get("stk_cd", ""),
+        "name": result.get("stk_nm", ""),
+        "price": int(result.get("cur_prc", "0").replace("+", "").replace("-", "")),
+        "change": float(result.get("flu_rt", "0").replace("+", "").replace("-", "")),
+        "volume": int(result.get("trde_qty", "0")),
+        "high": int(result.get("high_pric", "0").replace("+", "").replace("-", "")),
+        "low": int(result.get("low_pric", "0").replace("+", "").replace("-", "")),
+        "open": int(result.get("open_pric", "0").replace("+", "").replace("-", "")),
+        "high_proximity": (current / high) * 100 if high else 0,
+        "strength": 100
+    }
+
+
+def decoder_quote(result: Dict[str, str]) -> Dict:
+    quote = QUOTE_FIELDS.decode(result)
+    quote["high_proximity"] = (quote["price"] / quote["high"]) * 100 if quote["high"] else 0
+    quote["strength"] = 100
+    return quote
+
+
+def bench(label: str, func, arg, number: int) -> float:
+    best = min(timeit.repeat(lambda: func(arg), number=number, repeat=5))
+    per_call = best / number * 1e6
+    print(f"  {label:<28} {per_call:10.2f} us/call")
+    return per_call
+
+
+def main():
+    rows = make_ranking_rows(100)
+    quote = make_quote()
+
+    print("순위 응답 100행 파싱")
+    legacy = bench("legacy _parse_ranking_result", legacy_parse_ranking, rows, 500)
+    bulk = bench("FieldDecoder.decode_many", RANKING_FIELDS.decode_many, rows, 500)
+    print(f"  → {legacy / bulk:.2f}x (legacy 대비)")
+
+    print("현재가 응답 1건 정규화")
+    legacy = bench("legacy get_quote", legacy_quote, quote, 20000)
+    new = bench("FieldDecoder get_quote", decoder_quote, quote, 20000)
+    print(f"  → {legacy / new:.2f}x (legacy 대비)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@
 """
 
 import asyncio
+import numpy as np
 from datetime import datetime
 from typing import List, Dict, Any
 from src.kiwoom.rest_client import KiwoomRestClient
@@ -11,7 +12,16 @@ from src.kiwoom.websocket_client import KiwoomWebSocketClient, RealTimeDataQueue
 from src.scanner.stock_scanner import StockScanner
 from src.gemini.ai_trader import GeminiAITrader
 from src.strategy.trading_strategy import TradingStrategy, PortfolioManager
+from src.strategy.order_manager import OrderManager
 from src.strategy.dynamic_risk_manager import DynamicRiskManager
+from src.strategy.position_journal import PositionJournal
+from src.strategy.account_state import AccountState
+from src.realtime.price_service import PriceService
+from src.realtime.bar_builder import BarBuilder, Bar
+from src.realtime.orderbook import OrderBookStore
+from src.realtime.trade_strength import TradeStrengthTracker
+from src.realtime.volume_surge import VolumeSurgeDetector, SurgeEvent
+from src.storage.history_store import HistoryStore, BAR_DTYPE
 from src.utils.logger import logger
 from src.utils.config_loader import load_config
 
@@ -27,11 +37,93 @@ class AutoTradingSystem:
         self.api_client = None
         self.ws_client = None
         self.scanner = None
+        self.order_manager = None
+        self.price_service = None
         self.ai_trader = GeminiAITrader()
-        self.strategy = TradingStrategy()
+
+        # 포지션/체결 저널 (재시작 시 포지션 복원)
+        persistence_config = self.config.get('persistence', {})
+        self.journal = PositionJournal(
+            persistence_config.get('position_journal', 'data/trading_journal.db')
+        )
+        self.strategy = TradingStrategy(journal=self.journal)
+
+        # 체결 틱/분봉 이력 (메모리 매핑 파일)
+        self.history = (
+            HistoryStore(persistence_config.get('history_dir', 'data/history'))
+            if persistence_config.get('history_enabled', False) else None
+        )
+
+        # 실시간 분봉 (0B 체결 틱 집계)
+        bar_config = self.config.get('realtime', {}).get('bars', {})
+        self.bar_builder = (
+            BarBuilder(bar_config.get('intervals', [1, 3, 5, 15]), bar_config.get('close_grace', 2.0))
+            if bar_config.get('enabled', False) else None
+        )
+        self.bar_reconcile_time = bar_config.get('reconcile_time', "15:40:00") if bar_config.get('reconcile', True) else None
+        if self.bar_builder and self.history:
+            self.bar_builder.on_bar.append(self._store_bar)
+            self.bar_builder.on_reconciled.append(self._store_reconciled_bars)
+
+        # 실시간 호가 (0D/0C, Deep Scan 호가 항목/매도 가격에 사용)
+        orderbook_config = self.config.get('realtime', {}).get('orderbook', {})
+        self.orderbooks = (
+            OrderBookStore(
+                depth=orderbook_config.get('depth', 10),
+                ratio_levels=orderbook_config.get('ratio_levels', 5),
+                max_age=orderbook_config.get('max_age', 3.0)
+            )
+            if orderbook_config.get('enabled', False) else None
+        )
+
+        # 실시간 체결강도 (0B 체결 틱 분류, Deep Scan 체결강도 항목에 사용)
+        strength_config = self.config.get('realtime', {}).get('trade_strength', {})
+        self.trade_strength = (
+            TradeStrengthTracker(
+                windows=strength_config.get('windows', [60, 300, 1200]),
+                default_window=strength_config.get('score_window', 300),
+                classify=strength_config.get('classify', 'sign'),
+                max_strength=strength_config.get('max_strength', 500.0)
+            )
+            if strength_config.get('enabled', False) else None
+        )
+
+        # 실시간 거래량 급증 감지 (0B 체결 틱, 감지 종목은 Deep Scan 우선 후보)
+        surge_config = self.config.get('realtime', {}).get('volume_surge', {})
+        self.surge_config = surge_config
+        self.volume_surge = (
+            VolumeSurgeDetector(
+                method=surge_config.get('method', 'ewma'),
+                bucket_seconds=surge_config.get('bucket_seconds', 60),
+                alpha=surge_config.get('alpha', 0.1),
+                threshold=surge_config.get('threshold', 5.0),
+                min_volume=surge_config.get('min_volume', 10000),
+                min_samples=surge_config.get('min_samples', 10),
+                cooldown=surge_config.get('cooldown', 300.0)
+            )
+            if surge_config.get('enabled', False) else None
+        )
+        self._surge_wakeup = asyncio.Event()
+        if self.volume_surge:
+            self.volume_surge.on_surge.append(self._on_volume_surge)
+
+        # Deep Scan 후보 실시간 구독 {실시간 타입: 상위 후보 수} / 구독 중인 후보
+        self._candidate_limits: Dict[str, int] = {}
+        if self.orderbooks and orderbook_config.get('subscribe_candidates', True):
+            self._candidate_limits[KiwoomWebSocketClient.RT_QUOTE_VOLUME] = orderbook_config.get('max_symbols', 20)
+        execution_limits = []
+        if self.trade_strength and strength_config.get('subscribe_candidates', True):
+            execution_limits.append(strength_config.get('max_symbols', 20))
+        if self.volume_surge:
+            execution_limits.append(surge_config.get('max_symbols', 50))
+        if execution_limits:
+            self._candidate_limits[KiwoomWebSocketClient.RT_STOCK_EXECUTION] = max(execution_limits)
+        self._candidates: Dict[str, set] = {data_type: set() for data_type in self._candidate_limits}
+
         self.portfolio = None
         self.realtime_queue = RealTimeDataQueue()
         self.risk_manager = DynamicRiskManager()
+        self.account_state = AccountState()
 
         self.is_running = False
         self.current_prices: Dict[str, float] = {}
@@ -48,8 +140,23 @@ class AutoTradingSystem:
         try:
             async with KiwoomRestClient() as api_client:
                 self.api_client = api_client
-                self.scanner = StockScanner(api_client)
+                self.scanner = StockScanner(
+                    api_client,
+                    orderbooks=self.orderbooks,
+                    trade_strength=self.trade_strength,
+                    # 실시간 감지 사용 시 거래량 급증 순위는 대사용으로 느리게 조회
+                    ranking_intervals=(
+                        {'volume_surge': self.surge_config.get('ranking_interval', 60)} if self.volume_surge else None
+                    ),
+                    priority_ttl=self.surge_config.get('priority_ttl', 300.0)
+                )
+                if self.volume_surge and self.history and self.volume_surge.method == 'time_of_day':
+                    self.volume_surge.load_profile(self.history, self.surge_config.get('profile_days', 20))
                 self.portfolio = PortfolioManager(self.strategy)
+                self.price_service = PriceService(api_client)
+                self.order_manager = OrderManager(
+                    api_client, self.strategy, price_provider=self.price_service.last_price
+                )
 
                 # WebSocket 초기화
                 self.ws_client = KiwoomWebSocketClient(api_client.access_token)
@@ -67,6 +174,8 @@ class AutoTradingSystem:
                     self._monitor_positions(),
                     self._monitor_account(),
                 ]
+                if self.bar_builder:
+                    tasks.append(self._bar_loop())
 
                 # WebSocket은 테스트 모드가 아닐 때만 시작
                 if self.ws_client is not None:
@@ -83,27 +192,47 @@ class AutoTradingSystem:
 
     async def _setup_websocket_handlers(self):
         """WebSocket 핸들러 설정"""
-        # 현재가 핸들러
+        # 현재가 핸들러 (현재가/주식체결 공용, 10: 현재가)
         async def handle_current_price(data):
-            stock_code = data.get('stock_code')
-            price = data.get('current_price')
+            stock_code = data.get('item')
+            raw_price = data.get('values', {}).get('10', '')
+            price = abs(int(raw_price)) if raw_price.lstrip('+-').isdigit() else 0
             if stock_code and price:
                 self.current_prices[stock_code] = price
+                self.price_service.update(stock_code, price)
+                self.account_state.on_price(stock_code, price)
+                if data.get('type') == KiwoomWebSocketClient.RT_STOCK_EXECUTION:
+                    self._on_execution_tick(stock_code, price, data.get('values', {}))
                 await self.realtime_queue.put('current_price', stock_code, data)
 
-        # 주문체결 핸들러
+        # 주문체결 핸들러 (체결 기반 포지션 반영)
         async def handle_order_execution(data):
             logger.info(f"주문체결: {data}")
+            self.account_state.on_execution(data.get('values', {}))
+            await self.order_manager.on_execution(data)
             await self.realtime_queue.put('order_execution', 'ALL', data)
 
-        # 잔고 핸들러
+        # 청산 완료 시 실시간 구독 해제
+        async def handle_position_closed(stock_code):
+            await self.ws_client.unsubscribe(KiwoomWebSocketClient.RT_CURRENT_PRICE, stock_code)
+            for data_type in self._position_feeds():
+                if stock_code not in self._candidates.get(data_type, ()):
+                    await self._unsubscribe_feed(data_type, stock_code)
+
+        # 잔고 핸들러 (계좌 상태 증분 갱신)
         async def handle_balance(data):
-            logger.info(f"잔고 업데이트: {data}")
+            logger.debug(f"잔고 업데이트: {data}")
+            self.account_state.on_balance(data.get('values', {}))
             await self.realtime_queue.put('balance', 'ALL', data)
 
         self.ws_client.add_handler(KiwoomWebSocketClient.RT_CURRENT_PRICE, handle_current_price)
+        self.ws_client.add_handler(KiwoomWebSocketClient.RT_STOCK_EXECUTION, handle_current_price)
         self.ws_client.add_handler(KiwoomWebSocketClient.RT_ORDER_EXECUTION, handle_order_execution)
         self.ws_client.add_handler(KiwoomWebSocketClient.RT_BALANCE, handle_balance)
+        if self.orderbooks:
+            self.ws_client.add_handler(KiwoomWebSocketClient.RT_QUOTE_VOLUME, self.orderbooks.handle)
+            self.ws_client.add_handler(KiwoomWebSocketClient.RT_PRIORITY_QUOTE, self.orderbooks.handle)
+        self.order_manager.on_position_closed.append(handle_position_closed)
 
         # 기본 구독
         await self.ws_client.subscribe_order_execution()
@@ -125,6 +254,9 @@ class AutoTradingSystem:
             logger.debug(f"Account Info API 응답: {info}")
             logger.debug(f"Holdings API 응답: {holdings}")
 
+            # 계좌 상태 초기화 (이후 실시간 잔고/체결 스트림으로 갱신)
+            self.account_state.reconcile(balance, info, holdings)
+
             # 여러 필드명 시도 (API 응답 구조가 다를 수 있음)
             available_cash = (
                 balance.get('available_cash') or
@@ -148,18 +280,17 @@ class AutoTradingSystem:
             # 현재 자본금 초기화
             self.current_capital = int(total_asset) if total_asset else int(available_cash)
 
-            # 기존 보유종목 포지션 복원
-            for h in holdings:
-                code = h.get('stock_code')
-                if code and code not in self.strategy.positions:
-                    self.strategy.add_position(
-                        stock_code=code,
-                        stock_name=h.get('stock_name', ''),
-                        quantity=h.get('quantity', 0),
-                        entry_price=h.get('avg_price', 0)
-                    )
-                    # 실시간 현재가 구독
-                    await self.ws_client.subscribe_current_price(code)
+            # 저널 포지션을 실제 잔고에 맞춤 (봇 밖에서 청산/변경된 포지션 정리, 저널에 없는 보유종목 복원)
+            summary = self.strategy.sync_with_holdings(self.account_state.holdings)
+            if any(summary.values()):
+                logger.info(
+                    f"포지션 대사: 삭제 {summary['removed']}개, 수량 보정 {summary['adjusted']}개, "
+                    f"복원 {summary['restored']}개"
+                )
+
+            # 포지션 실시간 현재가/호가 구독
+            for code in self.strategy.positions:
+                await self._subscribe_position(code)
 
         except Exception as e:
             logger.error(f"계좌 확인 실패: {e}", exc_info=True)
@@ -200,6 +331,7 @@ class AutoTradingSystem:
             try:
                 logger.info(f"[{datetime.now():%H:%M:%S}] Deep Scan")
                 fast_result = await self.scanner.fast_scan()
+                await self._sync_candidate_subscriptions(fast_result)
                 deep_result = await self.scanner.deep_scan(fast_result)
 
                 logger.info(f"결과: {len(deep_result)}개 (200점+)")
@@ -210,7 +342,45 @@ class AutoTradingSystem:
                     )
             except Exception as e:
                 logger.error(f"Deep Scan 오류: {e}", exc_info=True)
-            await asyncio.sleep(interval)
+            await self._wait_deep_scan(interval)
+
+    async def _wait_deep_scan(self, interval: int):
+        """다음 Deep Scan까지 대기 (거래량 급증 감지 시 우선 후보만 즉시 평가)"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + interval
+        while self.is_running:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(self._surge_wakeup.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+            self._surge_wakeup.clear()
+
+            try:
+                snapshot = self.scanner.snapshots.latest
+                candidates = self.scanner.priority_candidates(snapshot)
+                if not candidates:
+                    continue
+                logger.info(f"[{datetime.now():%H:%M:%S}] 급증 Deep Scan: {len(candidates)}개")
+                for s in (await self.scanner.deep_scan(candidates, snapshot))[:5]:
+                    logger.info(
+                        f"  - {s.get('name')} ({s.get('code')}): "
+                        f"{s.get('total_score')}점 [{s.get('grade')}] 급증 x{s.get('surge_ratio', 0)}"
+                    )
+            except Exception as e:
+                logger.error(f"급증 Deep Scan 오류: {e}", exc_info=True)
+
+    def _on_volume_surge(self, event: SurgeEvent):
+        """거래량 급증 → Deep Scan 우선 후보 등록"""
+        logger.info(
+            f"거래량 급증: {event.code} x{event.ratio:.1f} "
+            f"({event.volume:,.0f}주 / 기준 {event.baseline:,.0f}주) @{event.price:,.0f}원"
+        )
+        if self.scanner:
+            self.scanner.add_priority(event)
+            self._surge_wakeup.set()
 
     async def _ai_scan_loop(self, interval: int):
         """AI Scan 루프"""
@@ -256,81 +426,60 @@ class AutoTradingSystem:
             await asyncio.sleep(interval)
 
     async def _execute_trades(self, stocks: List):
-        """매수 실행 (동적 리스크 관리 적용)"""
+        """매수 실행 (동적 리스크 관리 적용, 배치 병렬 주문)"""
         try:
             # 매수 시도/성공 카운터
             attempt_count = len(stocks)
-            success_count = 0
 
             logger.info("=" * 60)
             logger.info(f"📋 매수 시도: {attempt_count}개 종목")
             logger.info("=" * 60)
 
-            # 현재 포지션 수
-            num_positions = len(self.strategy.positions)
-
+            # 1단계: 후보 판단 (동기 처리)
+            candidates = []
             for s in stocks:
-                try:
-                    code = s['code']
-                    name = s.get('name', '')
-                    ai_confidence = s.get('ai_analysis', {}).get('confidence', 0)
-
-                    # 동적 리스크 관리: 매수 가능 여부 확인
-                    risk_decision = self.risk_manager.should_buy(
-                        self.current_capital,
-                        num_positions,
-                        ai_confidence
-                    )
-
-                    if not risk_decision['decision']:
-                        logger.warning(
-                            f"[{risk_decision['mode']}] 매수 불가 ({name}): {risk_decision['reason']}"
-                        )
-                        continue
-
-                    # 기존 전략 매수 판단
-                    decision = self.strategy.should_buy(s)
-                    if not decision['decision']:
-                        logger.warning(f"매수 불가 ({name}): {decision['reason']}")
-                        continue
-
-                    # 현재가 조회 (테스트 모드에서도 Mock API 호출)
-                    quote = await self.api_client.get_quote(code)
-                    price = quote.get('price', 0)
-                    if price == 0:
-                        logger.warning(f"가격 정보 없음: {name}")
-                        continue
-
-                    # 동적 리스크 관리: 포지션 크기 계산
-                    qty = self.risk_manager.calculate_position_size(self.current_capital, price)
-                    if qty <= 0:
-                        logger.warning(f"매수 수량 0: {name}")
-                        continue
-
-                    # 주문 실행 (테스트 모드에서도 Mock API 호출)
-                    await self.api_client.order_buy(code, qty, price)
-
-                    investment_amount = price * qty
-                    position_pct = (investment_amount / self.current_capital * 100) if self.current_capital > 0 else 0
+                name = s.get('name', '')
+                if self.order_manager.has_pending(s['code'], 'BUY'):
+                    logger.warning(f"매수 불가 ({name}): 미체결 매수 주문 진행 중")
+                    continue
+
+                # 기존 전략 매수 판단
+                decision = self.strategy.should_buy(s)
+                if not decision['decision']:
+                    logger.warning(f"매수 불가 ({name}): {decision['reason']}")
+                    continue
+                candidates.append(s)
+
+            # 2단계: 포지션 슬롯/투자금 일괄 예약 (await 없음 → 동시 진입과 경합 없음)
+            num_positions = len(self.strategy.positions) + self.order_manager.pending_buy_count()
+            available_cash = None
+            if self.account_state.last_reconciled is not None:
+                available_cash = self.account_state.cash - self.order_manager.pending_buy_amount()
+            reservations = self.risk_manager.reserve_entries(
+                self.current_capital, num_positions, candidates, available_cash
+            )
 
-                    logger.info(
-                        f"✅ [{risk_decision['mode']}] 매수 주문 성공: {name} {qty}주 @{price:,}원 "
-                        f"(투자: {investment_amount:,}원, {position_pct:.1f}%)"
+            # 3단계: 시세 조회 + 주문 병렬 전송 (API별 Rate Limit은 클라이언트에서 적용)
+            try:
+                results = await asyncio.gather(
+                    *(self._enter_position(r) for r in reservations),
+                    return_exceptions=True
+                )
+            finally:
+                # 전송된 주문은 미체결 매수로 집계되므로 예약 해제
+                self.risk_manager.release_entries(reservations)
+
+            # 4단계: 결과 집계
+            success_count = 0
+            for reservation, result in zip(reservations, results):
+                if isinstance(result, Exception):
+                    logger.error(
+                        f"❌ 매수 실패 ({reservation['stock'].get('name')}): {result}",
+                        exc_info=result
                     )
-
-                    # 포지션 추가
-                    self.strategy.add_position(code, name, qty, price)
-
-                    # 실시간 현재가 구독
-                    await self.ws_client.subscribe_current_price(code)
-
-                    # 포지션 수 증가
-                    num_positions += 1
+                elif result:
                     success_count += 1
 
-                except Exception as e:
-                    logger.error(f"❌ 매수 실패 ({s.get('name')}): {e}", exc_info=True)
-
             # 매수 결과 요약
             logger.info("=" * 60)
             logger.info(f"✅ 매수 완료: {success_count}/{attempt_count}개 성공")
@@ -341,8 +490,83 @@ class AutoTradingSystem:
         except Exception as e:
             logger.error(f"매수 실행 오류: {e}", exc_info=True)
 
+    async def _enter_position(self, reservation: Dict[str, Any]) -> bool:
+        """예약된 후보 1종목 매수 (현재가 조회 → 수량 계산 → 주문)"""
+        s = reservation['stock']
+        code = s['code']
+        name = s.get('name', '')
+
+        # 현재가 조회 (실시간 가격이 유효하면 REST 호출 생략)
+        quote = await self.price_service.get_price(code)
+        price = int(quote.price)
+        if price == 0:
+            logger.warning(f"가격 정보 없음: {name}")
+            return False
+        logger.debug(f"현재가 {name}: {price:,}원 ({quote.source}, {quote.age:.1f}초 전)")
+
+        # 예약된 투자금 기준 수량 계산
+        qty = self.risk_manager.calculate_quantity(reservation['budget'], price)
+        if qty <= 0:
+            logger.warning(f"매수 수량 0: {name}")
+            return False
+
+        # 주문 실행 (포지션은 주문체결 스트림에서 체결 시 반영)
+        await self.order_manager.submit_buy(code, name, qty, price)
+
+        investment_amount = price * qty
+        position_pct = (investment_amount / self.current_capital * 100) if self.current_capital > 0 else 0
+
+        logger.info(
+            f"✅ [{reservation['mode']}] 매수 주문 성공: {name} {qty}주 @{price:,}원 "
+            f"(투자: {investment_amount:,}원, {position_pct:.1f}%)"
+        )
+
+        # 실시간 현재가/호가 구독
+        await self._subscribe_position(code)
+        return True
+
+    def _position_feeds(self) -> List[str]:
+        """보유 종목에 추가로 구독할 실시간 타입 (현재가 외)"""
+        feeds = []
+        if self.orderbooks:
+            # 매도 가격용 최우선호가(0C) + 잔량(0D) - 해제 시 0C를 먼저 끊어 호가창 행이 다시 생기지 않도록
+            feeds.append(KiwoomWebSocketClient.RT_PRIORITY_QUOTE)
+            feeds.append(KiwoomWebSocketClient.RT_QUOTE_VOLUME)
+        if self.trade_strength or self.volume_surge or self.bar_builder or self.history:
+            feeds.append(KiwoomWebSocketClient.RT_STOCK_EXECUTION)
+        return feeds
+
+    async def _subscribe_position(self, code: str):
+        """보유 종목 실시간 구독 (현재가 + 우선호가/호가잔량/주식체결)"""
+        await self.ws_client.subscribe_current_price(code)
+        for data_type in self._position_feeds():
+            await self.ws_client.subscribe(data_type, code)
+
+    async def _unsubscribe_feed(self, data_type: str, code: str):
+        """실시간 구독 해제 + 종목별 실시간 상태 삭제"""
+        await self.ws_client.unsubscribe(data_type, code)
+        if data_type == KiwoomWebSocketClient.RT_QUOTE_VOLUME:
+            self.orderbooks.remove(code)
+        elif data_type == KiwoomWebSocketClient.RT_STOCK_EXECUTION:
+            if self.trade_strength:
+                self.trade_strength.remove(code)
+            if self.volume_surge:
+                self.volume_surge.remove(code)
+
+    async def _sync_candidate_subscriptions(self, fast_result: List[Dict[str, Any]]):
+        """Deep Scan 상위 후보 실시간 구독 갱신 (빠진 후보는 해제, 보유 종목은 유지)"""
+        for data_type, limit in self._candidate_limits.items():
+            current = self._candidates[data_type]
+            wanted = {s['code'] for s in fast_result[:limit] if s.get('code')}
+            for code in current - wanted:
+                if code not in self.strategy.positions:
+                    await self._unsubscribe_feed(data_type, code)
+            for code in wanted - current:
+                await self.ws_client.subscribe(data_type, code)
+            self._candidates[data_type] = wanted
+
     async def _monitor_account(self):
-        """계좌 모니터링 (잔고, 보유종목 조회)"""
+        """계좌 모니터링 (실시간 잔고 기반, REST는 주기적 대사/드리프트 시에만)"""
         await asyncio.sleep(15)  # 초기 대기
 
         interval = self.config.get('monitoring', {}).get('account_check_interval', 10)
@@ -353,34 +577,27 @@ class AutoTradingSystem:
                 logger.info(f"[{datetime.now():%H:%M:%S}] 계좌 조회")
                 logger.info("=" * 60)
 
-                # API 호출 (테스트/실전 모두 동일)
-                balance = await self.api_client.get_balance()
-                entr = int(balance.get('entr', '0'))  # 예수금
-                logger.info(f"💰 예수금: {entr:,}원")
+                # 전략 포지션과 실시간 잔고 비교 (미체결 종목 제외)
+                if self.account_state.last_reconciled is not None:
+                    self.account_state.check_positions(
+                        {code: p.quantity for code, p in self.strategy.positions.items()},
+                        set(self.order_manager.orders_by_code)
+                    )
 
-                # 계좌 정보 조회
-                info = await self.api_client.get_account_info()
-                prsm_dpst_aset_amt = int(info.get('prsm_dpst_aset_amt', '0'))  # 추정예탁자산
+                # WebSocket 끊김 시 스트림 갱신이 없으므로 매 주기 REST 대사
+                if self.account_state.needs_reconcile() or not self.ws_client.is_connected:
+                    await self._reconcile_account()
 
-                # 현재 총 자산 업데이트
-                self.current_capital = prsm_dpst_aset_amt
-                logger.info(f"📊 총자산: {prsm_dpst_aset_amt:,}원")
+                state = self.account_state
+                logger.info(f"💰 예수금: {int(state.cash):,}원")
 
-                # 보유 종목 조회
-                holdings = await self.api_client.get_holdings()
+                # 현재 총 자산 업데이트
+                self.current_capital = int(state.estimated_total_asset)
+                logger.info(f"📊 총자산: {self.current_capital:,}원")
 
                 # 투자원금 = 보유종목의 매수금액 합계
-                total_investment = 0
-                total_valuation = 0
-
-                # API 응답 데이터 사용
-                for h in holdings:
-                    qty = int(h.get('remn_qty', '0'))  # 잔고수량
-                    avg_price = float(h.get('avg_unpr', '0'))  # 평단가
-                    current_price = float(h.get('prsn_rate', avg_price))  # 현재가
-
-                    total_investment += avg_price * qty  # 매수금액
-                    total_valuation += current_price * qty  # 평가금액
+                total_investment = state.total_investment
+                total_valuation = state.total_valuation
 
                 # 손익 계산
                 total_pnl = total_valuation - total_investment
@@ -391,7 +608,7 @@ class AutoTradingSystem:
                     logger.info(f"💹 평가금액: {int(total_valuation):,}원")
                     logger.info(f"📈 총손익: {int(total_pnl):+,}원 ({pnl_pct:+.2f}%)")
 
-                logger.info(f"📋 보유종목: {len(holdings)}개")
+                logger.info(f"📋 보유종목: {len(state.holdings)}개")
 
                 # 동적 리스크 관리 상태 업데이트 및 표시
                 self.risk_manager.update_risk_level(self.current_capital)
@@ -404,25 +621,16 @@ class AutoTradingSystem:
                 logger.info(f"   AI 신뢰도: {risk_status['ai_confidence_min']*100:.0f}% 이상")
                 logger.info("-" * 60)
 
-                if holdings:
+                if state.holdings:
                     logger.info("-" * 60)
-                    for i, h in enumerate(holdings, 1):
-                        # API 응답 데이터 사용
-                        code = h.get('sht_cd', '')  # 단축코드
-                        name = h.get('pdno_hngl_nm', '')  # 상품명
-                        qty = int(h.get('remn_qty', '0'))  # 잔고수량
-                        avg_price = float(h.get('avg_unpr', '0'))  # 평단가
-                        current_price = float(h.get('prsn_rate', avg_price))  # 현재가
-
-                        investment = avg_price * qty  # 매수금액
-                        valuation = current_price * qty  # 평가금액
-                        pnl = valuation - investment  # 손익
-                        pnl_pct = (pnl / investment * 100) if investment > 0 else 0
+                    for i, h in enumerate(state.holdings.values(), 1):
+                        pnl = h.valuation - h.investment  # 손익
+                        pnl_pct = (pnl / h.investment * 100) if h.investment > 0 else 0
 
                         logger.info(
-                            f"{i}. {name}({code}) "
-                            f"{qty}주 @{int(avg_price):,}원 → {int(current_price):,}원 | "
-                            f"투자: {int(investment):,}원 → 평가: {int(valuation):,}원 "
+                            f"{i}. {h.stock_name}({h.stock_code}) "
+                            f"{h.quantity}주 @{int(h.avg_price):,}원 → {int(h.current_price):,}원 | "
+                            f"투자: {int(h.investment):,}원 → 평가: {int(h.valuation):,}원 "
                             f"({int(pnl):+,}원, {pnl_pct:+.2f}%)"
                         )
                     logger.info("-" * 60)
@@ -434,6 +642,16 @@ class AutoTradingSystem:
 
             await asyncio.sleep(interval)
 
+    async def _reconcile_account(self):
+        """REST 계좌 조회로 계좌 상태 대사"""
+        reasons = ", ".join(self.account_state.drift_reasons) or "정기 대사"
+        logger.info(f"🔄 계좌 REST 대사 ({reasons})")
+
+        balance = await self.api_client.get_balance()
+        info = await self.api_client.get_account_info()
+        holdings = await self.api_client.get_holdings()
+        self.account_state.reconcile(balance, info, holdings)
+
     async def _monitor_positions(self):
         """포지션 모니터링 (손익 체크)"""
         await asyncio.sleep(20)  # 초기 대기
@@ -441,7 +659,10 @@ class AutoTradingSystem:
         while self.is_running:
             try:
                 # 포지션 손익 체크
-                sell_signals = self.portfolio.check_all_positions(self.current_prices)
+                sell_signals = [
+                    signal for signal in self.portfolio.check_all_positions(self.current_prices)
+                    if not self.order_manager.has_pending(signal['position'].stock_code, 'SELL')
+                ]
 
                 if sell_signals:
                     logger.info("=" * 60)
@@ -485,11 +706,15 @@ class AutoTradingSystem:
                 await asyncio.sleep(10)
 
     async def _execute_sell(self, position: Any, price: float) -> bool:
-        """매도 실행"""
+        """매도 실행 (포지션 제거/구독 해제는 체결 시 처리)"""
+        # 실시간 호가가 유효하면 최우선 매수호가로 주문 (REST 조회 없이 즉시 체결 가능 가격)
+        best_bid = self.orderbooks.best_bid_price(position.stock_code) if self.orderbooks else None
+        if best_bid:
+            price = best_bid
         try:
-            # 주문 실행 (테스트 모드에서도 Mock API 호출)
-            await self.api_client.order_sell(
+            await self.order_manager.submit_sell(
                 position.stock_code,
+                position.stock_name,
                 position.quantity,
                 int(price)
             )
@@ -499,15 +724,6 @@ class AutoTradingSystem:
                 f"{position.quantity}주 @{price:,}원"
             )
 
-            # 포지션 제거
-            realized_pnl = self.strategy.remove_position(position.stock_code, price)
-
-            # 실시간 구독 해제
-            await self.ws_client.unsubscribe(
-                KiwoomWebSocketClient.RT_CURRENT_PRICE,
-                position.stock_code
-            )
-
             return True
 
         except Exception as e:
@@ -525,11 +741,67 @@ class AutoTradingSystem:
             logger.info(f"총 투자금: {summary['total_investment']:,.0f}원")
             logger.info(f"평가손익: {summary['total_pnl']:+,.0f}원 ({summary['total_pnl_pct']:+.2f}%)")
             logger.info(f"실현손익: {summary['daily_realized_pnl']:+,.0f}원")
+            if self.api_client:
+                waits = self.api_client.scheduler.get_stats()
+                logger.info("요청 대기 p95: " + ", ".join(
+                    f"{name} {s['wait_p95']:.2f}초/{s['requests']}건" for name, s in waits.items()
+                ))
             logger.info("=" * 60)
 
         except Exception as e:
             logger.error(f"포트폴리오 요약 오류: {e}", exc_info=True)
 
+    def _on_execution_tick(self, stock_code: str, price: int, values: Dict[str, str]):
+        """주식체결(0B) 틱 → 이력 기록/분봉 집계/체결강도 (15: 체결량 ±, 13: 누적거래량, 20: 체결시간)"""
+        if not self.history and not self.bar_builder and not self.trade_strength and not self.volume_surge:
+            return
+        try:
+            volume = int(values.get('15') or 0)
+            if self.trade_strength:
+                self.trade_strength.on_tick(stock_code, price, volume, values.get('20', ''))
+            if self.volume_surge:
+                self.volume_surge.on_tick(stock_code, price, volume, values.get('20', ''))
+            if self.history:
+                self.history.append_tick(stock_code, price, volume, abs(int(values.get('13') or 0)))
+            if self.bar_builder:
+                self.bar_builder.on_tick(stock_code, price, volume, values.get('20', ''))
+        except Exception as e:
+            # 틱 부가 처리 실패가 실시간 수신을 막지 않도록 기록만
+            logger.warning(f"체결 틱 처리 실패 ({stock_code}): {e}")
+
+    def _bar_record(self, bar: Bar) -> tuple:
+        ts_ns = int(bar.start(self.bar_builder.day).timestamp() * 1e9)
+        return (ts_ns, bar.open, bar.high, bar.low, bar.close, bar.volume, bar.value)
+
+    def _store_bar(self, bar: Bar):
+        """완성 1분봉 이력 기록 (상위 주기는 1분봉에서 재구성)"""
+        if bar.interval == 1:
+            self.history.append_bar(bar.code, *self._bar_record(bar))
+
+    def _store_reconciled_bars(self, stock_code: str, bars: List[Bar]):
+        """대사 보정된 당일 1분봉으로 이력 파일 교체"""
+        records = np.array([self._bar_record(bar) for bar in bars], dtype=BAR_DTYPE)
+        self.history.rewrite(stock_code, 'bar', records, self.bar_builder.day.strftime('%Y%m%d'))
+
+    async def _bar_loop(self):
+        """진행 중 분봉 마감 처리 (1초), 장 마감 후 REST 분봉 대사 (하루 1회)"""
+        reconciled_day = None
+        while self.is_running:
+            try:
+                now = datetime.now()
+                if now.date() != self.bar_builder.day:
+                    self.bar_builder.reset(now.date())
+                self.bar_builder.flush(now)
+
+                if (self.bar_reconcile_time and reconciled_day != now.date()
+                        and now.strftime("%H:%M:%S") >= self.bar_reconcile_time
+                        and self.bar_builder.completed):
+                    reconciled_day = now.date()
+                    await self.bar_builder.reconcile(self.api_client)
+            except Exception as e:
+                logger.error(f"분봉 처리 오류: {e}")
+            await asyncio.sleep(1)
+
     async def _shutdown(self):
         """시스템 종료"""
         logger.info("시스템 종료 중...")
@@ -538,6 +810,12 @@ class AutoTradingSystem:
         if self.ws_client:
             await self.ws_client.disconnect()
 
+        if self.journal:
+            self.journal.close()
+
+        if self.history:
+            self.history.close()
+
         logger.info("시스템 종료 완료")
 
 
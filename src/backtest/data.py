@@ -0,0 +1,230 @@
+"""
+백테스트 입력 데이터
+분봉 OHLCV를 (시간 × 종목) NumPy 배열로 보관하고 일자 단위로 스캔 입력 지표 계산
+"""
+
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+
+class BarData:
+    """
+    분봉 패널 데이터
+
+    모든 배열은 (T, N) - T: 전체 종목 시각 합집합, N: 종목 수
+    거래가 없는 시각은 가격 NaN, 거래량 0
+    """
+
+    PRICE_FIELDS = ('open', 'high', 'low', 'close')
+
+    def __init__(
+        self,
+        times: np.ndarray,
+        codes: List[str],
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        names: Optional[List[str]] = None,
+        extra: Optional[Dict[str, np.ndarray]] = None
+    ):
+        """
+        Args:
+            times: 봉 시각 (datetime64, 오름차순)
+            extra: 추가 평가 입력 (T, N) - 기록된 순위/수급 데이터 등
+                   (예: 'trade_strength', 'foreign_consecutive_days')
+        """
+        self.times = np.asarray(times, dtype='datetime64[m]')
+        self.codes = list(codes)
+        self.names = list(names) if names else list(codes)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        volume = np.asarray(volume, dtype=np.float64)
+        self.volume = np.nan_to_num(volume) if np.isnan(volume).any() else volume
+        self.extra = extra or {}
+
+        shape = (len(self.times), len(self.codes))
+        for field in (*self.PRICE_FIELDS, 'volume'):
+            if getattr(self, field).shape != shape:
+                raise ValueError(f"{field} 배열 크기 불일치: {getattr(self, field).shape} != {shape}")
+
+        # 일자 경계 [start, end)
+        days = self.times.astype('datetime64[D]')
+        starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]]) if len(days) else np.array([], dtype=int)
+        ends = np.r_[starts[1:], len(days)]
+        self.days: List[Tuple[np.datetime64, int, int]] = [
+            (days[s], int(s), int(e)) for s, e in zip(starts, ends)
+        ]
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Dict[str, pd.DataFrame],
+        names: Optional[Dict[str, str]] = None
+    ) -> "BarData":
+        """
+        종목별 DataFrame → 패널
+
+        Args:
+            frames: {종목코드: DataFrame (DatetimeIndex 또는 'datetime' 컬럼, open/high/low/close/volume)}
+        """
+        codes = list(frames)
+        indexed = {}
+        for code, df in frames.items():
+            if 'datetime' in df.columns:
+                df = df.set_index('datetime')
+            df.index = pd.to_datetime(df.index).floor('min')
+            indexed[code] = df[~df.index.duplicated(keep='last')].sort_index()
+
+        times = pd.DatetimeIndex(sorted(set().union(*(df.index for df in indexed.values())))) \
+            if indexed else pd.DatetimeIndex([])
+        arrays = {}
+        for field in (*cls.PRICE_FIELDS, 'volume'):
+            arrays[field] = np.column_stack([
+                indexed[code][field].reindex(times).to_numpy(dtype=np.float64) for code in codes
+            ]) if codes else np.empty((len(times), 0))
+
+        return cls(
+            times.to_numpy().astype('datetime64[m]'),
+            codes,
+            names=[(names or {}).get(code, code) for code in codes],
+            **arrays
+        )
+
+    @classmethod
+    def from_csv_dir(cls, path: str, pattern: str = "*.csv") -> "BarData":
+        """종목별 CSV 디렉터리 로드 (파일명 = 종목코드, 컬럼: datetime,open,high,low,close,volume)"""
+        frames = {
+            file.stem: pd.read_csv(file, parse_dates=['datetime'])
+            for file in sorted(Path(path).glob(pattern))
+        }
+        return cls.from_frames(frames)
+
+    @classmethod
+    def from_history(
+        cls,
+        store: Any,
+        days: Optional[List[str]] = None,
+        codes: Optional[List[str]] = None
+    ) -> "BarData":
+        """
+        HistoryStore 분봉 → 패널
+
+        Args:
+            store: HistoryStore
+            days: 'YYYYMMDD' 목록 (None이면 전체)
+            codes: 종목코드 목록 (None이면 기록된 전체)
+        """
+        days = days or store.days()
+        codes = codes or sorted({code for day in days for code in store.codes(day)})
+        tz = datetime.now().astimezone().tzinfo
+
+        frames = {}
+        for code in codes:
+            bars = [store.bars(code, day) for day in days]
+            bars = np.concatenate([b for b in bars if len(b)]) if any(len(b) for b in bars) else None
+            if bars is None:
+                continue
+            index = pd.to_datetime(bars['ts'], unit='ns', utc=True).tz_convert(tz).tz_localize(None)
+            frames[code] = pd.DataFrame(
+                {field: bars[field] for field in (*cls.PRICE_FIELDS, 'volume')}, index=index
+            )
+        return cls.from_frames(frames)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def iter_days(self) -> Iterator[Tuple[np.datetime64, int, int]]:
+        return iter(self.days)
+
+    def day_features(self, start: int, end: int, prev: Optional["DayState"]) -> "DayState":
+        """
+        일자 [start, end) 구간의 Fast Scan 입력 지표 (봉별 누적, 벡터화)
+
+        Args:
+            prev: 전일 지표 (전일 종가/동시간대 누적 거래량 비교용)
+        """
+        close = self.close[start:end]
+        # 장중 가격은 직전 체결가 유지 (거래 없는 봉)
+        price = pd.DataFrame(close).ffill().to_numpy()
+        if prev is not None:
+            price = np.where(np.isnan(price), prev.last_price, price)
+
+        volume = self.volume[start:end]
+        cum_volume = np.cumsum(volume, axis=0)
+        cum_value = np.cumsum(volume * np.nan_to_num(close), axis=0)
+        high = np.fmax.accumulate(self.high[start:end], axis=0)
+
+        times = self.times[start:end]
+        minutes = (times - times.astype('datetime64[D]')).astype(np.int64)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            high_proximity = np.where(high > 0, price / high * 100, -999.0)
+
+            if prev is not None:
+                prev_close = prev.last_price
+                price_change = np.where(prev_close > 0, (price - prev_close) / prev_close * 100, 0.0)
+
+                # 전일 동시간대 누적 거래량 대비 증가율 (%)
+                rows = np.searchsorted(prev.minutes, minutes, side='right') - 1
+                prev_cum = np.where(
+                    (rows >= 0)[:, None], prev.cum_volume[np.clip(rows, 0, None)], 0.0
+                )
+                volume_change = np.where(prev_cum > 0, (cum_volume - prev_cum) / prev_cum * 100, 0.0)
+            else:
+                price_change = np.zeros_like(price)
+                volume_change = np.zeros_like(price)
+
+        return DayState(
+            start=start,
+            minutes=minutes,
+            price=price,
+            cum_volume=cum_volume,
+            columns={
+                'price': np.nan_to_num(price),
+                'price_change': np.nan_to_num(price_change),
+                'volume': cum_volume,
+                'trading_value': cum_value,
+                'volume_change': np.nan_to_num(volume_change),
+                'high_proximity_pct': np.nan_to_num(high_proximity, nan=-999.0),
+            }
+        )
+
+
+class DayState:
+    """일자별 봉 누적 지표 ((봉, 종목) 배열)"""
+
+    __slots__ = ('start', 'minutes', 'price', 'cum_volume', 'columns')
+
+    def __init__(
+        self,
+        start: int,
+        minutes: np.ndarray,
+        price: np.ndarray,
+        cum_volume: np.ndarray,
+        columns: Dict[str, np.ndarray]
+    ):
+        self.start = start            # 전체 패널 기준 시작 행
+        self.minutes = minutes        # 봉 시각 (자정 기준 분)
+        self.price = price            # 직전 체결가 (NaN: 당일 체결 전)
+        self.cum_volume = cum_volume
+        self.columns = columns
+
+    @property
+    def last_price(self) -> np.ndarray:
+        """당일 종가 (체결 없으면 NaN)"""
+        return self.price[-1]
+
+    def row(self, index: int) -> Dict[str, np.ndarray]:
+        """전체 패널 행 번호 → 종목별 지표"""
+        i = index - self.start
+        return {field: values[i] for field, values in self.columns.items()}
+
+
+__all__ = ["BarData", "DayState"]
@@ -0,0 +1,419 @@
+"""
+백테스트 엔진
+분봉 데이터를 시간 순으로 재생하며 실거래와 같은 평가/리스크/청산 로직(StockScorer, TradingStrategy,
+DynamicRiskManager)으로 매매를 모의 실행
+"""
+
+import math
+import numpy as np
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+from src.backtest.data import BarData, DayState
+from src.backtest.fill_model import FillModel, SimOrder
+from src.backtest.stub_ai import StubAITrader
+from src.scanner.market_snapshot import MarketSnapshot
+from src.scanner.scoring import StockScorer
+from src.strategy.dynamic_risk_manager import DynamicRiskManager
+from src.strategy.trading_strategy import TradingStrategy, PortfolioManager
+from src.utils.config_loader import load_config
+from src.utils.logger import logger
+
+
+class BacktestResult:
+    """백테스트 결과 (봉별 평가자산, 체결/거래 내역)"""
+
+    def __init__(
+        self,
+        times: np.ndarray,
+        equity: np.ndarray,
+        trades: List[Dict[str, Any]],
+        fills: List[Dict[str, Any]],
+        initial_capital: float
+    ):
+        self.times = times
+        self.equity = equity
+        self.trades = trades    # 청산 완료 거래 (진입~청산)
+        self.fills = fills
+        self.initial_capital = initial_capital
+
+    def daily_equity(self) -> np.ndarray:
+        """일별 마감 평가자산"""
+        if len(self.times) == 0:
+            return np.array([])
+        days = self.times.astype('datetime64[D]')
+        ends = np.r_[np.flatnonzero(days[1:] != days[:-1]), len(days) - 1]
+        return self.equity[ends]
+
+    def stats(self) -> Dict[str, Any]:
+        """성과 요약"""
+        final = float(self.equity[-1]) if len(self.equity) else self.initial_capital
+        peak = np.maximum.accumulate(self.equity) if len(self.equity) else np.array([1.0])
+        drawdown = (self.equity - peak) / peak * 100 if len(self.equity) else np.array([0.0])
+
+        daily = np.r_[self.initial_capital, self.daily_equity()]
+        returns = np.diff(daily) / daily[:-1]
+        sharpe = float(returns.mean() / returns.std() * math.sqrt(252)) if len(returns) > 1 and returns.std() > 0 else 0.0
+
+        pnls = np.array([t['net_pnl'] for t in self.trades], dtype=np.float64)
+        gains = pnls[pnls > 0].sum()
+        losses = -pnls[pnls < 0].sum()
+
+        return {
+            'final_equity': round(final),
+            'total_return_pct': round((final / self.initial_capital - 1) * 100, 3),
+            'max_drawdown_pct': round(float(drawdown.min()), 3),
+            'sharpe': round(sharpe, 3),
+            'trade_count': len(self.trades),
+            'win_rate': round(float((pnls > 0).mean()), 3) if len(pnls) else 0.0,
+            'avg_trade_pnl': round(float(pnls.mean())) if len(pnls) else 0,
+            'profit_factor': round(float(gains / losses), 3) if losses > 0 else float('inf') if gains > 0 else 0.0,
+        }
+
+
+class Backtester:
+    """
+    이벤트 기반 백테스터
+
+    봉마다: 미체결 주문 체결 → 보유 종목 청산 판단 → (AI 스캔 주기마다) 스캔/매수 판단
+    - Fast Scan: 봉 누적 지표로 MarketSnapshot 생성 → 최소 거래대금 필터 → 거래대금 상위
+    - Deep Scan: StockScorer.score_records (봉으로 알 수 없는 항목은 BarData.extra 제공 시 사용)
+    - AI: StubAITrader (결정적)
+    - 매수/매도: TradingStrategy.should_buy / PortfolioManager.check_all_positions,
+      DynamicRiskManager.reserve_entries (main.py와 같은 순서)
+    """
+
+    FAST_SCAN_SIZE = 50     # StockScanner.fast_scan 상위 종목 수
+    AI_CANDIDATES = 10      # AI 분석 대상 (main.py deep[:10])
+    MAX_ENTRIES = 5         # 회차당 매수 시도 (main.py buy_recs[:5])
+
+    def __init__(
+        self,
+        data: BarData,
+        config: Optional[Dict[str, Any]] = None,
+        trading_config: Optional[Dict[str, Any]] = None,
+        scanning_config: Optional[Dict[str, Any]] = None,
+        ai: Optional[StubAITrader] = None,
+        fill_model: Optional[FillModel] = None
+    ):
+        self.data = data
+        self.config = config or load_config("config")
+        self.trading_config = trading_config or load_config("trading_rules")
+        self.scanning_config = scanning_config or load_config("scanning_rules")
+        backtest_config = self.config.get('backtest', {})
+
+        self.scorer = StockScorer(self.scanning_config)
+        self.ai = ai or StubAITrader(backtest_config.get('ai', {}))
+        self.fill_model = fill_model or FillModel(backtest_config.get('fill', {}))
+
+        scanning = self.scanning_config['scanning']
+        self.min_trading_value = scanning['filters']['min_trading_value']
+        self.ai_min_score = scanning['grading']['ai_analysis_min_score']
+        self.top_k = 20
+
+        # 실거래 주기(초) → 봉 수
+        bar_seconds = backtest_config.get('bar_seconds', 60)
+        self.scan_every = max(1, round(scanning['intervals']['ai_analysis'] / bar_seconds))
+        check_interval = self.config.get('monitoring', {}).get('positions_check_interval', 10)
+        self.exit_every = max(1, round(check_interval / bar_seconds))
+
+        order_config = self.config.get('order_management', {})
+        self.order_timeout_bars = max(1, math.ceil(order_config.get('stale_order_timeout', 30) / bar_seconds))
+        self.reprice_buy = order_config.get('reprice_buy', False)
+        self.reprice_sell = order_config.get('reprice_sell', True)
+        self.max_reprices = order_config.get('max_reprices', 2)
+
+        self.initial_capital = self.config['trading']['initial_capital']
+        self._code_index = {code: j for j, code in enumerate(data.codes)}
+        self._reset()
+
+    def _reset(self):
+        self.strategy = TradingStrategy(trading_config=self.trading_config, config=self.config)
+        self.risk_manager = DynamicRiskManager(self.config)
+        self.portfolio = PortfolioManager(self.strategy)
+
+        self.cash = float(self.initial_capital)
+        self.holdings = np.zeros(len(self.data.codes), dtype=np.int64)
+        self.open_orders: List[SimOrder] = []
+        self.fills: List[Dict[str, Any]] = []
+        self.trades: List[Dict[str, Any]] = []
+        self._order_seq = 0
+        self._entry_costs: Dict[str, float] = {}   # 보유 종목별 누적 매수 비용
+        self._partial_trades: Dict[str, Dict[str, Any]] = {}   # 청산 진행 중 거래
+
+    def run(self, quiet: bool = True) -> BacktestResult:
+        """
+        백테스트 실행
+
+        Args:
+            quiet: 전략/리스크 모듈의 체결별 로그 비활성화
+        """
+        self._reset()
+        data = self.data
+        times = data.times.astype('datetime64[s]').tolist()
+        equity = np.empty(len(data), dtype=np.float64)
+
+        if quiet:
+            logger.disable("src.strategy")
+            logger.disable("src.scanner")
+        try:
+            prev: Optional[DayState] = None
+            for day, start, end in data.iter_days():
+                state = data.day_features(start, end, prev)
+                self.strategy.reset_daily_pnl()
+
+                for t in range(start, end):
+                    now = times[t]
+                    prices = state.price[t - start]
+
+                    self._process_orders(t, now, prices)
+                    if (t - start) % self.exit_every == 0:
+                        self._check_exits(t, now, prices)
+                    if (t - start) % self.scan_every == 0:
+                        self._scan_and_enter(t, now, state, prices)
+
+                    equity[t] = self.cash + float(np.dot(self.holdings, np.nan_to_num(prices)))
+                prev = state
+        finally:
+            if quiet:
+                logger.enable("src.strategy")
+                logger.enable("src.scanner")
+
+        result = BacktestResult(data.times, equity, self.trades, self.fills, self.initial_capital)
+        logger.info(f"백테스트 완료: {len(data.days)}일, {len(data)}봉, {len(data.codes)}종목 - {result.stats()}")
+        return result
+
+    # 주문/체결
+
+    def _submit(
+        self,
+        t: int,
+        now: datetime,
+        code: str,
+        name: str,
+        side: str,
+        quantity: int,
+        price: Optional[float],
+        reason: str = ""
+    ) -> SimOrder:
+        self._order_seq += 1
+        order = SimOrder(f"{self._order_seq:07d}", code, name, side, quantity, price, now, t, reason)
+        self.open_orders.append(order)
+        return order
+
+    def _has_open(self, code: str, side: str) -> bool:
+        return any(o.code == code and o.side == side for o in self.open_orders)
+
+    def _pending_buy_count(self) -> int:
+        return len({o.code for o in self.open_orders if o.side == SimOrder.SIDE_BUY})
+
+    def _committed_cash(self) -> float:
+        """미체결 매수 주문 예정 금액"""
+        return sum(
+            o.remaining * (o.limit_price or 0) for o in self.open_orders if o.side == SimOrder.SIDE_BUY
+        )
+
+    def _process_orders(self, t: int, now: datetime, prices: np.ndarray):
+        """미체결 주문 체결 (주문 다음 봉부터) 및 만료 처리"""
+        if not self.open_orders:
+            return
+        data = self.data
+        still_open = []
+        for order in self.open_orders:
+            if order.submitted_bar >= t:
+                still_open.append(order)
+                continue
+
+            j = self._code_index[order.code]
+            result = self.fill_model.fill(order, data.open[t, j], data.high[t, j], data.low[t, j], data.volume[t, j])
+            if result:
+                self._apply_fill(order, j, result[0], float(result[1]), now)
+
+            if order.remaining == 0:
+                order.status = SimOrder.STATUS_FILLED
+                continue
+
+            if t - order.submitted_bar >= self.order_timeout_bars:
+                # OrderManager 미체결 정리와 같은 규칙: 재호가 설정 시 현재가로 재주문, 아니면 취소
+                reprice = self.reprice_sell if order.side == SimOrder.SIDE_SELL else self.reprice_buy
+                price = prices[j]
+                if reprice and order.reprices < self.max_reprices and not np.isnan(price):
+                    order.limit_price = float(price)
+                    order.reprices += 1
+                    order.submitted_bar = t
+                else:
+                    order.status = SimOrder.STATUS_CANCELLED
+                    continue
+            still_open.append(order)
+        self.open_orders = still_open
+
+    def _apply_fill(self, order: SimOrder, j: int, quantity: int, price: float, now: datetime):
+        """체결 반영 (현금/보유수량 + TradingStrategy 포지션)"""
+        if order.side == SimOrder.SIDE_SELL:
+            position = self.strategy.get_position(order.code)
+            if position is None:
+                return
+            quantity = min(quantity, position.quantity)
+        elif quantity * price > self.cash:
+            quantity = int(self.cash / (price * (1 + self.fill_model.commission_rate)))
+            if quantity <= 0:
+                return
+
+        cost = self.fill_model.costs(order.side, quantity, price)
+        order.filled_quantity += quantity
+        self.fills.append({
+            'time': now, 'order_no': order.order_no, 'code': order.code, 'side': order.side,
+            'quantity': quantity, 'price': price, 'cost': cost
+        })
+
+        if order.side == SimOrder.SIDE_BUY:
+            self.cash -= quantity * price + cost
+            self.holdings[j] += quantity
+            self._entry_costs[order.code] = self._entry_costs.get(order.code, 0.0) + cost
+            self.strategy.apply_buy_fill(
+                order.code, order.name, quantity, price, order_no=order.order_no, fill_time=now
+            )
+            return
+
+        self.cash += quantity * price - cost
+        self.holdings[j] -= quantity
+        entry_time = position.entry_time
+        entry_price = position.entry_price
+        closing = quantity >= position.quantity
+        gross = self.strategy.apply_sell_fill(order.code, quantity, price, order_no=order.order_no)
+
+        # 거래 내역은 청산 완료 시 기록 (부분 청산 손익 누적)
+        trade = self._open_trade(order.code, entry_time, entry_price)
+        trade['quantity'] += quantity
+        trade['gross_pnl'] += gross or 0.0
+        trade['costs'] += cost
+        trade['exit_value'] += quantity * price
+        if closing:
+            trade['costs'] += self._entry_costs.pop(order.code, 0.0)
+            trade.update({
+                'exit_time': now,
+                'exit_price': trade.pop('exit_value') / trade['quantity'],
+                'reason': order.reason,
+                'net_pnl': trade['gross_pnl'] - trade['costs'],
+            })
+            self.trades.append(trade)
+            del self._partial_trades[order.code]
+
+    def _open_trade(self, code: str, entry_time: datetime, entry_price: float) -> Dict[str, Any]:
+        trade = self._partial_trades.get(code)
+        if trade is None:
+            trade = self._partial_trades[code] = {
+                'code': code, 'entry_time': entry_time, 'entry_price': entry_price,
+                'quantity': 0, 'gross_pnl': 0.0, 'costs': 0.0, 'exit_value': 0.0
+            }
+        return trade
+
+    # 전략
+
+    def _check_exits(self, t: int, now: datetime, prices: np.ndarray):
+        """보유 종목 청산 판단 (main.py _monitor_positions와 동일)"""
+        if not self.strategy.positions:
+            return
+        current_prices = {}
+        for code in self.strategy.positions:
+            price = prices[self._code_index[code]]
+            if not np.isnan(price):
+                current_prices[code] = float(price)
+
+        for signal in self.portfolio.check_all_positions(current_prices, now):
+            position = signal['position']
+            if self._has_open(position.stock_code, SimOrder.SIDE_SELL):
+                continue
+            decision = signal['decision']
+            self._submit(
+                t, now, position.stock_code, position.stock_name, SimOrder.SIDE_SELL,
+                position.quantity, int(decision['price']), reason=decision['reason']
+            )
+
+    def _scan_and_enter(self, t: int, now: datetime, state: DayState, prices: np.ndarray):
+        """스캔 → 점수 → AI → 매수 판단/예약 → 주문 (main.py _ai_scan_loop/_execute_trades와 동일 순서)"""
+        if not self.strategy._check_trading_time(now):
+            return
+
+        candidates = self._deep_scan(t, state)
+        if not candidates:
+            return
+
+        current_capital = self.cash + float(np.dot(self.holdings, np.nan_to_num(prices)))
+        self.risk_manager.update_risk_level(current_capital)
+        min_confidence = self.risk_manager.get_ai_confidence_min()
+
+        ai_result = self.ai.analyze_many(candidates[:self.AI_CANDIDATES], timestamp=now)
+        buy_recs = [
+            s for s in ai_result
+            if s['ai_analysis'].get('recommendation') == 'BUY'
+            and s['ai_analysis'].get('confidence', 0) >= min_confidence
+        ][:self.MAX_ENTRIES]
+
+        approved = [
+            s for s in buy_recs
+            if not self._has_open(s['code'], SimOrder.SIDE_BUY)
+            and self.strategy.should_buy(s, now)['decision']
+        ]
+        if not approved:
+            return
+
+        num_positions = len(self.strategy.positions) + self._pending_buy_count()
+        available = self.cash - self._committed_cash()
+        reservations = self.risk_manager.reserve_entries(current_capital, num_positions, approved, available)
+        try:
+            for reservation in reservations:
+                stock = reservation['stock']
+                price = stock['current_price']
+                quantity = self.risk_manager.calculate_quantity(reservation['budget'], price)
+                quantity = min(quantity, int(available / (price * (1 + self.fill_model.commission_rate))))
+                if quantity <= 0:
+                    continue
+                available -= quantity * price
+                self._submit(t, now, stock['code'], stock.get('name', ''), SimOrder.SIDE_BUY, quantity, price)
+        finally:
+            self.risk_manager.release_entries(reservations)
+
+    def _deep_scan(self, t: int, state: DayState) -> List[Dict[str, Any]]:
+        """봉 누적 지표 기반 Fast Scan + 점수 계산 (상위 top_k, 점수 내림차순)"""
+        data = self.data
+        row = state.row(t)
+        nan = np.full(len(data.codes), np.nan)
+        columns = {field: row.get(field, nan) for field in MarketSnapshot.FIELDS}
+        if 'trade_strength' in data.extra:
+            columns['strength'] = data.extra['trade_strength'][t]
+
+        # 체결 전 종목 제외 (가격 0)
+        columns = {k: np.where(row['price'] > 0, v, np.nan) for k, v in columns.items()}
+        trading_value = np.nan_to_num(columns['trading_value'])
+        ranks = np.zeros(len(data.codes), dtype=np.int32)
+        ranks[np.argsort(-trading_value, kind='stable')] = np.arange(1, len(data.codes) + 1)
+        ranks[trading_value <= 0] = 0
+
+        snapshot = MarketSnapshot(
+            data.codes, data.names, [''] * len(data.codes),
+            {'bars': columns}, {'bars': ranks}, timestamp=None
+        )
+        mask = trading_value >= self.min_trading_value
+        rows = snapshot.top_k('trading_value', self.FAST_SCAN_SIZE, mask)
+        if len(rows) == 0:
+            return []
+
+        records = snapshot.to_records(rows)
+        proximity = row['high_proximity_pct']
+        for i, record in zip(rows, records):
+            record['current_price'] = record['price']
+            record['volume_change_pct'] = record['volume_change']
+            record['price_change_pct'] = record['price_change']
+            record['high_proximity_pct'] = float(proximity[i])
+            for field, values in data.extra.items():
+                record[field] = values[t, i].item()
+
+        for record, score in zip(records, self.scorer.score_records(records)):
+            record['score_info'] = score
+            record['total_score'] = score['total_score']
+            record['grade'] = score['grade']
+
+        return sorted(records, key=lambda x: x['total_score'], reverse=True)[:self.top_k]
+
+
+__all__ = ["Backtester", "BacktestResult"]
@@ -0,0 +1,130 @@
+"""
+백테스트 체결 모델
+지정가 주문을 다음 봉부터 시가/고가/저가/거래량 기준으로 체결 (슬리피지, 수수료, 거래세, 참여율 제한)
+"""
+
+import math
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+
+class SimOrder:
+    """모의 주문"""
+
+    SIDE_BUY = "BUY"
+    SIDE_SELL = "SELL"
+
+    # 상태
+    STATUS_OPEN = "OPEN"
+    STATUS_FILLED = "FILLED"
+    STATUS_CANCELLED = "CANCELLED"
+
+    __slots__ = (
+        'order_no', 'code', 'name', 'side', 'quantity', 'limit_price', 'submitted_at',
+        'submitted_bar', 'filled_quantity', 'status', 'reason', 'reprices'
+    )
+
+    def __init__(
+        self,
+        order_no: str,
+        code: str,
+        name: str,
+        side: str,
+        quantity: int,
+        limit_price: Optional[float],
+        submitted_at: datetime,
+        submitted_bar: int,
+        reason: str = ""
+    ):
+        self.order_no = order_no
+        self.code = code
+        self.name = name
+        self.side = side
+        self.quantity = quantity
+        self.limit_price = limit_price   # None: 시장가
+        self.submitted_at = submitted_at
+        self.submitted_bar = submitted_bar
+        self.filled_quantity = 0
+        self.status = self.STATUS_OPEN
+        self.reason = reason             # 매도 사유 (STOP_LOSS 등)
+        self.reprices = 0
+
+    @property
+    def remaining(self) -> int:
+        return self.quantity - self.filled_quantity
+
+    @property
+    def is_open(self) -> bool:
+        return self.status == self.STATUS_OPEN
+
+
+class FillModel:
+    """
+    봉 기반 체결 모델
+
+    - 주문 봉의 다음 봉부터 체결 (같은 봉 체결 없음 → 미래 정보 사용 방지)
+    - 매수 지정가: 저가 ≤ 지정가면 min(시가, 지정가)에 체결, 매도는 반대
+    - 시장가: 시가 체결
+    - 슬리피지는 불리한 방향으로 적용 (지정가는 지정가를 넘지 않음), 봉 거래량의 max_participation까지만 체결 (잔량은 다음 봉)
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.slippage_bps = config.get('slippage_bps', 5.0)
+        self.commission_rate = config.get('commission_rate', 0.00015)   # 매수/매도 수수료
+        self.sell_tax_rate = config.get('sell_tax_rate', 0.0015)        # 매도 거래세
+        self.max_participation = config.get('max_participation', 0.1)   # 봉 거래량 대비 최대 체결 비율
+
+    def fill(
+        self,
+        order: SimOrder,
+        open_: float,
+        high: float,
+        low: float,
+        volume: float
+    ) -> Optional[Tuple[int, float]]:
+        """
+        한 봉에서의 체결
+
+        Returns:
+            (체결 수량, 체결가) 또는 None
+        """
+        if volume <= 0 or math.isnan(open_):
+            return None
+
+        if order.side == SimOrder.SIDE_BUY:
+            if order.limit_price is None:
+                base = open_
+            elif low <= order.limit_price:
+                base = min(open_, order.limit_price)
+            else:
+                return None
+            price = base * (1 + self.slippage_bps / 10000)
+            if order.limit_price is not None:
+                price = min(price, order.limit_price)
+        else:
+            if order.limit_price is None:
+                base = open_
+            elif high >= order.limit_price:
+                base = max(open_, order.limit_price)
+            else:
+                return None
+            price = base * (1 - self.slippage_bps / 10000)
+            if order.limit_price is not None:
+                price = max(price, order.limit_price)
+
+        quantity = min(order.remaining, int(volume * self.max_participation))
+        if quantity <= 0:
+            return None
+        return quantity, price
+
+    def costs(self, side: str, quantity: int, price: float) -> float:
+        """수수료 + 거래세 (원)"""
+        amount = quantity * price
+        cost = amount * self.commission_rate
+        if side == SimOrder.SIDE_SELL:
+            cost += amount * self.sell_tax_rate
+        return cost
+
+
+__all__ = ["SimOrder", "FillModel"]
@@ -0,0 +1,64 @@
+"""
+백테스트용 AI 대체 모듈
+GeminiAITrader와 같은 응답 형식을 스캔 점수 기반 결정적 규칙으로 생성
+"""
+
+import random
+import zlib
+from typing import Dict, Any, List, Optional
+
+
+class StubAITrader:
+    """
+    결정적 AI 판단 (외부 호출 없음)
+
+    신뢰도 = base_confidence + (총점 - pivot_score) × confidence_per_point (+ 선택적 노이즈)
+    노이즈는 (종목코드, 판단 시각) 시드로 생성 → 같은 입력이면 항상 같은 결과
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.pivot_score = config.get('pivot_score', 200)
+        self.base_confidence = config.get('base_confidence', 0.7)
+        self.confidence_per_point = config.get('confidence_per_point', 0.002)
+        self.max_confidence = config.get('max_confidence', 0.95)
+        self.buy_confidence = config.get('buy_confidence', 0.7)   # 이 이상이면 BUY
+        self.noise = config.get('noise', 0.0)                     # 신뢰도 노이즈 폭 (±)
+        self.seed = config.get('seed', 0)
+
+    def analyze(self, stock_data: Dict[str, Any], timestamp: Any = None) -> Dict[str, Any]:
+        """종목 판단 (GeminiAITrader.analyze_stock 응답 형식)"""
+        score = stock_data.get('total_score', 0)
+        confidence = self.base_confidence + (score - self.pivot_score) * self.confidence_per_point
+
+        if self.noise:
+            key = f"{self.seed}:{stock_data.get('code', '')}:{timestamp}".encode()
+            confidence += random.Random(zlib.crc32(key)).uniform(-self.noise, self.noise)
+
+        confidence = round(min(max(confidence, 0.0), self.max_confidence), 4)
+        recommendation = 'BUY' if confidence >= self.buy_confidence else 'HOLD'
+        price = stock_data.get('current_price', 0)
+
+        return {
+            'probability': round(confidence * 100),
+            'recommendation': recommendation,
+            'target_price': int(price * (1 + confidence * 0.1)) if price else 0,
+            'risk_level': 'LOW' if confidence >= 0.85 else 'MEDIUM' if confidence >= 0.7 else 'HIGH',
+            'confidence': confidence,
+            'reason': f'스캔 점수 {score}점 기반 (백테스트)'
+        }
+
+    async def analyze_stock(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
+        return self.analyze(stock_data)
+
+    def analyze_many(self, stocks: List[Dict[str, Any]], timestamp: Any = None) -> List[Dict[str, Any]]:
+        """여러 종목 판단 (신뢰도 내림차순, GeminiAITrader.analyze_multiple_stocks와 동일)"""
+        for stock in stocks:
+            stock['ai_analysis'] = self.analyze(stock, timestamp)
+        return sorted(stocks, key=lambda x: x['ai_analysis'].get('confidence', 0), reverse=True)
+
+    async def analyze_multiple_stocks(self, stocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return self.analyze_many(stocks)
+
+
+__all__ = ["StubAITrader"]
@@ -0,0 +1,234 @@
+"""
+파라미터 탐색
+리스크 모드/평가 가중치 등 설정 조합을 프로세스 풀로 병렬 백테스트하고 결과를 표로 정리
+시장 데이터는 공유 메모리에 한 번만 올리고 워커는 복사 없이 연결
+"""
+
+import copy
+import itertools
+import os
+import random
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, Any, List, Optional, Tuple
+from src.backtest.data import BarData
+from src.backtest.engine import Backtester
+from src.utils.config_loader import load_config
+from src.utils.logger import logger
+
+
+# 파라미터 키 첫 구간 → Backtester 설정 인자
+CONFIG_TARGETS = {
+    'config': 'config',
+    'trading_rules': 'trading_config',
+    'scanning_rules': 'scanning_config',
+}
+
+
+class SharedBarData:
+    """BarData 배열을 공유 메모리 블록으로 보관 (워커는 이름으로 연결)"""
+
+    ARRAYS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, data: BarData):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        arrays = {field: getattr(data, field) for field in self.ARRAYS}
+        arrays['times'] = data.times.view(np.int64)
+        arrays.update({f"extra:{k}": np.asarray(v) for k, v in data.extra.items()})
+
+        self.spec = {
+            'codes': data.codes,
+            'names': data.names,
+            'arrays': {field: self._share(values) for field, values in arrays.items()},
+        }
+
+    def _share(self, values: np.ndarray) -> Tuple[str, Tuple[int, ...], str]:
+        block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        self._blocks.append(block)
+        np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[...] = values
+        return block.name, values.shape, values.dtype.str
+
+    @staticmethod
+    def attach(spec: Dict[str, Any]) -> Tuple[BarData, List[shared_memory.SharedMemory]]:
+        """
+        공유 메모리 연결 → BarData (배열 복사 없음)
+
+        Returns:
+            (BarData, 연결 핸들 - 데이터 사용 중에는 유지해야 함)
+        """
+        blocks = []
+        arrays = {}
+        for field, (name, shape, dtype) in spec['arrays'].items():
+            block = shared_memory.SharedMemory(name=name)
+            blocks.append(block)
+            array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+            array.flags.writeable = False
+            arrays[field] = array
+
+        extra = {k.split(':', 1)[1]: v for k, v in arrays.items() if k.startswith('extra:')}
+        data = BarData(
+            arrays['times'].view('datetime64[m]'),
+            spec['codes'],
+            names=spec['names'],
+            extra=extra,
+            **{field: arrays[field] for field in SharedBarData.ARRAYS}
+        )
+        return data, blocks
+
+    def close(self):
+        """공유 메모리 해제 (생성 프로세스에서 호출)"""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def set_path(configs: Dict[str, Dict[str, Any]], key: str, value: Any):
+    """
+    점 표기법 키로 설정값 변경
+
+    Args:
+        configs: {'config': ..., 'trading_rules': ..., 'scanning_rules': ...}
+        key: 설정 이름으로 시작하는 경로 (예: 'scanning_rules.scanning.weights.volume')
+    """
+    config_name, _, path = key.partition('.')
+    if config_name not in configs or not path:
+        raise KeyError(f"알 수 없는 파라미터 키: {key} (시작: {', '.join(CONFIG_TARGETS)})")
+
+    node = configs[config_name]
+    *parents, leaf = path.split('.')
+    for part in parents:
+        if not isinstance(node, dict) or part not in node:
+            raise KeyError(f"설정 경로 없음: {key}")
+        node = node[part]
+    if not isinstance(node, dict) or leaf not in node:
+        raise KeyError(f"설정 경로 없음: {key}")
+    node[leaf] = value
+
+
+# 워커 프로세스 상태 (초기화 시 한 번 설정)
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(spec: Dict[str, Any], configs: Dict[str, Dict[str, Any]]):
+    logger.disable("src")
+    data, blocks = SharedBarData.attach(spec)
+    _worker.update(data=data, blocks=blocks, configs=configs)
+
+
+def _run_one(params: Dict[str, Any]) -> Dict[str, Any]:
+    configs = copy.deepcopy(_worker['configs'])
+    for key, value in params.items():
+        set_path(configs, key, value)
+
+    backtester = Backtester(
+        _worker['data'],
+        **{CONFIG_TARGETS[name]: config for name, config in configs.items()}
+    )
+    return backtester.run(quiet=True).stats()
+
+
+class ParameterSweep:
+    """
+    설정 조합 병렬 백테스트
+
+    파라미터 키는 설정 이름 + 점 표기법 경로
+    (예: 'config.trading.dynamic_risk_management.normal_mode.stop_loss_pct',
+         'scanning_rules.scanning.weights.foreign_institute')
+    """
+
+    def __init__(
+        self,
+        data: BarData,
+        config: Optional[Dict[str, Any]] = None,
+        trading_config: Optional[Dict[str, Any]] = None,
+        scanning_config: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = None
+    ):
+        self.data = data
+        self.configs = {
+            'config': config or load_config("config"),
+            'trading_rules': trading_config or load_config("trading_rules"),
+            'scanning_rules': scanning_config or load_config("scanning_rules"),
+        }
+        self.workers = workers or os.cpu_count() or 1
+
+    @staticmethod
+    def grid(space: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """전체 조합 (키별 후보값 목록의 곱)"""
+        keys = list(space)
+        return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+    @staticmethod
+    def sample(space: Dict[str, Any], n: int, seed: int = 0) -> List[Dict[str, Any]]:
+        """
+        무작위 조합 n개
+
+        Args:
+            space: {키: 후보값 목록 (균등 선택) 또는 (하한, 상한) 튜플 (균등 분포, 둘 다 정수면 정수)}
+        """
+        rng = random.Random(seed)
+        samples = []
+        for _ in range(n):
+            params = {}
+            for key, spec in space.items():
+                if isinstance(spec, tuple):
+                    low, high = spec
+                    params[key] = (
+                        rng.randint(low, high) if isinstance(low, int) and isinstance(high, int)
+                        else round(rng.uniform(low, high), 6)
+                    )
+                else:
+                    params[key] = rng.choice(spec)
+            samples.append(params)
+        return samples
+
+    def run(self, param_sets: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        조합별 백테스트 실행
+
+        Returns:
+            조합당 1행 (파라미터 컬럼 + 성과 지표 컬럼, 실패 시 error 컬럼에 사유)
+        """
+        # 잘못된 키는 워커 실행 전에 확인
+        configs = copy.deepcopy(self.configs)
+        for params in param_sets:
+            for key, value in params.items():
+                set_path(configs, key, value)
+
+        shared = SharedBarData(self.data)
+        rows: List[Optional[Dict[str, Any]]] = [None] * len(param_sets)
+        logger.info(f"파라미터 탐색 시작: {len(param_sets)}개 조합, 워커 {self.workers}개")
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(shared.spec, self.configs)
+            ) as executor:
+                futures = {executor.submit(_run_one, params): i for i, params in enumerate(param_sets)}
+                for done, future in enumerate(as_completed(futures), 1):
+                    i = futures[future]
+                    try:
+                        row = {**param_sets[i], **future.result(), 'error': ''}
+                    except Exception as e:
+                        logger.error(f"조합 {i} 실패: {e}")
+                        row = {**param_sets[i], 'error': str(e)}
+                    rows[i] = row
+                    if done % max(1, len(param_sets) // 10) == 0:
+                        logger.info(f"파라미터 탐색 진행: {done}/{len(param_sets)}")
+        finally:
+            shared.close()
+
+        # 파라미터 컬럼 → 성과 지표 컬럼 → error 순
+        param_keys = list(dict.fromkeys(k for params in param_sets for k in params))
+        table = pd.DataFrame(rows)
+        others = [c for c in table.columns if c not in param_keys and c != 'error']
+        table = table[param_keys + others + ['error']]
+        table.index.name = 'run'
+        return table
+
+
+__all__ = ["ParameterSweep", "SharedBarData", "set_path"]
@@ -0,0 +1,334 @@
+"""
+WebSocket 시세 기록/재생
+수신 원문 프레임을 수신 시각과 함께 압축 청크 로그로 저장하고, 같은 핸들러로 재생
+
+파일 형식:
+    MAGIC
+    청크 반복: CHUNK_HEADER + 종목코드 목록(쉼표 구분) + zlib(프레임 반복: FRAME_HEADER + UTF-8 원문)
+    청크 헤더에 종목 목록이 있어 헤더만 읽어 종목별 색인 구성 (비정상 종료 시 마지막 불완전 청크만 무시)
+"""
+
+import asyncio
+import json
+import struct
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple
+from src.utils.logger import logger
+
+
+MAGIC = b"KWFEED01"
+CHUNK_TAG = b"CHNK"
+# 태그, 압축 크기, 원본 크기, 종목 목록 크기, 첫 수신시각(ns), 마지막 수신시각(ns), 프레임 수
+CHUNK_HEADER = struct.Struct('<4sIIIqqI')
+# 수신시각(ns), 원문 길이
+FRAME_HEADER = struct.Struct('<qI')
+
+
+def _frame_symbols(message: str) -> Iterable[str]:
+    """REAL 프레임의 종목코드 (그 외 프레임은 없음)"""
+    if '"REAL"' not in message:
+        return ()
+    try:
+        data = json.loads(message)
+    except ValueError:
+        return ()
+    if data.get("trnm") != "REAL":
+        return ()
+    return (item.get("item", "") for item in data.get("data", []))
+
+
+class FeedRecorder:
+    """
+    수신 프레임 기록기
+
+    record()는 메모리 버퍼에 추가만 하고, 청크 단위 압축/쓰기는 전용 스레드 1개에서 순서대로 처리
+    (수신 루프 지연 최소화)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        chunk_frames: int = 2000,
+        chunk_seconds: float = 1.0,
+        compression_level: int = 1
+    ):
+        self.path = Path(path)
+        self.chunk_frames = chunk_frames
+        self.chunk_ns = int(chunk_seconds * 1e9)
+        self.compression_level = compression_level
+
+        self._buffer: List[Tuple[int, str]] = []
+        self._file = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # 통계
+        self.frames = 0
+        self.chunks = 0
+        self.raw_bytes = 0
+        self.written_bytes = 0
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.path.exists() or self.path.stat().st_size == 0
+        self._file = open(self.path, 'ab')
+        if is_new:
+            self._file.write(MAGIC)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="feed-recorder")
+        logger.info(f"시세 기록 시작: {self.path}")
+
+    def record(self, message: str, received_ns: Optional[int] = None):
+        """프레임 기록 (수신 시각 기본 현재)"""
+        if received_ns is None:
+            received_ns = time.time_ns()
+        if isinstance(message, bytes):
+            message = message.decode('utf-8', errors='replace')
+        self._buffer.append((received_ns, message))
+        self.frames += 1
+
+        if (
+            len(self._buffer) >= self.chunk_frames
+            or received_ns - self._buffer[0][0] >= self.chunk_ns
+        ):
+            self.flush()
+
+    def flush(self):
+        """버퍼를 청크로 기록 요청 (쓰기는 백그라운드)"""
+        if not self._buffer:
+            return
+        if self._file is None:
+            self._open()
+        frames, self._buffer = self._buffer, []
+        self._writer.submit(self._write_chunk, frames)
+
+    def _write_chunk(self, frames: List[Tuple[int, str]]):
+        try:
+            payload = bytearray()
+            symbols = set()
+            for received_ns, message in frames:
+                raw = message.encode('utf-8')
+                payload += FRAME_HEADER.pack(received_ns, len(raw))
+                payload += raw
+                symbols.update(_frame_symbols(message))
+            symbols.discard("")
+
+            compressed = zlib.compress(bytes(payload), self.compression_level)
+            symbol_bytes = ','.join(sorted(symbols)).encode('ascii')
+            header = CHUNK_HEADER.pack(
+                CHUNK_TAG, len(compressed), len(payload), len(symbol_bytes),
+                frames[0][0], frames[-1][0], len(frames)
+            )
+            with self._lock:
+                self._file.write(header + symbol_bytes + compressed)
+                self._file.flush()
+                self.chunks += 1
+                self.raw_bytes += len(payload)
+                self.written_bytes += len(header) + len(symbol_bytes) + len(compressed)
+        except Exception as e:
+            logger.error(f"시세 기록 실패 ({len(frames)}프레임): {e}")
+
+    def close(self):
+        """남은 버퍼 기록 후 종료"""
+        self.flush()
+        if self._writer:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        if self._file:
+            self._file.close()
+            self._file = None
+            ratio = self.raw_bytes / self.written_bytes if self.written_bytes else 0
+            logger.info(
+                f"시세 기록 종료: {self.path} - {self.frames}프레임, {self.chunks}청크, "
+                f"{self.written_bytes:,}B (압축 {ratio:.1f}배)"
+            )
+
+
+class ChunkInfo:
+    """청크 색인 항목"""
+
+    __slots__ = ('offset', 'size', 'raw_size', 'first_ns', 'last_ns', 'count', 'symbols')
+
+    def __init__(
+        self,
+        offset: int,
+        size: int,
+        raw_size: int,
+        first_ns: int,
+        last_ns: int,
+        count: int,
+        symbols: frozenset
+    ):
+        self.offset = offset      # 압축 데이터 시작 위치
+        self.size = size
+        self.raw_size = raw_size
+        self.first_ns = first_ns
+        self.last_ns = last_ns
+        self.count = count
+        self.symbols = symbols
+
+
+class FeedLog:
+    """기록 파일 읽기 (청크 헤더 기반 시간/종목 색인)"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.chunks: List[ChunkInfo] = []
+        self.symbol_chunks: Dict[str, List[int]] = {}   # {종목코드: 청크 번호 목록}
+        self._build_index()
+
+    def _build_index(self):
+        file_size = self.path.stat().st_size
+        with open(self.path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"시세 기록 파일 형식 아님: {self.path}")
+
+            while True:
+                header = f.read(CHUNK_HEADER.size)
+                if len(header) < CHUNK_HEADER.size:
+                    break
+                tag, size, raw_size, symbol_size, first_ns, last_ns, count = CHUNK_HEADER.unpack(header)
+                if tag != CHUNK_TAG:
+                    logger.warning(f"시세 기록 손상 (위치 {f.tell() - CHUNK_HEADER.size}) - 이후 무시")
+                    break
+                symbols = f.read(symbol_size).decode('ascii')
+                offset = f.tell()
+                if offset + size > file_size:
+                    logger.warning(f"시세 기록 마지막 청크 불완전 - 무시: {self.path}")
+                    break
+
+                index = len(self.chunks)
+                symbol_set = frozenset(symbols.split(',')) if symbols else frozenset()
+                self.chunks.append(ChunkInfo(offset, size, raw_size, first_ns, last_ns, count, symbol_set))
+                for symbol in symbol_set:
+                    self.symbol_chunks.setdefault(symbol, []).append(index)
+                f.seek(size, 1)
+
+    @property
+    def frame_count(self) -> int:
+        return sum(c.count for c in self.chunks)
+
+    @property
+    def symbols(self) -> List[str]:
+        return sorted(self.symbol_chunks)
+
+    def _select(self, codes: Optional[Iterable[str]], start_ns: Optional[int], end_ns: Optional[int]) -> List[int]:
+        if codes is None:
+            indices = range(len(self.chunks))
+        else:
+            indices = sorted({i for code in codes for i in self.symbol_chunks.get(code, ())})
+        return [
+            i for i in indices
+            if (start_ns is None or self.chunks[i].last_ns >= start_ns)
+            and (end_ns is None or self.chunks[i].first_ns <= end_ns)
+        ]
+
+    def frames(
+        self,
+        codes: Optional[Iterable[str]] = None,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        (수신시각 ns, 원문) 순회
+
+        Args:
+            codes: 해당 종목이 포함된 청크만 읽음 (프레임 단위 필터는 호출 측)
+        """
+        with open(self.path, 'rb') as f:
+            for i in self._select(codes, start_ns, end_ns):
+                chunk = self.chunks[i]
+                f.seek(chunk.offset)
+                payload = memoryview(zlib.decompress(f.read(chunk.size)))
+                pos = 0
+                while pos < len(payload):
+                    received_ns, length = FRAME_HEADER.unpack_from(payload, pos)
+                    pos += FRAME_HEADER.size
+                    if (start_ns is None or received_ns >= start_ns) and (end_ns is None or received_ns <= end_ns):
+                        yield received_ns, bytes(payload[pos:pos + length]).decode('utf-8')
+                    pos += length
+
+
+class FeedReplayer:
+    """
+    기록 재생 (KiwoomWebSocketClient.dispatch_real로 실시간 핸들러 호출)
+
+    speed: 1.0 실시간, N배속, 0이면 대기 없이 최대 속도
+    """
+
+    def __init__(self, log: Any, speed: float = 1.0):
+        self.log = log if isinstance(log, FeedLog) else FeedLog(log)
+        self.speed = speed
+
+        # 통계
+        self.frames = 0
+        self.items = 0
+        self.max_lag = 0.0   # 예정 시각 대비 최대 지연 (초, 처리 부하 확인용)
+
+    async def replay(
+        self,
+        client: Any,
+        codes: Optional[Iterable[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> int:
+        """
+        재생
+
+        Args:
+            client: dispatch_real(items)를 가진 대상 (KiwoomWebSocketClient)
+            codes: 재생할 종목 (None이면 전체, 지정 시 다른 종목 항목은 제외)
+        Returns:
+            전달한 실시간 항목 수
+        """
+        code_set = set(codes) if codes is not None else None
+        start_ns = int(start.timestamp() * 1e9) if start else None
+        end_ns = int(end.timestamp() * 1e9) if end else None
+
+        loop = asyncio.get_running_loop()
+        base_ns = None
+        base_time = 0.0
+        self.frames = self.items = 0
+        self.max_lag = 0.0
+
+        for received_ns, message in self.log.frames(code_set, start_ns, end_ns):
+            try:
+                data = json.loads(message)
+            except ValueError:
+                continue
+            if data.get("trnm") != "REAL":
+                continue
+
+            items = data.get("data", [])
+            if code_set is not None:
+                items = [item for item in items if item.get("item", "") in code_set]
+                if not items:
+                    continue
+
+            if self.speed > 0:
+                if base_ns is None:
+                    base_ns, base_time = received_ns, loop.time()
+                delay = base_time + (received_ns - base_ns) / 1e9 / self.speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                else:
+                    self.max_lag = max(self.max_lag, -delay)
+            elif self.frames % 1000 == 0:
+                await asyncio.sleep(0)   # 최대 속도에서도 다른 태스크 실행 기회
+
+            await client.dispatch_real(items)
+            self.frames += 1
+            self.items += len(items)
+
+        logger.info(
+            f"시세 재생 완료: {self.frames}프레임, {self.items}항목 "
+            f"(배속 {self.speed or '최대'}, 최대 지연 {self.max_lag:.3f}초)"
+        )
+        return self.items
+
+
+__all__ = ["FeedRecorder", "FeedLog", "FeedReplayer", "ChunkInfo"]
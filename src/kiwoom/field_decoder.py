@@ -0,0 +1,217 @@
+"""
+키움 응답 필드 디코더
+숫자 문자열(부호/단위/빈 값) 변환 규칙을 표로 정의하고 행마다 필드를 한 번씩만 변환
+"""
+
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple, Union
+
+# 변환 종류
+INT = "int"              # 부호 유지 정수 (순매수량 등)
+FLOAT = "float"          # 부호 유지 실수 (등락률 등)
+PRICE = "price"          # 부호 제거 정수 (현재가 등 - 부호는 전일대비 방향)
+ABS_FLOAT = "abs_float"  # 부호 제거 실수
+STR = "str"              # 문자열 (앞뒤 공백 제거)
+
+
+def to_int(value: Optional[str]) -> int:
+    """부호 유지 정수 변환 (빈 값/잘못된 값은 0)"""
+    if not value:
+        return 0
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        try:
+            return int(float(value))
+        except (ValueError, TypeError):
+            return 0
+
+
+def to_float(value: Optional[str]) -> float:
+    """부호 유지 실수 변환 (빈 값/잘못된 값은 0)"""
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def to_price(value: Optional[str]) -> int:
+    """부호 제거 정수 변환"""
+    return abs(to_int(value))
+
+
+def to_abs_float(value: Optional[str]) -> float:
+    """부호 제거 실수 변환"""
+    return abs(to_float(value))
+
+
+def to_str(value: Optional[Any]) -> str:
+    """문자열 변환 (앞뒤 공백 제거, 숫자 등 문자열이 아닌 값도 허용)"""
+    return str(value).strip() if value is not None else ""
+
+
+_CONVERTERS = {
+    INT: to_int,
+    FLOAT: to_float,
+    PRICE: to_price,
+    ABS_FLOAT: to_abs_float,
+    STR: to_str,
+}
+
+# 행 변환 함수용 변환 (정상 값 기준 - 빈 값 등 예외는 _CONVERTERS로 재변환)
+_FAST_CONVERTERS = {
+    INT: int,
+    FLOAT: float,
+    PRICE: lambda value: abs(int(value)),
+    ABS_FLOAT: lambda value: abs(float(value)),
+    STR: str.strip,
+}
+
+
+def _scaled(convert: Callable[[Any], Any], scale: float) -> Callable[[Any], Any]:
+    """배율 적용 변환 (단위 환산)"""
+    return lambda value: convert(value) * scale
+
+
+_DEFAULTS = {INT: 0, FLOAT: 0.0, PRICE: 0, ABS_FLOAT: 0.0, STR: ""}
+
+# 정상 값 변환 실패 시 예외 (키 누락/빈 문자열/소수점 정수 등)
+_FAST_PATH_ERRORS = (KeyError, ValueError, TypeError, AttributeError)
+
+# 원본 키 정의: "키" 또는 ("키", 배율) - 여러 개면 응답에 있는 첫 키 사용
+SourceKey = Union[str, Tuple[str, float]]
+
+
+class FieldDecoder:
+    """
+    표 기반 응답 디코더
+
+    응답 키 구성(어떤 원본 키가 있는지)별로 (출력 키, 원본 키, 변환) 목록을 만들어
+    행 변환 함수로 캐시하고, 변환 실패 행만 값별 안전 변환으로 처리한다.
+
+    Example:
+        FieldDecoder({
+            'price': ('cur_prc', PRICE),
+            'trading_value': ((('trde_amt', 1), ('trde_prica', 1_000_000)), INT),
+            'volume_change': ('sdnin_rt', FLOAT, True),   # 선택 필드 (응답에 없으면 결과에서 제외)
+        })
+    """
+
+    def __init__(self, spec: Dict[str, tuple]):
+        # (출력 키, ((원본 키, 배율), ...), 변환 종류, 선택 여부)
+        self._fields: List[tuple] = []
+        for name, definition in spec.items():
+            keys, kind = definition[0], definition[1]
+            optional = definition[2] if len(definition) > 2 else False
+            if kind not in _CONVERTERS:
+                raise ValueError(f"알 수 없는 변환 종류: {kind}")
+            self._fields.append((name, self._normalize_keys(keys), kind, optional))
+
+        # 원본 키가 응답마다 달라질 수 있는 필드 (대체 키/선택 필드) - 나머지는 키 누락 시 안전 변환으로 처리
+        self._variable = [
+            i for i, (_, keys, _, optional) in enumerate(self._fields) if optional or len(keys) > 1
+        ]
+
+        # 키 구성 → 행 변환 함수
+        self._compiled: Dict[tuple, Callable[[Dict[str, Any]], Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _normalize_keys(keys: Union[SourceKey, Sequence[SourceKey]]) -> Tuple[Tuple[str, float], ...]:
+        if isinstance(keys, str):
+            return ((keys, 1),)
+        if isinstance(keys, tuple) and len(keys) == 2 and isinstance(keys[1], (int, float)):
+            return (keys,)
+        return tuple((k, 1) if isinstance(k, str) else k for k in keys)
+
+    def _plan(self, item: Dict[str, Any]) -> tuple:
+        """가변 필드별 사용할 원본 키 (없으면 None)"""
+        plan = []
+        for i in self._variable:
+            for key, scale in self._fields[i][1]:
+                if key in item:
+                    plan.append((key, scale))
+                    break
+            else:
+                plan.append(None)
+        return tuple(plan)
+
+    def _row_function(self, plan: tuple) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        function = self._compiled.get(plan)
+        if function is None:
+            function = self._compiled[plan] = self._build_row(plan)
+        return function
+
+    def _build_row(self, plan: tuple) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """키 구성별 행 변환 함수 (원본 키가 없는 필수 필드는 기본값)"""
+        sources = dict(zip(self._variable, plan))
+        steps: List[Tuple[str, str, Callable[[Any], Any]]] = []
+        defaults: Dict[str, Any] = {}
+        for i, (name, keys, kind, optional) in enumerate(self._fields):
+            source = sources[i] if i in sources else keys[0]
+            if source is None:
+                if not optional:
+                    defaults[name] = _DEFAULTS[kind]
+                continue
+            key, scale = source
+            convert = _FAST_CONVERTERS[kind]
+            if scale != 1:
+                convert = _scaled(convert, scale)
+            steps.append((name, key, convert))
+
+        def row(item: Dict[str, Any]) -> Dict[str, Any]:
+            out = {name: convert(item[key]) for name, key, convert in steps}
+            if defaults:
+                out.update(defaults)
+            return out
+
+        return row
+
+    def _decode_safe(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """값별 안전 변환 (빈 값/잘못된 값은 0)"""
+        out = {}
+        for name, keys, kind, optional in self._fields:
+            for key, scale in keys:
+                raw = item.get(key)
+                if raw is not None:
+                    value = _CONVERTERS[kind](raw)
+                    out[name] = value * scale if scale != 1 else value
+                    break
+            else:
+                if not optional:
+                    out[name] = _DEFAULTS[kind]
+        return out
+
+    def decode(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """응답 1행 변환"""
+        try:
+            return self._row_function(self._plan(item))(item)
+        except _FAST_PATH_ERRORS:
+            return self._decode_safe(item)
+
+    def decode_many(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        응답 배열 일괄 변환
+
+        같은 API 응답의 행은 대부분 키 구성이 같으므로 직전 행과 가변 필드 원본 키가
+        같으면 변환 함수를 그대로 쓰고, 달라진 행에서만 다시 찾는다.
+        """
+        results = []
+        last_plan = None
+        row = None
+        for item in items:
+            plan = self._plan(item)
+            if plan != last_plan:
+                row = self._row_function(plan)
+                last_plan = plan
+            try:
+                results.append(row(item))
+            except _FAST_PATH_ERRORS:
+                results.append(self._decode_safe(item))
+        return results
+
+
+__all__ = [
+    "FieldDecoder", "INT", "FLOAT", "PRICE", "ABS_FLOAT", "STR",
+    "to_int", "to_float", "to_price", "to_abs_float",
+]
@@ -0,0 +1,244 @@
+"""
+REST 요청 스케줄러
+우선순위 등급별 대기열 (청산 > 진입 > 계좌 > 스캔) + API ID별 호출 간격 + 전체 동시 요청 수 제한
+상위 등급은 대기 중인 하위 등급보다 먼저 배정되고, 예약된 동시 요청/초당 요청 몫을 단독 사용
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from src.kiwoom.retry_policy import LatencyTracker
+
+
+# 우선순위 등급 (작을수록 우선)
+PRIORITY_EXIT = 0      # 청산 주문/취소
+PRIORITY_ENTRY = 1     # 진입 주문, 주문 직전 시세
+PRIORITY_ACCOUNT = 2   # 잔고/계좌/미체결 조회
+PRIORITY_SCAN = 3      # 스캔 시세/순위 조회
+
+PRIORITY_NAMES = {
+    PRIORITY_EXIT: "exit",
+    PRIORITY_ENTRY: "entry",
+    PRIORITY_ACCOUNT: "account",
+    PRIORITY_SCAN: "scan",
+}
+
+
+class _Waiter:
+    """배정 대기 요청"""
+
+    __slots__ = ('priority', 'api_id', 'future', 'queued_at')
+
+    def __init__(self, priority: int, api_id: str, future: asyncio.Future):
+        self.priority = priority
+        self.api_id = api_id
+        self.future = future
+        self.queued_at = time.monotonic()
+
+
+class RequestScheduler:
+    """
+    우선순위 요청 스케줄러
+
+    배정 조건:
+        - API ID별 최소 호출 간격 (같은 API는 우선순위 순으로 다음 간격 배정)
+        - 전체 동시 요청 수 max_concurrent (reserved개는 reserved_for 이상 등급 전용)
+        - 초당 요청 수 rate_per_second (0이면 제한 없음, reserved_rate 비율은 reserved_for 이상 등급 전용)
+    대기열은 등급 → 도착 순서. 동시 요청/초당 한도로 막힌 상위 등급이 있으면 하위 등급도 배정하지 않음
+    (API 간격으로만 막힌 요청은 다른 API 요청을 막지 않음)
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 1.0,
+        max_concurrent: int = 8,
+        reserved: int = 2,
+        reserved_for: int = PRIORITY_ENTRY,
+        rate_per_second: float = 0.0,
+        reserved_rate: float = 0.2
+    ):
+        self.min_interval = min_interval
+        self.max_concurrent = max_concurrent
+        self.reserved = min(reserved, max_concurrent - 1)
+        self.reserved_for = reserved_for
+        self.rate_per_second = rate_per_second
+        self.reserved_tokens = rate_per_second * reserved_rate
+
+        self.in_flight = 0
+        self._next_allowed: Dict[str, float] = {}   # {api_id: 다음 호출 가능 시각 (monotonic)}
+        self._tokens = float(rate_per_second)
+        self._refilled_at = time.monotonic()
+
+        self._heap: List[Tuple[int, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # 통계 (등급별)
+        self.waits = LatencyTracker(window=500)
+        self.requests: Dict[int, int] = {p: 0 for p in PRIORITY_NAMES}
+        self.queued: Dict[int, int] = {p: 0 for p in PRIORITY_NAMES}
+        self.wait_total: Dict[int, float] = {p: 0.0 for p in PRIORITY_NAMES}
+        self.wait_max: Dict[int, float] = {p: 0.0 for p in PRIORITY_NAMES}
+
+    # 배정 조건
+
+    def _refill(self, now: float):
+        if self.rate_per_second > 0:
+            self._tokens = min(
+                float(self.rate_per_second),
+                self._tokens + (now - self._refilled_at) * self.rate_per_second
+            )
+        self._refilled_at = now
+
+    def _capacity_wait(self, priority: int) -> Optional[float]:
+        """동시 요청/초당 한도 기준 대기 (0: 즉시 가능, 양수: 토큰 대기 초, None: 요청 완료 대기)"""
+        privileged = priority <= self.reserved_for
+        limit = self.max_concurrent if privileged else self.max_concurrent - self.reserved
+        if self.in_flight >= limit:
+            return None
+        if self.rate_per_second <= 0:
+            return 0.0
+        needed = 1.0 if privileged else 1.0 + self.reserved_tokens
+        if self._tokens >= needed:
+            return 0.0
+        return (needed - self._tokens) / self.rate_per_second
+
+    def _grant(self, api_id: str, now: float):
+        self.in_flight += 1
+        if self.rate_per_second > 0:
+            self._tokens -= 1.0
+        if api_id:
+            self._next_allowed[api_id] = now + self.min_interval
+
+    def _record(self, priority: int, waited: float):
+        self.requests[priority] += 1
+        if waited > 0:
+            self.queued[priority] += 1
+            self.wait_total[priority] += waited
+            self.wait_max[priority] = max(self.wait_max[priority], waited)
+        self.waits.record(PRIORITY_NAMES[priority], waited)
+
+    # 배정
+
+    def _dispatch(self):
+        """대기열 앞에서부터 배정 가능한 요청 배정 (남은 요청은 가장 빠른 가능 시각에 재시도)"""
+        self._timer = None
+        now = time.monotonic()
+        self._refill(now)
+
+        retry_at: Optional[float] = None
+        blocked_apis = set()
+        remaining: List[Tuple[int, int, _Waiter]] = []
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            waiter = entry[2]
+            if waiter.future.done():
+                continue   # 취소된 대기
+
+            # 같은 API의 상위 등급 요청이 대기 중이거나 간격 미도래
+            api_ready = self._next_allowed.get(waiter.api_id, 0.0) if waiter.api_id else 0.0
+            if waiter.api_id in blocked_apis or api_ready > now:
+                if waiter.api_id not in blocked_apis:
+                    retry_at = api_ready if retry_at is None else min(retry_at, api_ready)
+                blocked_apis.add(waiter.api_id)
+                remaining.append(entry)
+                continue
+
+            wait = self._capacity_wait(waiter.priority)
+            if wait is None or wait > 0:
+                # 한도에 막힌 요청보다 하위 등급은 배정하지 않음
+                if wait:
+                    retry_at = now + wait if retry_at is None else min(retry_at, now + wait)
+                remaining.append(entry)
+                remaining.extend(self._heap)
+                self._heap = []
+                break
+
+            self._grant(waiter.api_id, now)
+            self._record(waiter.priority, now - waiter.queued_at)
+            waiter.future.set_result(None)
+
+        for entry in remaining:
+            heapq.heappush(self._heap, entry)
+        if retry_at is not None and self._heap:
+            self._timer = asyncio.get_running_loop().call_later(max(retry_at - now, 0.0), self._dispatch)
+
+    async def acquire(self, api_id: str = "", priority: int = PRIORITY_SCAN):
+        """요청 슬롯 배정 대기 (사용 후 release 필수)"""
+        now = time.monotonic()
+        self._refill(now)
+        if (
+            not self._heap
+            and (not api_id or self._next_allowed.get(api_id, 0.0) <= now)
+            and self._capacity_wait(priority) == 0
+        ):
+            self._grant(api_id, now)
+            self._record(priority, 0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (priority, next(self._sequence), _Waiter(priority, api_id, future)))
+        if self._timer is not None:
+            self._timer.cancel()
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()   # 배정 직후 취소 - 슬롯 반환
+            raise
+
+    def release(self):
+        self.in_flight -= 1
+        if self._heap:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, api_id: str = "", priority: int = PRIORITY_SCAN):
+        """async with scheduler.slot(api_id, priority): 요청 전송"""
+        await self.acquire(api_id, priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def try_reserve(self, api_id: str) -> bool:
+        """대기 중인 요청이 없고 API 간격이 지났으면 호출 간격만 즉시 예약 (헤징 요청용, 동시 요청 수 미포함)"""
+        now = time.monotonic()
+        if any(w.api_id == api_id for _, _, w in self._heap if not w.future.done()):
+            return False
+        if self._next_allowed.get(api_id, 0.0) > now:
+            return False
+        self._next_allowed[api_id] = now + self.min_interval
+        return True
+
+    # 통계
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, w in self._heap if not w.future.done())
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """등급별 대기 통계 {등급명: {requests, queued, wait_avg, wait_p95, wait_max}} (초)"""
+        stats = {}
+        for priority, name in PRIORITY_NAMES.items():
+            requests = self.requests[priority]
+            stats[name] = {
+                'requests': requests,
+                'queued': self.queued[priority],
+                'wait_avg': round(self.wait_total[priority] / requests, 4) if requests else 0.0,
+                'wait_p95': round(self.waits.percentile(name, 95) or 0.0, 4),
+                'wait_max': round(self.wait_max[priority], 4),
+            }
+        return stats
+
+
+__all__ = [
+    "RequestScheduler",
+    "PRIORITY_EXIT", "PRIORITY_ENTRY", "PRIORITY_ACCOUNT", "PRIORITY_SCAN", "PRIORITY_NAMES",
+]
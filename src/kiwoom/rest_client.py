@@ -4,13 +4,85 @@ OAuth 인증, 계좌 조회, 주문 실행, 시세 조회
 """
 
 import asyncio
+import json
+import time
 import aiohttp
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+from src.kiwoom.field_decoder import FieldDecoder, INT, FLOAT, PRICE, STR, to_int, to_float, to_price
+from src.kiwoom.single_flight import SingleFlight
+from src.kiwoom.retry_policy import RetryPolicies, TransientError, parse_retry_after
+from src.kiwoom.request_scheduler import (
+    RequestScheduler, PRIORITY_EXIT, PRIORITY_ENTRY, PRIORITY_ACCOUNT, PRIORITY_SCAN
+)
+from src.kiwoom.token_manager import TokenManager
 from src.utils.logger import logger
 from src.utils.config_loader import load_config
 
 
+# 응답 필드 변환표 (가격은 부호 제거, 등락률은 부호 유지)
+_QUOTE_FIELDS = FieldDecoder({
+    "code": ("stk_cd", STR),
+    "name": ("stk_nm", STR),
+    "price": ("cur_prc", PRICE),
+    "change": ("flu_rt", FLOAT),
+    "volume": ("trde_qty", PRICE),
+    "high": ("high_pric", PRICE),
+    "low": ("low_pric", PRICE),
+    "open": ("open_pric", PRICE),
+})
+
+_RANKING_FIELDS = FieldDecoder({
+    "code": ("stk_cd", STR),
+    "name": ("stk_nm", STR),
+    "price": ("cur_prc", PRICE),
+    "price_change": ("flu_rt", FLOAT),
+    "volume": (("trde_qty", "now_trde_qty"), PRICE),
+    # 거래대금: trde_amt (원) 또는 trde_prica (백만원)
+    "trading_value": ((("trde_amt", 1), ("trde_prica", 1_000_000)), INT),
+    "volume_change": ("sdnin_rt", FLOAT, True),   # 거래량 급증률 (ka10023)
+    "strength": ("cntr_str", FLOAT, True),        # 체결강도 (ka10027)
+})
+
+# 호가 1~5단계 (1단계만 키 형식이 다름)
+_ORDERBOOK_FIELDS = FieldDecoder({
+    **{
+        f"bid_price_{i}": ("buy_fpr_bid" if i == 1 else f"buy_{i}th_pre_bid", PRICE)
+        for i in range(1, 6)
+    },
+    **{
+        f"bid_volume_{i}": ("buy_fpr_req" if i == 1 else f"buy_{i}th_pre_req", PRICE)
+        for i in range(1, 6)
+    },
+    **{
+        f"ask_price_{i}": ("sel_fpr_bid" if i == 1 else f"sel_{i}th_pre_bid", PRICE)
+        for i in range(1, 6)
+    },
+    **{
+        f"ask_volume_{i}": ("sel_fpr_req" if i == 1 else f"sel_{i}th_pre_req", PRICE)
+        for i in range(1, 6)
+    },
+})
+
+_DAILY_CHART_FIELDS = FieldDecoder({
+    "date": ("dt", STR),
+    "open": ("open_pric", PRICE),
+    "high": ("high_pric", PRICE),
+    "low": ("low_pric", PRICE),
+    "close": ("cur_prc", PRICE),
+    "volume": ("trde_qty", PRICE),
+})
+
+_MINUTE_CHART_FIELDS = FieldDecoder({
+    "time": ("cntr_tm", STR),      # YYYYMMDDHHMMSS (봉 시작 시각)
+    "open": ("open_pric", PRICE),
+    "high": ("high_pric", PRICE),
+    "low": ("low_pric", PRICE),
+    "close": ("cur_prc", PRICE),
+    "volume": ("trde_qty", PRICE),
+})
+
+
 class KiwoomRestClient:
     """키움증권 REST API 비동기 클라이언트"""
 
@@ -27,48 +99,110 @@ class KiwoomRestClient:
         self.base_url = config[kiwoom_config_key]['base_url']
 
         self.session: Optional[aiohttp.ClientSession] = None
-        self.access_token: Optional[str] = None
-        self.token_expires_at: Optional[datetime] = None
 
-        # Rate Limiting 설정
-        self.last_request_time: Dict[str, datetime] = {}
+        # 접근 토큰 (만료 전 백그라운드 갱신 + 디스크 캐시)
+        token_config = config.get('token', {})
+        self.tokens = TokenManager(
+            issuer=self._issue_token,
+            identity=f"{self.app_key}@{self.base_url}",
+            cache_path=token_config.get('cache_path', 'data/kiwoom_token.json'),
+            refresh_margin=token_config.get('refresh_margin', 600),
+            retry_interval=token_config.get('retry_interval', 30)
+        )
+        self.tokens.on_token_changed.append(lambda _: self._headers_by_api.clear())
+
+        # HTTP 연결 설정 (커넥션 풀/keep-alive/DNS 캐시/타임아웃)
+        self.http_config = config.get('http', {})
+
+        # 요청 헤더 (api-id별로 미리 생성, 토큰 갱신 시에만 다시 생성)
+        self._base_headers = {
+            "Content-Type": "application/json;charset=UTF-8",
+            "User-Agent": "KiwoomTradingBot/1.0"
+        }
+        self._headers_by_api: Dict[str, Dict[str, str]] = {}
+
+        # Rate Limiting + 우선순위 스케줄링 (청산 > 진입 > 계좌 > 스캔)
+        scheduler_config = config.get('scheduler', {})
         self.min_request_interval = 1.0  # 1000ms (초당 1회) - API ID별 엄격한 제한
-        self.max_retries = 3
-        self.retry_delay = 3.0  # 3초
+        self.scheduler = RequestScheduler(
+            min_interval=self.min_request_interval,
+            max_concurrent=scheduler_config.get('max_concurrent', 8),
+            reserved=scheduler_config.get('reserved', 2),
+            rate_per_second=scheduler_config.get('rate_per_second', 0.0),
+            reserved_rate=scheduler_config.get('reserved_rate', 0.2)
+        )
+
+        # 재시도/헤징 정책 (API ID별)
+        self.retry_policies = RetryPolicies(config.get('retry', {}))
+
+        # 동일 조회 요청 병합 + API ID별 결과 TTL (초)
+        coalescing_config = config.get('coalescing', {})
+        self.coalescing_enabled = coalescing_config.get('enabled', True)
+        self.result_ttl: Dict[str, float] = coalescing_config.get('ttl', {})
+        self._single_flight = SingleFlight()
 
         mode_str = "테스트 (Mock API)" if test_mode else "실전 (Real API)"
         logger.info(f"키움증권 REST API 클라이언트 초기화 - {mode_str}")
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = self._create_session()
 
-        # API 토큰 발급 (테스트/실전 모두 동일하게 실행)
-        await self.get_access_token()
+        # API 토큰 준비 (유효한 캐시 토큰이 있으면 발급 생략) + 백그라운드 갱신 시작
+        await self.tokens.start()
 
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.tokens.stop()
         if self.session:
             await self.session.close()
             logger.info("세션 종료")
 
+    def _create_session(self) -> aiohttp.ClientSession:
+        """커넥션 풀/타임아웃이 설정된 세션 생성"""
+        http = self.http_config
+        connector = aiohttp.TCPConnector(
+            limit=http.get('connection_limit', 20),
+            limit_per_host=http.get('connection_limit_per_host', 10),
+            keepalive_timeout=http.get('keepalive_timeout', 60),
+            use_dns_cache=True,
+            ttl_dns_cache=http.get('dns_cache_ttl', 300),
+            enable_cleanup_closed=True
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=http.get('request_timeout', 10.0),
+            connect=http.get('connect_timeout', 3.0),
+            sock_read=http.get('read_timeout', 5.0)
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self._base_headers)
+
+    def _headers(self, api_id: str) -> Dict[str, str]:
+        """api-id별 요청 헤더 (인증 헤더 포함, 캐시)"""
+        headers = self._headers_by_api.get(api_id)
+        if headers is None:
+            headers = {"Authorization": f"Bearer {self.access_token}"}
+            # api-id 헤더 추가 (키움증권 필수)
+            if api_id:
+                headers["api-id"] = api_id
+            self._headers_by_api[api_id] = headers
+        return headers
+
+    @property
+    def access_token(self) -> Optional[str]:
+        return self.tokens.token
+
+    @property
+    def token_expires_at(self) -> Optional[datetime]:
+        return self.tokens.expires_at
+
     async def _ensure_token(self):
-        """토큰 유효성 확인 및 자동 갱신"""
-        if not self.access_token or not self.token_expires_at:
-            await self.get_access_token()
-        elif datetime.now() >= self.token_expires_at - timedelta(minutes=5):
-            logger.info("토큰 재발급")
-            await self.get_access_token()
-
-    async def _rate_limit(self, api_id: str):
-        """API별 Rate Limiting 적용"""
-        if api_id in self.last_request_time:
-            elapsed = (datetime.now() - self.last_request_time[api_id]).total_seconds()
-            if elapsed < self.min_request_interval:
-                delay = self.min_request_interval - elapsed
-                await asyncio.sleep(delay)
+        """토큰 확인 - 유효하면 대기 없음 (만료 임박 갱신은 TokenManager 백그라운드 작업이 처리)"""
+        if not self.tokens.is_valid:
+            await self.tokens.get_token()
 
-        self.last_request_time[api_id] = datetime.now()
+    def _try_rate_limit(self, api_id: str) -> bool:
+        """즉시 사용 가능한 Rate Limit 슬롯이 있으면 예약 (대기 없음)"""
+        return self.scheduler.try_reserve(api_id)
 
     async def _request(
         self,
@@ -76,75 +210,70 @@ class KiwoomRestClient:
         endpoint: str,
         data: Optional[Dict] = None,
         params: Optional[Dict] = None,
-        api_id: str = ""
+        api_id: str = "",
+        idempotent: bool = True,
+        priority: int = PRIORITY_SCAN
     ) -> Dict[str, Any]:
-        """API 요청 실행 (Rate Limiting + Retry 로직 포함)"""
-        await self._ensure_token()
+        """
+        API 요청 실행 (요청 병합 + Rate Limiting + Retry 로직 포함)
+
+        같은 api_id/요청 내용의 조회가 진행 중이면 실제 호출 없이 그 결과를 공유
+        (응답 dict도 공유되므로 호출측에서 수정하지 않음)
+
+        Args:
+            idempotent: False(주문 등)면 서버 처리 여부가 불명확한 실패는 재시도하지 않고 병합도 안 함
+            priority: 스케줄링 등급 (PRIORITY_*), 대기 중인 하위 등급 요청보다 먼저 전송
+        """
+        if not (self.coalescing_enabled and idempotent and api_id):
+            return await self._request_upstream(method, endpoint, data, params, api_id, idempotent, priority)
+
+        # 등급별로 병합 (상위 등급 요청이 대기 중인 하위 등급 요청 결과를 기다리지 않도록)
+        key = (
+            api_id, priority, method, endpoint,
+            json.dumps(data, sort_keys=True, ensure_ascii=False) if data else "",
+            json.dumps(params, sort_keys=True, ensure_ascii=False) if params else ""
+        )
+        return await self._single_flight.do(
+            key,
+            lambda: self._request_upstream(method, endpoint, data, params, api_id, idempotent, priority),
+            ttl=self.result_ttl.get(api_id, 0)
+        )
 
-        # Rate Limiting 적용
-        if api_id:
-            await self._rate_limit(api_id)
+    async def _request_upstream(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict],
+        params: Optional[Dict],
+        api_id: str,
+        idempotent: bool,
+        priority: int = PRIORITY_SCAN
+    ) -> Dict[str, Any]:
+        """실제 API 호출 (우선순위 스케줄링 + Rate Limiting + Retry)"""
+        await self._ensure_token()
 
         url = f"{self.base_url}{endpoint}"
+        policy = self.retry_policies.get(api_id, idempotent)
 
-        # 키움증권 API 표준 헤더
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json;charset=UTF-8",
-            "User-Agent": "KiwoomTradingBot/1.0"
-        }
-
-        # api-id 헤더 추가 (키움증권 필수)
-        if api_id:
-            headers["api-id"] = api_id
-
-        # Retry 로직
-        for attempt in range(self.max_retries):
+        for attempt in range(policy.max_attempts):
             try:
-                async with self.session.request(
-                    method, url, json=data, params=params, headers=headers
-                ) as response:
-                    # Content-Type 확인 (JSON이 아니면 에러 출력)
-                    content_type = response.headers.get('Content-Type', '')
-                    if 'application/json' not in content_type:
-                        response_text = await response.text()
-                        logger.error(
-                            f"❌ Mock API 서버 응답 오류\n"
-                            f"URL: {url}\n"
-                            f"Content-Type: {content_type}\n"
-                            f"Status: {response.status}\n"
-                            f"응답 내용 (처음 500자):\n{response_text[:500]}"
-                        )
-                        raise Exception(f"서버가 JSON 대신 {content_type} 응답 반환")
-
-                    result = await response.json()
-
-                    # 429 Rate Limit 에러 처리
-                    if response.status == 429:
-                        if attempt < self.max_retries - 1:
-                            retry_after = self.retry_delay * (attempt + 1)
-                            logger.warning(f"Rate Limit 초과 (429). {retry_after}초 후 재시도... ({attempt + 1}/{self.max_retries})")
-                            await asyncio.sleep(retry_after)
-                            continue
-                        else:
-                            logger.error(f"Rate Limit 초과 (429) - 최대 재시도 횟수 도달: {result}")
-                            raise Exception(f"Rate Limit Error: {result}")
-
-                    # 기타 에러
-                    if response.status != 200:
-                        logger.error(f"API 오류: {response.status} - {result}")
-                        raise Exception(f"API Error: {result}")
-
-                    return result
-
-            except aiohttp.ClientError as e:
-                if attempt < self.max_retries - 1:
-                    logger.warning(f"요청 실패, 재시도 중... ({attempt + 1}/{self.max_retries}): {e}")
-                    await asyncio.sleep(self.retry_delay)
-                    continue
-                else:
+                # 등급 순서로 전송 슬롯 배정 (API ID별 간격 + 동시 요청 수, 재시도도 요청 1회로 계산)
+                async with self.scheduler.slot(api_id, priority):
+                    if policy.hedge:
+                        return await self._send_hedged(method, url, data, params, api_id)
+                    return await self._send(method, url, data, params, api_id)
+
+            except TransientError as e:
+                if not policy.should_retry(e, attempt):
+                    self.retry_policies.count(api_id, "give_ups")
                     logger.error(f"요청 실패: {endpoint} - {e}")
                     raise
+                delay = policy.backoff(attempt, e.retry_after)
+                self.retry_policies.count(api_id, "retries")
+                logger.warning(
+                    f"요청 실패, {delay:.1f}초 후 재시도... ({attempt + 1}/{policy.max_attempts}): {e}"
+                )
+                await asyncio.sleep(delay)
             except Exception as e:
                 logger.error(f"요청 실패: {endpoint} - {e}")
                 raise
@@ -152,9 +281,117 @@ class KiwoomRestClient:
         # 모든 재시도 실패
         raise Exception(f"Maximum retries exceeded for {endpoint}")
 
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict],
+        params: Optional[Dict],
+        api_id: str
+    ) -> Dict[str, Any]:
+        """요청 1회 전송 (재시도 가능한 실패는 TransientError)"""
+        started = time.monotonic()
+        try:
+            async with self.session.request(
+                method, url, json=data, params=params, headers=self._headers(api_id)
+            ) as response:
+                # 429 Rate Limit - 서버가 처리하지 않은 요청 (Retry-After 우선)
+                if response.status == 429:
+                    raise TransientError(
+                        "Rate Limit 초과 (429)",
+                        status=429,
+                        retry_after=parse_retry_after(response.headers.get('Retry-After')),
+                        delivered=False
+                    )
+
+                # 일시적 서버 오류 - 처리 여부 불명
+                if response.status in (500, 502, 503, 504):
+                    raise TransientError(
+                        f"서버 오류 ({response.status})",
+                        status=response.status,
+                        retry_after=parse_retry_after(response.headers.get('Retry-After'))
+                    )
+
+                # Content-Type 확인 (JSON이 아니면 에러 출력)
+                content_type = response.headers.get('Content-Type', '')
+                if 'application/json' not in content_type:
+                    response_text = await response.text()
+                    logger.error(
+                        f"❌ Mock API 서버 응답 오류\n"
+                        f"URL: {url}\n"
+                        f"Content-Type: {content_type}\n"
+                        f"Status: {response.status}\n"
+                        f"응답 내용 (처음 500자):\n{response_text[:500]}"
+                    )
+                    raise Exception(f"서버가 JSON 대신 {content_type} 응답 반환")
+
+                result = await response.json()
+
+                # 기타 에러
+                if response.status != 200:
+                    logger.error(f"API 오류: {response.status} - {result}")
+                    raise Exception(f"API Error: {result}")
+
+        except aiohttp.ClientConnectorError as e:
+            # 연결 실패 - 요청 미전송
+            raise TransientError(f"연결 실패: {e}", delivered=False) from e
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TransientError(f"{type(e).__name__}: {e}") from e
+
+        self.retry_policies.latency.record(api_id, time.monotonic() - started)
+        return result
+
+    async def _send_hedged(
+        self,
+        method: str,
+        url: str,
+        data: Optional[Dict],
+        params: Optional[Dict],
+        api_id: str
+    ) -> Dict[str, Any]:
+        """
+        헤징 요청 (조회 전용)
+
+        응답이 최근 응답 시간 백분위(p95)를 넘도록 오지 않으면 같은 요청을 한 번 더 보내고
+        먼저 성공한 응답 사용. Rate Limit 슬롯이 없으면 헤징 생략.
+        """
+        primary = asyncio.ensure_future(self._send(method, url, data, params, api_id))
+        delay = self.retry_policies.hedge_delay(api_id)
+        if delay is None:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+        if not self._try_rate_limit(api_id):
+            self.retry_policies.count(api_id, "hedge_skipped")
+            return await primary
+
+        self.retry_policies.count(api_id, "hedges")
+        hedge = asyncio.ensure_future(self._send(method, url, data, params, api_id))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.retry_policies.count(api_id, "hedge_wins")
+                        return task.result()
+            # 둘 다 실패 - 원 요청 오류 전달
+            raise primary.exception()
+        finally:
+            for task in (primary, hedge):
+                if not task.done():
+                    task.cancel()
+
     # OAuth 인증
     async def get_access_token(self) -> str:
-        """접근 토큰 발급 (au10001)"""
+        """접근 토큰 재발급 (동시 호출 시 발급 1회)"""
+        return await self.tokens.refresh()
+
+    async def _issue_token(self) -> Tuple[str, datetime]:
+        """접근 토큰 발급 (au10001) - (토큰, 만료 시각)"""
         endpoint = "/oauth2/token"
 
         # 키움증권 API 스펙에 맞는 요청 데이터
@@ -164,11 +401,7 @@ class KiwoomRestClient:
             "secretkey": self.app_secret  # 키움증권은 'secretkey' 사용
         }
 
-        headers = {
-            "Content-Type": "application/json;charset=UTF-8",
-            "api-id": "au10001",  # 키움증권은 api-id 헤더 필요
-            "User-Agent": "KiwoomTradingBot/1.0"  # User-Agent 추가
-        }
+        headers = {"api-id": "au10001"}  # 키움증권은 api-id 헤더 필요 (공통 헤더는 세션 기본값)
 
         try:
             async with self.session.post(
@@ -218,20 +451,20 @@ class KiwoomRestClient:
                 result = await response.json()
 
                 # 키움증권 응답: token, token_type, expires_dt
-                self.access_token = result.get("token")
+                token = result.get("token")
+                if not token:
+                    raise Exception(f"토큰 없는 응답: {result}")
 
                 # expires_dt 파싱 (예: "20241107083713")
                 expires_dt = result.get("expires_dt")
                 if expires_dt:
-                    from datetime import datetime
-                    expires_time = datetime.strptime(expires_dt, "%Y%m%d%H%M%S")
-                    self.token_expires_at = expires_time
+                    expires_at = datetime.strptime(expires_dt, "%Y%m%d%H%M%S")
                 else:
                     # 기본값: 24시간
-                    self.token_expires_at = datetime.now() + timedelta(seconds=86400)
+                    expires_at = datetime.now() + timedelta(seconds=86400)
 
                 logger.info("토큰 발급 성공")
-                return self.access_token
+                return token, expires_at
         except Exception as e:
             logger.error(f"토큰 발급 실패: {e}")
             raise
@@ -243,7 +476,8 @@ class KiwoomRestClient:
             method="POST",
             endpoint="/api/dostk/acnt",
             data={"qry_tp": "2"},  # 2:일반조회
-            api_id="kt00001"
+            api_id="kt00001",
+            priority=PRIORITY_ACCOUNT
         )
 
     async def get_account_info(self) -> Dict[str, Any]:
@@ -252,7 +486,8 @@ class KiwoomRestClient:
             method="POST",
             endpoint="/api/dostk/acnt",
             data={"qry_tp": "3"},  # 3:추정조회
-            api_id="kt00003"
+            api_id="kt00003",
+            priority=PRIORITY_ACCOUNT
         )
 
     async def get_holdings(self) -> List[Dict[str, Any]]:
@@ -264,7 +499,8 @@ class KiwoomRestClient:
                 "qry_tp": "2",           # 2:개별
                 "dmst_stex_tp": "KRX"    # KRX:한국거래소
             },
-            api_id="kt00018"
+            api_id="kt00018",
+            priority=PRIORITY_ACCOUNT
         )
         return result.get("acnt_evlt_remn_indv_tot", [])
 
@@ -272,13 +508,13 @@ class KiwoomRestClient:
         """계좌수익률 조회 (ka10085)"""
         return await self._request("GET", "/api/account/profit", params={
             "account_no": self.account_number
-        })
+        }, priority=PRIORITY_ACCOUNT)
 
     async def get_open_orders(self) -> List[Dict[str, Any]]:
         """미체결 조회 (ka10075)"""
         result = await self._request("GET", "/api/orders/open", params={
             "account_no": self.account_number
-        })
+        }, priority=PRIORITY_ACCOUNT)
         return result.get("orders", [])
 
     # 주문 실행
@@ -298,7 +534,13 @@ class KiwoomRestClient:
             "order_type": order_type
         }
         logger.info(f"매수: {stock_code} {quantity}주 @{price}원")
-        return await self._request("POST", "/api/orders/buy", data=data)
+        try:
+            return await self._request(
+                "POST", "/api/orders/buy", data=data, api_id="kt10000", idempotent=False,
+                priority=PRIORITY_ENTRY
+            )
+        finally:
+            self._single_flight.invalidate()  # 잔고/계좌 조회 결과 캐시 무효화
 
     async def order_sell(
         self,
@@ -316,39 +558,41 @@ class KiwoomRestClient:
             "order_type": order_type
         }
         logger.info(f"매도: {stock_code} {quantity}주 @{price}원")
-        return await self._request("POST", "/api/orders/sell", data=data)
+        try:
+            return await self._request(
+                "POST", "/api/orders/sell", data=data, api_id="kt10001", idempotent=False,
+                priority=PRIORITY_EXIT
+            )
+        finally:
+            self._single_flight.invalidate()  # 잔고/계좌 조회 결과 캐시 무효화
 
     async def cancel_order(self, order_no: str) -> Dict[str, Any]:
         """주문 취소 (kt10003)"""
         logger.info(f"취소: {order_no}")
-        return await self._request("DELETE", f"/api/orders/{order_no}")
+        try:
+            # 미체결 정정(재호가/취소)은 청산과 같은 등급
+            return await self._request(
+                "DELETE", f"/api/orders/{order_no}", api_id="kt10003", idempotent=False,
+                priority=PRIORITY_EXIT
+            )
+        finally:
+            self._single_flight.invalidate()
 
     # 시세 조회
-    async def get_quote(self, stock_code: str) -> Dict[str, Any]:
+    async def get_quote(self, stock_code: str, priority: int = PRIORITY_SCAN) -> Dict[str, Any]:
         """현재가 및 기본정보 조회 (ka10001)"""
         result = await self._request(
             method="POST",
             endpoint="/api/dostk/stkinfo",
             data={"stk_cd": stock_code},
-            api_id="ka10001"
+            api_id="ka10001",
+            priority=priority
         )
 
         # 응답 데이터 정규화
-        return {
-            "code": result.get("stk_cd", ""),
-            "name": result.get("stk_nm", ""),
-            "price": int(result.get("cur_prc", "0").replace("+", "").replace("-", "")),
-            "change": float(result.get("flu_rt", "0").replace("+", "").replace("-", "")),
-            "volume": int(result.get("trde_qty", "0")),
-            "high": int(result.get("high_pric", "0").replace("+", "").replace("-", "")),
-            "low": int(result.get("low_pric", "0").replace("+", "").replace("-", "")),
-            "open": int(result.get("open_pric", "0").replace("+", "").replace("-", "")),
-            "high_proximity": self._calc_high_proximity(
-                int(result.get("cur_prc", "0").replace("+", "").replace("-", "")),
-                int(result.get("high_pric", "0").replace("+", "").replace("-", ""))
-            ),
-            "strength": 100  # 기본값
-        }
+        quote = _QUOTE_FIELDS.decode(result)
+        quote["high_proximity"] = self._calc_high_proximity(quote["price"], quote["high"])
+        return quote
 
     def _calc_high_proximity(self, current: int, high: int) -> float:
         """고가 근접도 계산"""
@@ -365,38 +609,16 @@ class KiwoomRestClient:
             api_id="ka10004"
         )
 
-        # 호가 데이터 파싱 (매수/매도 1~5호가)
-        bids = []
-        asks = []
-
-        for i in range(1, 6):
-            # 매수호가
-            if i == 1:
-                bid_price = result.get("buy_fpr_bid", "0")
-                bid_volume = result.get("buy_fpr_req", "0")
-            else:
-                bid_price = result.get(f"buy_{i}th_pre_bid", "0")
-                bid_volume = result.get(f"buy_{i}th_pre_req", "0")
-
-            if bid_price and bid_volume:
-                bids.append({
-                    "price": int(bid_price.replace("+", "").replace("-", "")),
-                    "volume": int(bid_volume)
-                })
-
-            # 매도호가
-            if i == 1:
-                ask_price = result.get("sel_fpr_bid", "0")
-                ask_volume = result.get("sel_fpr_req", "0")
-            else:
-                ask_price = result.get(f"sel_{i}th_pre_bid", "0")
-                ask_volume = result.get(f"sel_{i}th_pre_req", "0")
-
-            if ask_price and ask_volume:
-                asks.append({
-                    "price": int(ask_price.replace("+", "").replace("-", "")),
-                    "volume": int(ask_volume)
-                })
+        # 호가 데이터 파싱 (매수/매도 1~5호가, 가격 없는 단계 제외)
+        fields = _ORDERBOOK_FIELDS.decode(result)
+        bids = [
+            {"price": fields[f"bid_price_{i}"], "volume": fields[f"bid_volume_{i}"]}
+            for i in range(1, 6) if fields[f"bid_price_{i}"] > 0
+        ]
+        asks = [
+            {"price": fields[f"ask_price_{i}"], "volume": fields[f"ask_volume_{i}"]}
+            for i in range(1, 6) if fields[f"ask_price_{i}"] > 0
+        ]
 
         return {
             "bids": bids,
@@ -478,45 +700,218 @@ class KiwoomRestClient:
         return self._parse_ranking_result(result, "pred_pre_flu_rt_upper")
 
     def _parse_ranking_result(self, result: Dict, list_key: str) -> List[Dict]:
-        """순위정보 API 응답 파싱"""
-        # API별로 다른 응답 키를 사용
-        items = result.get(list_key, [])
-
-        parsed = []
-        for item in items:
-            # 가격과 수량 값에서 부호 제거
-            cur_prc = item.get("cur_prc", "0").replace("+", "").replace("-", "")
-            trde_qty = item.get("trde_qty", item.get("now_trde_qty", "0"))
-
-            # 거래대금: trde_amt (원) 또는 trde_prica (백만원)
-            trde_amt_str = item.get("trde_amt", item.get("trde_prica", "0"))
-
-            try:
-                price = int(cur_prc) if cur_prc else 0
-                volume = int(trde_qty) if trde_qty else 0
-
-                # trde_prica는 백만원 단위이므로 변환 (1,000,000 곱하기)
-                trading_value_raw = int(trde_amt_str) if trde_amt_str else 0
+        """순위정보 API 응답 파싱 (API별로 다른 응답 키 사용)"""
+        parsed = _RANKING_FIELDS.decode_many(result.get(list_key, []))
+        for entry in parsed:
+            entry["status"] = ""
+        return parsed
 
-                # trde_amt (원 단위)인지 trde_prica (백만원 단위)인지 판단
-                if "trde_prica" in item:
-                    trading_value = trading_value_raw * 1_000_000  # 백만원 → 원
-                else:
-                    trading_value = trading_value_raw  # 이미 원 단위
+    # 상세 분석용 API (Deep Scan 평가 항목)
+    async def get_investor_continuous(self, market: str = "001") -> Dict[str, Dict]:
+        """기관/외국인 연속매매현황 (ka10131) - {종목코드: 항목}"""
+        result = await self._request(
+            method="POST",
+            endpoint="/api/dostk/frgnistt",
+            data={
+                "dt": "1",            # 최근일
+                "mrkt_tp": market,    # 001:코스피, 101:코스닥
+                "netslmt_tp": "2",    # 순매수
+                "stk_inds_tp": "0",   # 종목
+                "amt_qty_tp": "0",    # 금액
+                "stex_tp": "1"        # KRX
+            },
+            api_id="ka10131"
+        )
 
-            except (ValueError, TypeError):
+        investors = {}
+        for item in result.get("orgn_frgnr_cont_trde_prst", []):
+            code = item.get("stk_cd", "")
+            if not code:
                 continue
+            investors[code] = {
+                "foreign_days": to_int(item.get("frgnr_cont_netprps_dys")),
+                "institute_days": to_int(item.get("orgn_cont_netprps_dys")),
+                # 금액 단위: 백만원
+                "institute_amount": to_float(item.get("orgn_nettrde_amt")),
+                "foreign_amount": to_float(item.get("frgnr_nettrde_amt"))
+            }
+        return investors
+
+    async def get_brokers(self, stock_code: str) -> Dict[str, List[Dict]]:
+        """주식거래원 (ka10002) - 매수/매도 상위 5개 거래원"""
+        result = await self._request(
+            method="POST",
+            endpoint="/api/dostk/stkinfo",
+            data={"stk_cd": stock_code},
+            api_id="ka10002"
+        )
 
-            parsed.append({
+        brokers = {"buy": [], "sell": []}
+        for i in range(1, 6):
+            for side, prefix in (("buy", "buy"), ("sell", "sel")):
+                broker_id = result.get(f"{prefix}_trde_ori_{i}", "")
+                quantity = to_price(result.get(f"{prefix}_trde_qty_{i}"))
+                if not broker_id or broker_id == "000" or quantity <= 0:
+                    continue
+                brokers[side].append({
+                    "id": broker_id,
+                    "name": result.get(f"{prefix}_trde_ori_nm_{i}", "").strip(),
+                    "quantity": quantity
+                })
+        return brokers
+
+    async def get_program_net_buy_top(self, market: str = "P00101") -> List[Dict]:
+        """프로그램 순매수 상위 50 (ka90003)"""
+        result = await self._request(
+            method="POST",
+            endpoint="/api/dostk/stkinfo",
+            data={
+                "trde_upper_tp": "2",  # 순매수상위
+                "amt_qty_tp": "1",     # 금액
+                "mrkt_tp": market,     # P00101:코스피, P10102:코스닥
+                "stex_tp": "1"         # KRX
+            },
+            api_id="ka90003"
+        )
+        return [
+            {
                 "code": item.get("stk_cd", ""),
-                "name": item.get("stk_nm", ""),
-                "price": price,
-                "price_change": float(item.get("flu_rt", "0").replace("+", "").replace("-", "")),
-                "volume": volume,
-                "trading_value": trading_value,
-                "status": ""
-            })
-        return parsed
+                "rank": to_int(item.get("rank")),
+                "net_buy_amount": to_float(item.get("prm_netprps_amt"))
+            }
+            for item in result.get("prm_netprps_upper_50", [])
+            if item.get("stk_cd")
+        ]
+
+    async def get_strength_trend(self, stock_code: str) -> List[Dict]:
+        """체결강도추이 시간별 (ka10046) - 최신순"""
+        result = await self._request(
+            method="POST",
+            endpoint="/api/dostk/mrkcond",
+            data={"stk_cd": stock_code},
+            api_id="ka10046"
+        )
+        return [
+            {
+                "time": item.get("cntr_tm", ""),
+                "strength": to_float(item.get("cntr_str")),
+                "strength_5min": to_float(item.get("cntr_str_5min")),
+                "strength_20min": to_float(item.get("cntr_str_20min"))
+            }
+            for item in result.get("cntr_str_tm", [])
+        ]
+
+    async def get_vi_stocks(self, stock_code: str = "") -> List[Dict]:
+        """변동성완화장치 발동종목 (ka10054)"""
+        result = await self._request(
+            method="POST",
+            endpoint="/api/dostk/stkinfo",
+            data={
+                "mrkt_tp": "000",             # 전체
+                "bf_mkrt_tp": "0",            # 전체
+                "stk_cd": stock_code,
+                "motn_tp": "0",               # 정적+동적
+                "skip_stk": "000000000",      # 전종목 포함
+                "trde_qty_tp": "0",
+                "min_trde_qty": "",
+                "max_trde_qty": "",
+                "trde_prica_tp": "0",
+                "min_trde_prica": "",
+                "max_trde_prica": "",
+                "motn_drc": "0",              # 상승/하락 전체
+                "stex_tp": "1"                # KRX
+            },
+            api_id="ka10054"
+        )
+        return [
+            {
+                "code": item.get("stk_cd", ""),
+                "trigger_price": to_price(item.get("motn_pric")),
+                "release_time": item.get("virelis_time", ""),
+                "count": to_int(item.get("vimotn_cnt"))
+            }
+            for item in result.get("motn_stk", [])
+        ]
+
+    async def get_themes(self, stock_code: str = "", sort_type: str = "3") -> List[Dict]:
+        """
+        테마그룹별 (ka90001)
+
+        Args:
+            stock_code: 지정 시 해당 종목이 속한 테마만 조회
+            sort_type: 1:상위기간수익률, 2:하위기간수익률, 3:상위등락률, 4:하위등락률
+        """
+        result = await self._request(
+            method="POST",
+            endpoint="/api/dostk/thme",
+            data={
+                "qry_tp": "2" if stock_code else "0",  # 2:종목검색, 0:전체검색
+                "stk_cd": stock_code,
+                "date_tp": "1",
+                "thema_nm": "",
+                "flu_pl_amt_tp": sort_type,
+                "stex_tp": "1"
+            },
+            api_id="ka90001"
+        )
+        return [
+            {
+                "code": item.get("thema_grp_cd", ""),
+                "name": item.get("thema_nm", ""),
+                "change": to_float(item.get("flu_rt"))
+            }
+            for item in result.get("thema_grp", [])
+        ]
+
+    async def get_search_rank(self) -> List[Dict]:
+        """실시간 종목조회순위 (ka00198) - 1분 기준"""
+        result = await self._request(
+            method="POST",
+            endpoint="/api/dostk/stkinfo",
+            data={"qry_tp": "1"},  # 1:1분
+            api_id="ka00198"
+        )
+        return [
+            {
+                "code": item.get("stk_cd", ""),
+                "rank": to_int(item.get("bigd_rank")),
+                # 순위 상승폭 (양수: 상승)
+                "rank_change": to_int(item.get("rank_chg"))
+            }
+            for item in result.get("item_inq_rank", [])
+        ]
+
+    async def get_daily_chart(self, stock_code: str, base_date: Optional[str] = None) -> List[Dict]:
+        """주식일봉차트 (ka10081) - 과거→최근 순"""
+        result = await self._request(
+            method="POST",
+            endpoint="/api/dostk/chart",
+            data={
+                "stk_cd": stock_code,
+                "base_dt": base_date or datetime.now().strftime("%Y%m%d"),
+                "upd_stkpc_tp": "1"  # 수정주가
+            },
+            api_id="ka10081"
+        )
+        candles = _DAILY_CHART_FIELDS.decode_many(result.get("stk_dt_pole_chart_qry", []))
+        candles.reverse()
+        return candles
+
+    async def get_minute_chart(self, stock_code: str, tick_scope: int = 1) -> List[Dict]:
+        """주식분봉차트 (ka10080) - 과거→최근 순"""
+        result = await self._request(
+            method="POST",
+            endpoint="/api/dostk/chart",
+            data={
+                "stk_cd": stock_code,
+                "tic_scope": str(tick_scope),  # 1/3/5/10/15/30/45/60분
+                "upd_stkpc_tp": "1"
+            },
+            api_id="ka10080"
+        )
+        candles = _MINUTE_CHART_FIELDS.decode_many(result.get("stk_min_pole_chart_qry", []))
+        candles.reverse()
+        return candles
 
     async def get_chart_data(
         self,
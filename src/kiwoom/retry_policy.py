@@ -0,0 +1,169 @@
+"""
+REST 요청 재시도/헤징 정책
+API ID별 지수 백오프(지터) + Retry-After 반영, 주문 멱등성 보호, 시세 조회 헤징
+"""
+
+import random
+from collections import Counter, deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Deque, Dict, Optional
+
+
+class TransientError(Exception):
+    """
+    재시도 가능한 요청 실패
+
+    delivered=False: 서버가 요청을 처리하지 않은 것이 확실 (연결 실패, 429 거부) → 주문도 재시도 가능
+    delivered=True: 서버 처리 여부 불명 (타임아웃, 연결 끊김, 5xx) → 멱등 요청만 재시도
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+        delivered: bool = True
+    ):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        self.delivered = delivered
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) → 대기 초"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class RetryPolicy:
+    """API ID별 재시도 정책"""
+
+    __slots__ = ('max_attempts', 'base_delay', 'max_delay', 'idempotent', 'hedge')
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        idempotent: bool = True,
+        hedge: bool = False
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.idempotent = idempotent   # False: 처리 여부 불명 실패는 재시도 안 함 (주문)
+        self.hedge = hedge             # 응답 지연 시 중복 요청 (조회 전용)
+
+    def merged(self, overrides: Dict[str, Any]) -> "RetryPolicy":
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update({k: v for k, v in overrides.items() if k in self.__slots__})
+        return RetryPolicy(**values)
+
+    def should_retry(self, error: TransientError, attempt: int) -> bool:
+        """attempt: 0부터 시작하는 실패한 시도 번호"""
+        if attempt + 1 >= self.max_attempts:
+            return False
+        return self.idempotent or not error.delivered
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """재시도 대기 시간 - 서버 지정값 우선, 없으면 full jitter 지수 백오프"""
+        if retry_after is not None:
+            # 여러 요청이 같은 시각에 몰리지 않도록 약간의 지터 추가
+            return retry_after + random.uniform(0, self.base_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class LatencyTracker:
+    """API ID별 최근 응답 시간 (헤징 기준 백분위 계산)"""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, api_id: str, seconds: float):
+        samples = self._samples.get(api_id)
+        if samples is None:
+            samples = self._samples[api_id] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def percentile(self, api_id: str, pct: float, min_samples: int = 1) -> Optional[float]:
+        samples = self._samples.get(api_id)
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        index = min(int(len(ordered) * pct / 100), len(ordered) - 1)
+        return ordered[index]
+
+
+class RetryPolicies:
+    """
+    재시도/헤징 정책 모음 및 통계
+
+    Config (config.yaml `retry`):
+        default: {max_attempts, base_delay, max_delay}
+        apis: {api_id: {정책 항목 덮어쓰기}}
+        hedge: {percentile, min_delay, min_samples}
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.default = RetryPolicy().merged(config.get('default', {}))
+        self._policies = {
+            api_id: self.default.merged(overrides or {})
+            for api_id, overrides in config.get('apis', {}).items()
+        }
+        self._non_idempotent: Dict[str, RetryPolicy] = {}
+
+        hedge_config = config.get('hedge', {})
+        self.hedge_percentile = hedge_config.get('percentile', 95)
+        self.hedge_min_delay = hedge_config.get('min_delay', 0.2)
+        self.hedge_min_samples = hedge_config.get('min_samples', 20)
+
+        self.latency = LatencyTracker(hedge_config.get('window', 200))
+
+        # 통계 - retries: 재시도, hedges: 헤징 요청, hedge_wins: 헤징 요청이 먼저 응답,
+        #        hedge_skipped: Rate Limit 슬롯 없어 헤징 생략, give_ups: 재시도 포기
+        self.stats: Counter = Counter()
+        self.stats_by_api: Dict[str, Counter] = {}
+
+    def get(self, api_id: str, idempotent: bool = True) -> RetryPolicy:
+        """API ID 정책 (주문 등 비멱등 요청은 처리 불명 실패 재시도/헤징 금지)"""
+        policy = self._policies.get(api_id, self.default)
+        if idempotent:
+            return policy
+        safe = self._non_idempotent.get(api_id)
+        if safe is None:
+            safe = self._non_idempotent[api_id] = policy.merged({'idempotent': False, 'hedge': False})
+        return safe
+
+    def hedge_delay(self, api_id: str) -> Optional[float]:
+        """헤징 요청 발송 시점 (응답 시간 백분위, 표본 부족 시 None)"""
+        latency = self.latency.percentile(api_id, self.hedge_percentile, self.hedge_min_samples)
+        if latency is None:
+            return None
+        return max(latency, self.hedge_min_delay)
+
+    def count(self, api_id: str, event: str):
+        self.stats[event] += 1
+        by_api = self.stats_by_api.get(api_id)
+        if by_api is None:
+            by_api = self.stats_by_api[api_id] = Counter()
+        by_api[event] += 1
+
+
+__all__ = [
+    "TransientError", "parse_retry_after", "RetryPolicy", "LatencyTracker", "RetryPolicies",
+]
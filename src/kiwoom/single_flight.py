@@ -0,0 +1,71 @@
+"""
+동일 요청 병합 (single-flight)
+진행 중인 같은 조회 요청은 하나의 실제 호출 결과를 공유, 선택적으로 짧은 TTL 동안 결과 재사용
+"""
+
+import asyncio
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """키별 진행 중 요청 병합 + 결과 TTL 캐시"""
+
+    # 만료 항목 정리 기준 (캐시 항목 수)
+    SWEEP_SIZE = 256
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}  # 키 → (만료 시각 monotonic, 결과)
+
+        # 통계 - calls: 실제 호출, coalesced: 진행 중 요청 공유, cached: TTL 캐시 사용
+        self.stats: Counter = Counter()
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]], ttl: float = 0) -> Any:
+        """
+        key가 같은 진행 중 요청이 있으면 그 결과를 기다리고, 없으면 call() 실행
+
+        Args:
+            ttl: 성공 결과 재사용 시간 (초, 0이면 진행 중 병합만)
+        """
+        if ttl > 0:
+            cached = self._results.get(key)
+            if cached is not None:
+                if time.monotonic() < cached[0]:
+                    self.stats['cached'] += 1
+                    return cached[1]
+                del self._results[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats['calls'] += 1
+            task = asyncio.ensure_future(call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t, ttl))
+        else:
+            self.stats['coalesced'] += 1
+
+        # 대기 중인 호출 하나가 취소되어도 공유 요청은 계속
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task, ttl: float):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if ttl > 0 and not task.cancelled() and task.exception() is None:
+            if len(self._results) >= self.SWEEP_SIZE:
+                self._sweep()
+            self._results[key] = (time.monotonic() + ttl, task.result())
+
+    def _sweep(self):
+        now = time.monotonic()
+        expired = [key for key, (expires, _) in self._results.items() if expires <= now]
+        for key in expired:
+            del self._results[key]
+
+    def invalidate(self):
+        """TTL 캐시 비우기 (주문 직후 등)"""
+        self._results.clear()
+
+
+__all__ = ["SingleFlight"]
@@ -0,0 +1,201 @@
+"""
+접근 토큰 관리자
+만료 전 백그라운드 갱신, 동시 갱신 요청 단일화, 디스크 캐시(재시작 시 재사용)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Tuple
+from src.utils.logger import logger
+
+
+# 토큰 발급 함수: () -> (토큰, 만료 시각)
+TokenIssuer = Callable[[], Awaitable[Tuple[str, datetime]]]
+
+
+class TokenManager:
+    """
+    접근 토큰 관리
+
+    - 요청 경로에서는 유효한 토큰을 즉시 반환 (만료 임박 시 갱신은 백그라운드 작업이 처리)
+    - 토큰이 없거나 이미 만료된 경우에만 요청이 갱신 완료를 대기
+    - 동시에 들어온 갱신 요청은 진행 중인 하나의 발급 작업을 공유
+    """
+
+    def __init__(
+        self,
+        issuer: TokenIssuer,
+        identity: str,
+        cache_path: Optional[str] = None,
+        refresh_margin: float = 600,
+        retry_interval: float = 30
+    ):
+        """
+        Args:
+            issuer: 토큰 발급 함수
+            identity: 캐시 토큰 식별 문자열 (앱 키 + 서버 주소 등 - 해시로만 저장)
+            cache_path: 디스크 캐시 경로 (None이면 캐시 안 함)
+            refresh_margin: 만료 몇 초 전에 갱신할지
+            retry_interval: 갱신 실패 시 재시도 간격 (초)
+        """
+        self._issuer = issuer
+        self._identity = hashlib.sha256(identity.encode()).hexdigest()[:16]
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+
+        self.token: Optional[str] = None
+        self.expires_at: Optional[datetime] = None
+
+        # 토큰 교체 시 호출 (인증 헤더 캐시 폐기 등)
+        self.on_token_changed: List[Callable[[str], None]] = []
+
+        self._refreshing: Optional[asyncio.Task] = None
+        self._refresh_loop_task: Optional[asyncio.Task] = None
+
+        # 통계
+        self.refresh_count = 0
+        self.cache_hits = 0
+
+    @property
+    def is_valid(self) -> bool:
+        """토큰 사용 가능 여부 (만료 전)"""
+        return bool(self.token) and self.expires_at is not None and datetime.now() < self.expires_at
+
+    @property
+    def refresh_due_at(self) -> Optional[datetime]:
+        """백그라운드 갱신 예정 시각"""
+        if self.expires_at is None:
+            return None
+        return self.expires_at - timedelta(seconds=self.refresh_margin)
+
+    async def start(self):
+        """캐시 토큰 로드 (없거나 만료 임박이면 발급) 후 백그라운드 갱신 시작"""
+        if self._load_cache():
+            self.cache_hits += 1
+            logger.info(f"캐시된 토큰 사용 (만료: {self.expires_at:%Y-%m-%d %H:%M:%S})")
+        if not self.is_valid or datetime.now() >= self.refresh_due_at:
+            await self.refresh()
+
+        if self._refresh_loop_task is None:
+            self._refresh_loop_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        """백그라운드 갱신 중지"""
+        for task in (self._refresh_loop_task, self._refreshing):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._refresh_loop_task = None
+        self._refreshing = None
+
+    async def get_token(self) -> str:
+        """유효한 토큰 반환 (유효하면 대기 없음)"""
+        if self.is_valid:
+            return self.token
+        return await self.refresh()
+
+    async def refresh(self) -> str:
+        """토큰 갱신 (진행 중인 갱신이 있으면 그 결과를 공유)"""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.create_task(self._issue())
+        # 대기 중인 호출이 취소되어도 발급 작업은 계속
+        return await asyncio.shield(self._refreshing)
+
+    async def _issue(self) -> str:
+        token, expires_at = await self._issuer()
+        changed = token != self.token
+        self.token = token
+        self.expires_at = expires_at
+        self.refresh_count += 1
+        self._save_cache()
+
+        if changed:
+            for callback in self.on_token_changed:
+                callback(token)
+        return token
+
+    async def _refresh_loop(self):
+        """
+        만료 refresh_margin초 전에 갱신 (실패 시 retry_interval 후 재시도)
+
+        갱신 후에도 갱신 예정 시각이 지나 있으면(만료 시각 그대로 또는 유효기간이 margin보다 짧음)
+        바로 재발급하지 않고 retry_interval 대기
+        """
+        while True:
+            due = self.refresh_due_at
+            delay = (due - datetime.now()).total_seconds() if due else 0
+            if delay > 0:
+                await asyncio.sleep(delay)
+            previous = self.expires_at
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"토큰 갱신 실패, {self.retry_interval}초 후 재시도: {e}")
+                await asyncio.sleep(self.retry_interval)
+                continue
+
+            if previous is not None and self.expires_at <= previous:
+                logger.warning(
+                    f"토큰 만료 시각 변동 없음 (만료: {self.expires_at:%Y-%m-%d %H:%M:%S}), "
+                    f"{self.retry_interval}초 후 재시도"
+                )
+                await asyncio.sleep(self.retry_interval)
+                continue
+
+            logger.info(f"토큰 백그라운드 갱신 완료 (만료: {self.expires_at:%Y-%m-%d %H:%M:%S})")
+            if datetime.now() >= self.refresh_due_at:
+                logger.warning(
+                    f"토큰 유효기간이 갱신 여유({self.refresh_margin}초)보다 짧음, "
+                    f"{self.retry_interval}초 후 재갱신"
+                )
+                await asyncio.sleep(self.retry_interval)
+
+    def _load_cache(self) -> bool:
+        """디스크 캐시 로드 (식별값 불일치/만료/손상 시 무시)"""
+        if not self.cache_path or not self.cache_path.exists():
+            return False
+        try:
+            data = json.loads(self.cache_path.read_text(encoding='utf-8'))
+            if data.get('identity') != self._identity:
+                return False
+            expires_at = datetime.fromisoformat(data['expires_at'])
+            if datetime.now() >= expires_at:
+                return False
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"토큰 캐시 로드 실패: {e}")
+            return False
+
+        self.token = data['token']
+        self.expires_at = expires_at
+        return True
+
+    def _save_cache(self):
+        """디스크 캐시 저장 (임시 파일 교체, 소유자만 읽기 가능)"""
+        if not self.cache_path:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.cache_path.with_suffix(self.cache_path.suffix + '.tmp')
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'identity': self._identity,
+                    'token': self.token,
+                    'expires_at': self.expires_at.isoformat()
+                }, f)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"토큰 캐시 저장 실패: {e}")
+
+
+__all__ = ["TokenManager", "TokenIssuer"]
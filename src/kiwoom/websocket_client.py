@@ -7,7 +7,9 @@ import asyncio
 import json
 import websockets
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, Callable, Dict, Any, List
+from src.kiwoom.feed_recorder import FeedRecorder
 from src.utils.logger import logger
 from src.utils.config_loader import load_config
 
@@ -61,6 +63,18 @@ class KiwoomWebSocketClient:
         self.heartbeat_interval = 30  # 초
         self.last_heartbeat = None
 
+        # 수신 프레임 기록 (재생/부하 테스트용)
+        self.recorder: Optional[FeedRecorder] = None
+        recording = config.get('realtime', {}).get('recording', {})
+        if recording.get('enabled', False):
+            path = Path(recording.get('directory', 'data/feed')) / f"{datetime.now():%Y%m%d_%H%M%S}.kfeed"
+            self.recorder = FeedRecorder(
+                str(path),
+                chunk_frames=recording.get('chunk_frames', 2000),
+                chunk_seconds=recording.get('chunk_seconds', 1.0),
+                compression_level=recording.get('compression_level', 1)
+            )
+
         logger.info("WebSocket 클라이언트 초기화")
 
     async def connect(self):
@@ -131,6 +145,8 @@ class KiwoomWebSocketClient:
             await self.websocket.close()
             self.is_connected = False
             logger.info("WebSocket 연결 종료")
+        if self.recorder:
+            await asyncio.to_thread(self.recorder.close)
 
     async def start(self):
         """WebSocket 수신 시작 (연결 실패 시 계속 재시도)"""
@@ -170,6 +186,8 @@ class KiwoomWebSocketClient:
         while self.is_running and self.is_connected:
             try:
                 message = await self.websocket.recv()
+                if self.recorder:
+                    self.recorder.record(message)
                 await self._handle_message(message)
 
             except websockets.exceptions.ConnectionClosed:
@@ -200,24 +218,7 @@ class KiwoomWebSocketClient:
 
             # 실시간 데이터 수신
             if trnm == "REAL":
-                data_list = data.get("data", [])
-                for item in data_list:
-                    data_type = item.get("type")  # "00", "01", "04" 등
-                    stock_code = item.get("item", "")
-                    values = item.get("values", {})
-
-                    # 핸들러 호출
-                    handlers = self.handlers.get(data_type, [])
-                    for handler in handlers:
-                        try:
-                            await handler({
-                                "type": data_type,
-                                "item": stock_code,
-                                "name": item.get("name"),
-                                "values": values
-                            })
-                        except Exception as e:
-                            logger.error(f"핸들러 실행 오류 ({data_type}): {e}")
+                await self.dispatch_real(data.get("data", []))
                 return
 
         except json.JSONDecodeError:
@@ -225,12 +226,35 @@ class KiwoomWebSocketClient:
         except Exception as e:
             logger.error(f"메시지 처리 오류: {e}")
 
+    async def dispatch_real(self, data_list: List[Dict[str, Any]]):
+        """실시간 데이터 항목 → 타입별 핸들러 호출 (수신/재생 공용)"""
+        for item in data_list:
+            data_type = item.get("type")  # "00", "01", "04" 등
+            stock_code = item.get("item", "")
+            values = item.get("values", {})
+
+            # 핸들러 호출
+            handlers = self.handlers.get(data_type, [])
+            for handler in handlers:
+                try:
+                    await handler({
+                        "type": data_type,
+                        "item": stock_code,
+                        "name": item.get("name"),
+                        "values": values
+                    })
+                except Exception as e:
+                    logger.error(f"핸들러 실행 오류 ({data_type}): {e}")
+
     async def _heartbeat_loop(self):
         """하트비트 전송 (WebSocket 자체 ping/pong 사용)"""
         # 키움증권 WebSocket은 자체적으로 ping/pong 처리
         # websockets 라이브러리가 자동으로 ping_interval에 따라 처리함
         while self.is_running and self.is_connected:
             await asyncio.sleep(30)
+            # 수신이 뜸할 때도 기록 버퍼가 오래 남지 않도록
+            if self.recorder:
+                self.recorder.flush()
             # 연결 상태만 확인
             if not self.websocket or self.websocket.closed:
                 break
@@ -0,0 +1,271 @@
+"""
+실시간 분봉 생성
+주식체결(0B) 틱을 종목별 1/3/5/15분 OHLCV 봉으로 집계하고, 완성된 봉을 구독자에게 전달
+장 마감 후 REST 분봉(ka10080)과 대사해 당일 봉을 보정
+"""
+
+import asyncio
+from datetime import datetime, date, timedelta
+from typing import Dict, Any, List, Optional, Callable, Iterable, Tuple
+from src.realtime.timeutil import parse_hhmmss, seconds_of_day
+from src.utils.logger import logger
+
+
+class Bar:
+    """분봉 (bucket: 자정 기준 봉 시작 분)"""
+
+    __slots__ = ('code', 'interval', 'bucket', 'open', 'high', 'low', 'close', 'volume', 'value')
+
+    def __init__(self, code: str, interval: int, bucket: int, price: float, volume: int, value: float):
+        self.code = code
+        self.interval = interval
+        self.bucket = bucket
+        self.open = self.high = self.low = self.close = price
+        self.volume = volume
+        self.value = value
+
+    def start(self, day: date) -> datetime:
+        """봉 시작 시각"""
+        return datetime.combine(day, datetime.min.time()) + timedelta(minutes=self.bucket)
+
+    def merge(self, other: "Bar"):
+        """하위 봉 병합 (other가 이후 봉)"""
+        if other.high > self.high:
+            self.high = other.high
+        if other.low < self.low:
+            self.low = other.low
+        self.close = other.close
+        self.volume += other.volume
+        self.value += other.value
+
+    def same_ohlcv(self, other: "Bar") -> bool:
+        return (
+            self.open == other.open and self.high == other.high and self.low == other.low
+            and self.close == other.close and self.volume == other.volume
+        )
+
+    def __repr__(self):
+        return (
+            f"Bar({self.code} {self.interval}m @{self.bucket // 60:02d}:{self.bucket % 60:02d} "
+            f"O={self.open} H={self.high} L={self.low} C={self.close} V={self.volume})"
+        )
+
+
+class BarBuilder:
+    """
+    틱 → 분봉 집계
+
+    - 종목별로 진행 중인 1분봉 1개만 유지, 상위 주기(3/5/15분)는 완성된 1분봉을 병합
+    - 봉 경계를 넘는 틱이 오거나 flush()에서 봉 종료 + close_grace초가 지나면 완성
+    - 체결이 없는 분은 봉을 만들지 않음 (REST 분봉과 동일)
+    - 완성 봉은 on_bar 콜백(동기/비동기)으로 전달
+    """
+
+    def __init__(self, intervals: Iterable[int] = (1, 3, 5, 15), close_grace: float = 2.0):
+        self.intervals = sorted(set(intervals) | {1})
+        self.close_grace = close_grace
+        self.day = date.today()
+
+        self._minute: Dict[str, Bar] = {}                        # 진행 중 1분봉
+        self._higher: Dict[Tuple[str, int], Bar] = {}            # 진행 중 상위 주기 봉
+        self.completed: Dict[str, List[Bar]] = {}                # 당일 완성 1분봉 (대사용)
+
+        self.on_bar: List[Callable[[Bar], Any]] = []
+        self.on_reconciled: List[Callable[[str, List[Bar]], Any]] = []
+
+        # 통계
+        self.ticks = 0
+        self.late_ticks = 0   # 이미 완성된 봉 시각의 틱 (버림)
+        self.bars = 0
+
+    def on_tick(
+        self,
+        code: str,
+        price: float,
+        volume: int,
+        trade_time: str = "",
+        now: Optional[datetime] = None
+    ):
+        """
+        체결 틱 반영
+
+        Args:
+            volume: 체결량 (부호 무관)
+            trade_time: 체결시간 'HHMMSS' (0B 20번, 없으면 now 기준)
+        """
+        if price <= 0:
+            return
+        seconds = seconds_of_day(trade_time, now)
+        bucket = seconds // 60
+        volume = abs(volume)
+        self.ticks += 1
+
+        bar = self._minute.get(code)
+        if bar is not None:
+            if bucket == bar.bucket:
+                if price > bar.high:
+                    bar.high = price
+                elif price < bar.low:
+                    bar.low = price
+                bar.close = price
+                bar.volume += volume
+                bar.value += price * volume
+                return
+            if bucket < bar.bucket:
+                self.late_ticks += 1
+                return
+            self._complete_minute(bar)
+        elif self._is_completed(code, bucket):
+            self.late_ticks += 1
+            return
+
+        self._minute[code] = Bar(code, 1, bucket, price, volume, price * volume)
+
+    def _is_completed(self, code: str, bucket: int) -> bool:
+        bars = self.completed.get(code)
+        return bool(bars) and bucket <= bars[-1].bucket
+
+    def flush(self, now: Optional[datetime] = None):
+        """종료 시각이 지난 진행 중 봉 완성 (체결이 뜸한 종목용, 주기적으로 호출)"""
+        now = now or datetime.now()
+        minutes = (now.hour * 3600 + now.minute * 60 + now.second - self.close_grace) / 60
+
+        for code, bar in list(self._minute.items()):
+            if bar.bucket + 1 <= minutes:
+                self._complete_minute(bar)
+        for key, bar in list(self._higher.items()):
+            if bar.bucket + bar.interval <= minutes:
+                del self._higher[key]
+                self._publish(bar)
+
+    def _complete_minute(self, bar: Bar):
+        del self._minute[bar.code]
+        self.completed.setdefault(bar.code, []).append(bar)
+        self._publish(bar)
+        self._roll_up(bar)
+
+    def _roll_up(self, bar: Bar):
+        """완성 1분봉 → 상위 주기 봉 병합 (주기 마지막 분이면 즉시 완성)"""
+        for interval in self.intervals[1:]:
+            key = (bar.code, interval)
+            bucket = bar.bucket - bar.bucket % interval
+            current = self._higher.get(key)
+            if current is not None and current.bucket != bucket:
+                del self._higher[key]
+                self._publish(current)
+                current = None
+
+            if current is None:
+                current = Bar(bar.code, interval, bucket, bar.open, bar.volume, bar.value)
+                current.high, current.low, current.close = bar.high, bar.low, bar.close
+                self._higher[key] = current
+            else:
+                current.merge(bar)
+
+            if (bar.bucket + 1) % interval == 0:
+                del self._higher[key]
+                self._publish(current)
+
+    def _publish(self, bar: Bar):
+        self.bars += 1
+        for callback in self.on_bar:
+            try:
+                result = callback(bar)
+                if asyncio.iscoroutine(result):
+                    asyncio.ensure_future(result)
+            except Exception as e:
+                logger.error(f"분봉 콜백 오류 ({bar.code}): {e}")
+
+    def current(self, code: str, interval: int = 1) -> Optional[Bar]:
+        """진행 중 봉 (미완성)"""
+        if interval == 1:
+            return self._minute.get(code)
+        return self._higher.get((code, interval))
+
+    def aggregate(self, bars: List[Bar], interval: int) -> List[Bar]:
+        """1분봉 목록 → interval분봉 목록"""
+        result: List[Bar] = []
+        for bar in bars:
+            bucket = bar.bucket - bar.bucket % interval
+            if result and result[-1].bucket == bucket:
+                result[-1].merge(bar)
+            else:
+                merged = Bar(bar.code, interval, bucket, bar.open, bar.volume, bar.value)
+                merged.high, merged.low, merged.close = bar.high, bar.low, bar.close
+                result.append(merged)
+        return result
+
+    def reset(self, day: Optional[date] = None):
+        """새 거래일 시작 (전일 상태 삭제)"""
+        self._minute.clear()
+        self._higher.clear()
+        self.completed.clear()
+        self.day = day or date.today()
+
+    async def reconcile(self, api: Any, codes: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        장 마감 후 REST 1분봉과 대사 (REST 값으로 당일 완성 봉 교체)
+
+        Args:
+            api: KiwoomRestClient (get_minute_chart)
+            codes: 대상 종목 (None이면 당일 봉이 있는 전체)
+        Returns:
+            {'symbols', 'matched', 'corrected', 'missing', 'extra'} 봉 수
+        """
+        self.flush(datetime.combine(self.day, datetime.max.time()))
+        prefix = self.day.strftime("%Y%m%d")
+        summary = {'symbols': 0, 'matched': 0, 'corrected': 0, 'missing': 0, 'extra': 0}
+
+        for code in list(codes if codes is not None else self.completed):
+            try:
+                candles = await api.get_minute_chart(code)
+            except Exception as e:
+                logger.warning(f"분봉 대사 실패 ({code}): {e}")
+                continue
+
+            reference = []
+            for candle in candles:
+                stamp = candle.get('time', '')
+                if not stamp.startswith(prefix) or candle.get('volume', 0) <= 0:
+                    continue
+                seconds = parse_hhmmss(stamp[8:])
+                if seconds is None:
+                    continue
+                price = candle['close']
+                bar = Bar(code, 1, seconds // 60, candle['open'], candle['volume'], 0.0)
+                bar.high, bar.low, bar.close = candle['high'], candle['low'], price
+                reference.append(bar)
+
+            built = {bar.bucket: bar for bar in self.completed.get(code, [])}
+            for bar in reference:
+                mine = built.pop(bar.bucket, None)
+                if mine is None:
+                    summary['missing'] += 1
+                elif mine.same_ohlcv(bar):
+                    summary['matched'] += 1
+                    bar.value = mine.value
+                else:
+                    summary['corrected'] += 1
+                    bar.value = mine.value * bar.volume / mine.volume if mine.volume else 0.0
+                if not bar.value:
+                    bar.value = (bar.open + bar.high + bar.low + bar.close) / 4 * bar.volume
+            summary['extra'] += len(built)
+            summary['symbols'] += 1
+
+            self.completed[code] = reference
+            for callback in self.on_reconciled:
+                try:
+                    result = callback(code, reference)
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception as e:
+                    logger.error(f"분봉 대사 콜백 오류 ({code}): {e}")
+
+        logger.info(
+            f"분봉 대사 완료: {summary['symbols']}종목 - 일치 {summary['matched']}, "
+            f"보정 {summary['corrected']}, 누락 {summary['missing']}, 초과 {summary['extra']}"
+        )
+        return summary
+
+
+__all__ = ["Bar", "BarBuilder"]
@@ -0,0 +1,226 @@
+"""
+실시간 호가창
+주식호가잔량(0D)/주식우선호가(0C)로 종목별 호가를 배열에 유지하고 잔량 비율/스프레드/가중 중간가를 O(1) 제공
+"""
+
+import time
+import numpy as np
+from typing import Dict, Any, List, Optional, Iterable
+from src.kiwoom.field_decoder import to_price
+
+
+# 0D 필드: 매도호가 1~10 (41~50), 매수호가 1~10 (51~60), 매도잔량 (61~70), 매수잔량 (71~80)
+_ASK_PRICE_KEYS = [str(41 + i) for i in range(10)]
+_BID_PRICE_KEYS = [str(51 + i) for i in range(10)]
+_ASK_VOLUME_KEYS = [str(61 + i) for i in range(10)]
+_BID_VOLUME_KEYS = [str(71 + i) for i in range(10)]
+
+# 0C 필드: 최우선 매도호가 (27), 최우선 매수호가 (28)
+_BEST_ASK_KEY = "27"
+_BEST_BID_KEY = "28"
+
+
+class OrderBookStore:
+    """
+    종목별 호가창 (종목당 배열 1행)
+
+    - 호가 단계: (종목, 단계) 배열 bid_prices/bid_volumes/ask_prices/ask_volumes
+    - 갱신 시 잔량 합계/최우선호가/가중 중간가를 미리 계산 → 조회는 O(1)
+    - 잔량 비율은 REST 호가(ka10004)와 같은 ratio_levels 단계 기준
+    """
+
+    # 호가 단계 배열 (종목, 단계)
+    LEVEL_ARRAYS = ('bid_prices', 'bid_volumes', 'ask_prices', 'ask_volumes')
+    # 종목별 파생 값 (bid_total/ask_total: ratio_levels 단계 잔량 합,
+    # updated_at: 마지막 0D/0C 갱신, depth_updated_at: 마지막 0D 갱신 - monotonic)
+    VALUE_ARRAYS = (
+        'best_bid', 'best_ask', 'bid_total', 'ask_total', 'weighted_mids', 'updated_at', 'depth_updated_at'
+    )
+
+    def __init__(self, depth: int = 10, ratio_levels: int = 5, max_age: float = 3.0, capacity: int = 64):
+        self.depth = min(depth, 10)
+        self.ratio_levels = min(ratio_levels, self.depth)
+        self.max_age = max_age   # 이 시간(초) 이상 갱신 없으면 조회 결과 없음
+
+        self.slots: Dict[str, int] = {}
+        self._codes: List[str] = []   # 행 → 종목코드
+        self._allocate(capacity)
+
+        # 통계
+        self.updates = 0
+
+    def _allocate(self, capacity: int):
+        """배열 (재)할당 - 기존 행 유지"""
+        for name in (*self.LEVEL_ARRAYS, *self.VALUE_ARRAYS):
+            shape = (capacity, self.depth) if name in self.LEVEL_ARRAYS else (capacity,)
+            array = np.zeros(shape, dtype=np.float64)
+            old = getattr(self, name, None)
+            if old is not None:
+                array[:len(old)] = old
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def _slot(self, code: str) -> int:
+        slot = self.slots.get(code)
+        if slot is None:
+            slot = len(self.slots)
+            if slot >= self.capacity:
+                self._allocate(self.capacity * 2)
+            self.slots[code] = slot
+            self._codes.append(code)
+        return slot
+
+    # 갱신
+
+    async def handle(self, data: Dict[str, Any]):
+        """WebSocket 핸들러 (0D/0C 공용)"""
+        code = data.get('item')
+        if not code:
+            return
+        if data.get('type') == "0D":
+            self.update_depth(code, data.get('values', {}))
+        else:
+            self.update_best(code, data.get('values', {}))
+
+    def update_depth(self, code: str, values: Dict[str, str], timestamp: Optional[float] = None):
+        """주식호가잔량(0D) 전체 단계 갱신"""
+        depth = self.depth
+        ask_prices = [to_price(values.get(k)) for k in _ASK_PRICE_KEYS[:depth]]
+        bid_prices = [to_price(values.get(k)) for k in _BID_PRICE_KEYS[:depth]]
+        ask_volumes = [to_price(values.get(k)) for k in _ASK_VOLUME_KEYS[:depth]]
+        bid_volumes = [to_price(values.get(k)) for k in _BID_VOLUME_KEYS[:depth]]
+
+        slot = self._slot(code)
+        self.ask_prices[slot] = ask_prices
+        self.bid_prices[slot] = bid_prices
+        self.ask_volumes[slot] = ask_volumes
+        self.bid_volumes[slot] = bid_volumes
+
+        # 파생 값 (단계 수가 작아 파이썬 합계가 NumPy 호출보다 빠름)
+        n = self.ratio_levels
+        bid_total = sum(bid_volumes[:n])
+        ask_total = sum(ask_volumes[:n])
+        self.bid_total[slot] = bid_total
+        self.ask_total[slot] = ask_total
+        self.best_bid[slot] = bid_prices[0]
+        self.best_ask[slot] = ask_prices[0]
+
+        # 가중 중간가: 양쪽 가중평균 호가를 반대편 잔량으로 가중 (잔량 많은 쪽에서 멀어짐)
+        if bid_total > 0 and ask_total > 0:
+            bid_vwap = sum(p * v for p, v in zip(bid_prices[:n], bid_volumes[:n])) / bid_total
+            ask_vwap = sum(p * v for p, v in zip(ask_prices[:n], ask_volumes[:n])) / ask_total
+            self.weighted_mids[slot] = (bid_vwap * ask_total + ask_vwap * bid_total) / (bid_total + ask_total)
+        else:
+            self.weighted_mids[slot] = 0.0
+
+        now = timestamp if timestamp is not None else time.monotonic()
+        self.updated_at[slot] = now
+        self.depth_updated_at[slot] = now
+        self.updates += 1
+
+    def update_best(self, code: str, values: Dict[str, str], timestamp: Optional[float] = None):
+        """주식우선호가(0C) 최우선호가 갱신 (잔량 정보 없음)"""
+        slot = self._slot(code)
+        ask = to_price(values.get(_BEST_ASK_KEY))
+        bid = to_price(values.get(_BEST_BID_KEY))
+        if ask:
+            self.best_ask[slot] = ask
+        if bid:
+            self.best_bid[slot] = bid
+        self.updated_at[slot] = timestamp if timestamp is not None else time.monotonic()
+        self.updates += 1
+
+    def remove(self, code: str):
+        """종목 제거 (구독 해제 시) - 마지막 행을 빈 자리로 이동"""
+        slot = self.slots.pop(code, None)
+        if slot is None:
+            return
+        last = len(self._codes) - 1
+        moved = self._codes.pop()
+        arrays = [getattr(self, name) for name in (*self.LEVEL_ARRAYS, *self.VALUE_ARRAYS)]
+        if slot != last:
+            self.slots[moved] = slot
+            self._codes[slot] = moved
+            for array in arrays:
+                array[slot] = array[last]
+        for array in arrays:
+            array[last] = 0
+
+    # 조회 (갱신이 max_age 이내인 종목만, 아니면 None - 잔량 기반 값은 0D 갱신 기준)
+
+    def _fresh_slot(self, code: str, max_age: Optional[float] = None, depth: bool = False) -> Optional[int]:
+        slot = self.slots.get(code)
+        if slot is None:
+            return None
+        updated = self.depth_updated_at[slot] if depth else self.updated_at[slot]
+        if time.monotonic() - updated > (self.max_age if max_age is None else max_age):
+            return None
+        return slot
+
+    def is_fresh(self, code: str, max_age: Optional[float] = None) -> bool:
+        return self._fresh_slot(code, max_age) is not None
+
+    def age(self, code: str) -> Optional[float]:
+        """마지막 갱신 후 경과 시간 (초)"""
+        slot = self.slots.get(code)
+        return time.monotonic() - self.updated_at[slot] if slot is not None else None
+
+    def bid_ask_ratio(self, code: str) -> Optional[float]:
+        """매수/매도 잔량 비율 (%) - 평가 항목 bid_ask_ratio와 같은 정의"""
+        slot = self._fresh_slot(code, depth=True)
+        if slot is None:
+            return None
+        ask = self.ask_total[slot]
+        return float(self.bid_total[slot] / ask * 100) if ask > 0 else 0.0
+
+    def imbalance(self, code: str) -> Optional[float]:
+        """잔량 불균형 (-1: 매도 우위 ~ +1: 매수 우위)"""
+        slot = self._fresh_slot(code, depth=True)
+        if slot is None:
+            return None
+        total = self.bid_total[slot] + self.ask_total[slot]
+        return float((self.bid_total[slot] - self.ask_total[slot]) / total) if total > 0 else 0.0
+
+    def best_bid_price(self, code: str) -> Optional[float]:
+        slot = self._fresh_slot(code)
+        return float(self.best_bid[slot]) if slot is not None and self.best_bid[slot] > 0 else None
+
+    def best_ask_price(self, code: str) -> Optional[float]:
+        slot = self._fresh_slot(code)
+        return float(self.best_ask[slot]) if slot is not None and self.best_ask[slot] > 0 else None
+
+    def spread(self, code: str) -> Optional[float]:
+        """최우선 매도-매수 호가 차이 (원)"""
+        slot = self._fresh_slot(code)
+        if slot is None or self.best_bid[slot] <= 0 or self.best_ask[slot] <= 0:
+            return None
+        return float(self.best_ask[slot] - self.best_bid[slot])
+
+    def mid(self, code: str) -> Optional[float]:
+        slot = self._fresh_slot(code)
+        if slot is None or self.best_bid[slot] <= 0 or self.best_ask[slot] <= 0:
+            return None
+        return float((self.best_ask[slot] + self.best_bid[slot]) / 2)
+
+    def weighted_mid(self, code: str) -> Optional[float]:
+        """잔량 가중 중간가 (ratio_levels 단계, 잔량 없으면 단순 중간가)"""
+        slot = self._fresh_slot(code, depth=True)
+        if slot is None or self.weighted_mids[slot] <= 0:
+            return self.mid(code)
+        return float(self.weighted_mids[slot])
+
+    def levels(self, code: str) -> Optional[Dict[str, np.ndarray]]:
+        """호가 단계 뷰 (복사 없음)"""
+        slot = self.slots.get(code)
+        if slot is None:
+            return None
+        return {
+            'bid_prices': self.bid_prices[slot], 'bid_volumes': self.bid_volumes[slot],
+            'ask_prices': self.ask_prices[slot], 'ask_volumes': self.ask_volumes[slot],
+        }
+
+    def codes(self) -> Iterable[str]:
+        return self.slots.keys()
+
+
+__all__ = ["OrderBookStore"]
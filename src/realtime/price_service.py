@@ -0,0 +1,110 @@
+"""
+현재가 서비스
+실시간(WebSocket) 가격 우선 사용, 오래된 경우 REST 시세 조회로 대체
+"""
+
+import time
+from typing import Dict, Optional, Tuple
+from src.kiwoom.rest_client import KiwoomRestClient
+from src.kiwoom.request_scheduler import PRIORITY_ENTRY
+from src.utils.config_loader import load_config
+from src.utils.logger import logger
+
+
+class PriceQuote:
+    """가격 조회 결과 (출처/경과시간 포함)"""
+
+    SOURCE_REALTIME = "REALTIME"
+    SOURCE_REST = "REST"
+
+    __slots__ = ('stock_code', 'price', 'source', 'age')
+
+    def __init__(self, stock_code: str, price: float, source: str, age: float):
+        self.stock_code = stock_code
+        self.price = price
+        self.source = source
+        self.age = age  # 초
+
+    def __repr__(self):
+        return (
+            f"PriceQuote(code={self.stock_code}, price={self.price}, "
+            f"source={self.source}, age={self.age:.2f}s)"
+        )
+
+
+class PriceService:
+    """최신 가격 제공 (실시간 캐시 → REST 대체)"""
+
+    def __init__(self, api_client: KiwoomRestClient):
+        self.api = api_client
+
+        config = load_config("config").get('realtime', {})
+        self.max_age = config.get('price_max_age', 3.0)  # 실시간 가격 유효 시간 (초)
+
+        # {stock_code: (price, monotonic timestamp)}
+        self._prices: Dict[str, Tuple[float, float]] = {}
+
+        # 통계
+        self.realtime_hits = 0
+        self.rest_fallbacks = 0
+
+        logger.info(f"현재가 서비스 초기화 - 실시간 가격 유효 {self.max_age}초")
+
+    def update(self, stock_code: str, price: float, timestamp: Optional[float] = None):
+        """실시간 가격 갱신 (WebSocket 핸들러에서 호출)"""
+        if price > 0:
+            self._prices[stock_code] = (price, timestamp if timestamp is not None else time.monotonic())
+
+    def last_price(self, stock_code: str) -> Optional[float]:
+        """마지막 가격 (경과시간 무관)"""
+        entry = self._prices.get(stock_code)
+        return entry[0] if entry else None
+
+    def get_cached(self, stock_code: str) -> Optional[PriceQuote]:
+        """캐시된 가격 조회 (경과시간 포함, API 호출 없음)"""
+        entry = self._prices.get(stock_code)
+        if entry is None:
+            return None
+        price, ts = entry
+        return PriceQuote(stock_code, price, PriceQuote.SOURCE_REALTIME, time.monotonic() - ts)
+
+    async def get_price(
+        self,
+        stock_code: str,
+        max_age: Optional[float] = None,
+        priority: int = PRIORITY_ENTRY
+    ) -> PriceQuote:
+        """
+        최신 가격 조회
+
+        Args:
+            max_age: 실시간 가격 허용 경과시간 (초, 기본: 설정값)
+            priority: REST 조회 등급 (주문 직전 시세 → 스캔 조회보다 우선)
+
+        Returns:
+            PriceQuote (source: REALTIME | REST, price 0이면 조회 실패)
+        """
+        max_age = self.max_age if max_age is None else max_age
+
+        cached = self.get_cached(stock_code)
+        if cached is not None and cached.age <= max_age:
+            self.realtime_hits += 1
+            return cached
+
+        # 실시간 가격 없음/만료 → REST 조회
+        self.rest_fallbacks += 1
+        quote = await self.api.get_quote(stock_code, priority=priority)
+        price = quote.get('price', 0)
+        self.update(stock_code, price)
+        return PriceQuote(stock_code, price, PriceQuote.SOURCE_REST, 0.0)
+
+    def get_stats(self) -> Dict[str, int]:
+        """조회 통계"""
+        return {
+            'realtime_hits': self.realtime_hits,
+            'rest_fallbacks': self.rest_fallbacks,
+            'tracked_symbols': len(self._prices)
+        }
+
+
+__all__ = ["PriceQuote", "PriceService"]
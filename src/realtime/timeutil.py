@@ -0,0 +1,26 @@
+"""
+실시간 체결시간 변환
+주식체결(0B) 체결시간/분봉 시각 문자열 'HHMMSS'를 자정 기준 초로 변환
+"""
+
+from datetime import datetime
+from typing import Optional
+
+
+def parse_hhmmss(value: Optional[str]) -> Optional[int]:
+    """'HHMMSS' → 자정 기준 초 (형식이 아니면 None)"""
+    if not value or len(value) < 6 or not value[:6].isdigit():
+        return None
+    return int(value[0:2]) * 3600 + int(value[2:4]) * 60 + int(value[4:6])
+
+
+def seconds_of_day(trade_time: Optional[str], now: Optional[datetime] = None) -> int:
+    """'HHMMSS' → 자정 기준 초 (없거나 잘못된 값이면 now 기준)"""
+    seconds = parse_hhmmss(trade_time)
+    if seconds is None:
+        now = now or datetime.now()
+        seconds = now.hour * 3600 + now.minute * 60 + now.second
+    return seconds
+
+
+__all__ = ["parse_hhmmss", "seconds_of_day"]
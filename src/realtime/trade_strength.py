@@ -0,0 +1,192 @@
+"""
+실시간 체결강도
+주식체결(0B) 틱을 매수/매도 체결로 분류해 종목별 구간(1분/5분/20분 등) 체결강도를 증분 계산
+
+체결강도 = 매수체결량 / 매도체결량 × 100 (키움 정의와 동일)
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Iterable
+from src.realtime.timeutil import seconds_of_day
+
+
+# 분류 방식
+CLASSIFY_SIGN = "sign"   # 체결량 부호 (0B 15번: 매수체결 +, 매도체결 -)
+CLASSIFY_TICK = "tick"   # 틱 규칙 (직전가 대비 상승 매수, 하락 매도, 보합은 직전 방향)
+
+
+class _SymbolState:
+    """종목별 구간 합계 (초 단위 링 버퍼)"""
+
+    __slots__ = (
+        'buy', 'sell', 'head', 'first', 'buy_sums', 'sell_sums',
+        'day_buy', 'day_sell', 'last_price', 'last_side'
+    )
+
+    def __init__(self, size: int, windows: int, second: int):
+        self.buy = [0.0] * size
+        self.sell = [0.0] * size
+        self.head = second        # 마지막 반영 구간 (초)
+        self.first = second       # 첫 체결 시각 (구간 준비 여부 판단)
+        self.buy_sums = [0.0] * windows
+        self.sell_sums = [0.0] * windows
+        self.day_buy = 0.0
+        self.day_sell = 0.0
+        self.last_price = 0.0
+        self.last_side = 0
+
+
+class TradeStrengthTracker:
+    """
+    종목별 체결강도
+
+    - 1초 구간 링 버퍼 + 구간별 누적 합계 → 틱 반영/조회 O(1) (경과 초 수만큼만 만료 처리)
+    - 구간은 windows(초) 여러 개 동시 유지, 조회 시 구간 길이만큼 관측된 종목만 값 반환
+    - 시각은 체결시간(0B 20번) 기준 - 조회도 로컬 시계가 아닌 마지막 수신 체결시간까지만 구간 진행
+    """
+
+    def __init__(
+        self,
+        windows: Iterable[int] = (60, 300, 1200),
+        default_window: Optional[int] = None,
+        classify: str = CLASSIFY_SIGN,
+        max_strength: float = 500.0
+    ):
+        self.windows: List[int] = sorted(set(int(w) for w in windows))
+        self.default_window = default_window or self.windows[0]
+        if self.default_window not in self.windows:
+            self.windows = sorted(self.windows + [self.default_window])
+        self._window_index = {w: i for i, w in enumerate(self.windows)}
+        self.size = self.windows[-1]
+        self.classify = classify
+        self.max_strength = max_strength   # 매도체결 없이 매수만 있을 때 값
+
+        self._states: Dict[str, _SymbolState] = {}
+        self.clock: Optional[int] = None   # 전체 종목 중 마지막 체결시간 (자정 기준 초)
+
+        # 통계
+        self.ticks = 0
+
+    def _advance(self, state: _SymbolState, second: int):
+        """구간을 second까지 진행 (창에서 벗어난 초 구간 차감)"""
+        elapsed = second - state.head
+        if elapsed <= 0:
+            return
+        size = self.size
+        if elapsed >= size:
+            state.buy = [0.0] * size
+            state.sell = [0.0] * size
+            state.buy_sums = [0.0] * len(self.windows)
+            state.sell_sums = [0.0] * len(self.windows)
+        else:
+            buy, sell = state.buy, state.sell
+            buy_sums, sell_sums = state.buy_sums, state.sell_sums
+            for t in range(state.head + 1, second + 1):
+                for i, window in enumerate(self.windows):
+                    old = (t - window) % size
+                    buy_sums[i] -= buy[old]
+                    sell_sums[i] -= sell[old]
+                slot = t % size
+                buy[slot] = sell[slot] = 0.0
+        state.head = second
+
+    def on_tick(
+        self,
+        code: str,
+        price: float,
+        volume: int,
+        trade_time: str = "",
+        now: Optional[datetime] = None
+    ):
+        """
+        체결 틱 반영
+
+        Args:
+            volume: 체결량 (CLASSIFY_SIGN이면 부호로 매수/매도 구분)
+            trade_time: 체결시간 'HHMMSS' (0B 20번)
+        """
+        if not volume:
+            return
+        second = seconds_of_day(trade_time, now)
+        if self.clock is None or second > self.clock or second < self.clock - 3600:
+            self.clock = second   # 일자 변경 시 재설정
+        state = self._states.get(code)
+        if state is None or second < state.head - 3600:
+            # 신규 종목 또는 일자 변경
+            state = self._states[code] = _SymbolState(self.size, len(self.windows), second)
+        else:
+            self._advance(state, second)
+
+        if self.classify == CLASSIFY_SIGN:
+            side = 1 if volume > 0 else -1
+        elif price > state.last_price > 0:
+            side = 1
+        elif 0 < price < state.last_price:
+            side = -1
+        else:
+            side = state.last_side or 1
+        state.last_price = price
+        state.last_side = side
+
+        # 늦게 도착한 틱(second < head)은 현재 구간에 합산
+        amount = abs(volume)
+        slot = state.head % self.size
+        if side > 0:
+            state.buy[slot] += amount
+            state.day_buy += amount
+            for i in range(len(self.windows)):
+                state.buy_sums[i] += amount
+        else:
+            state.sell[slot] += amount
+            state.day_sell += amount
+            for i in range(len(self.windows)):
+                state.sell_sums[i] += amount
+        self.ticks += 1
+
+    def _ratio(self, buy: float, sell: float) -> Optional[float]:
+        if sell > 0:
+            return min(buy / sell * 100, self.max_strength)
+        return self.max_strength if buy > 0 else None
+
+    def strength(self, code: str, window: Optional[int] = None, now: Optional[datetime] = None) -> Optional[float]:
+        """
+        최근 window초 체결강도 (미추적/관측 시간 부족/체결 없음이면 None)
+
+        Args:
+            now: 기준 체결시간 (None이면 마지막 수신 체결시간 - 로컬 시계 차이와 무관)
+        """
+        window = window or self.default_window
+        state = self._states.get(code)
+        i = self._window_index.get(window)
+        if state is None or i is None:
+            return None
+        second = seconds_of_day("", now) if now is not None else self.clock
+        if second < state.head - 3600:
+            return None   # 전일 데이터
+        self._advance(state, second)
+        if state.head - state.first < window:
+            return None
+        return self._ratio(state.buy_sums[i], state.sell_sums[i])
+
+    def strengths(self, code: str, now: Optional[datetime] = None) -> Dict[int, Optional[float]]:
+        """구간별 체결강도 {초: 값}"""
+        return {window: self.strength(code, window, now) for window in self.windows}
+
+    def day_strength(self, code: str) -> Optional[float]:
+        """당일 추적 시작 이후 누적 체결강도"""
+        state = self._states.get(code)
+        return self._ratio(state.day_buy, state.day_sell) if state is not None else None
+
+    def remove(self, code: str):
+        self._states.pop(code, None)
+
+    def reset(self):
+        """새 거래일 시작"""
+        self._states.clear()
+        self.clock = None
+
+    def codes(self) -> Iterable[str]:
+        return self._states.keys()
+
+
+__all__ = ["TradeStrengthTracker", "CLASSIFY_SIGN", "CLASSIFY_TICK"]
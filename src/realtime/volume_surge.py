@@ -0,0 +1,221 @@
+"""
+실시간 거래량 급증 감지
+주식체결(0B) 틱으로 종목별 구간 거래량을 누적해 기준 거래량(EWMA 또는 시간대별 평균) 대비 급증 시 즉시 이벤트 발생
+"""
+
+import asyncio
+import time
+import numpy as np
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Iterable
+from src.realtime.timeutil import seconds_of_day
+from src.utils.logger import logger
+
+
+# 기준 거래량 방식
+METHOD_EWMA = "ewma"                # 직전 구간 거래량 지수이동평균
+METHOD_TIME_OF_DAY = "time_of_day"  # 과거 일자 같은 시간대 평균 (이력 분봉, 없으면 EWMA)
+
+_MINUTES_PER_DAY = 1440
+
+
+class SurgeEvent:
+    """거래량 급증 이벤트"""
+
+    __slots__ = ('code', 'ratio', 'volume', 'baseline', 'price', 'second', 'detected_at')
+
+    def __init__(self, code: str, ratio: float, volume: float, baseline: float, price: float, second: int):
+        self.code = code
+        self.ratio = ratio          # 구간 거래량 / 기준 거래량
+        self.volume = volume        # 현재 구간 누적 거래량
+        self.baseline = baseline    # 구간당 기준 거래량
+        self.price = price
+        self.second = second        # 자정 기준 초 (체결시간)
+        self.detected_at = time.monotonic()
+
+    def __repr__(self):
+        return (
+            f"SurgeEvent({self.code} x{self.ratio:.1f} "
+            f"V={self.volume:.0f} base={self.baseline:.0f} @{self.price})"
+        )
+
+
+class _SurgeState:
+    """종목별 진행 중 구간 + 기준 거래량"""
+
+    __slots__ = ('bucket', 'volume', 'ewma', 'samples', 'last_event')
+
+    def __init__(self, bucket: int):
+        self.bucket = bucket
+        self.volume = 0.0
+        self.ewma = 0.0
+        self.samples = 0          # EWMA에 반영된 체결 있는 구간 수 (빈 구간은 감쇠만, 미포함)
+        self.last_event = None    # 마지막 이벤트 시각 (자정 기준 초)
+
+
+class VolumeSurgeDetector:
+    """
+    종목별 거래량 급증 감지
+
+    - 체결 틱마다 현재 구간(bucket_seconds) 거래량을 누적하고 기준 거래량 × threshold를 넘는 틱에서 바로 감지
+    - 구간 종료 시 EWMA 갱신 (체결 없는 구간은 0으로 감쇠, 틱당 O(1))
+    - 감지 결과는 on_surge 콜백(동기/비동기)으로 전달, 종목별 cooldown초 동안 재발생 없음
+    """
+
+    def __init__(
+        self,
+        method: str = METHOD_EWMA,
+        bucket_seconds: int = 60,
+        alpha: float = 0.1,
+        threshold: float = 5.0,
+        min_volume: float = 10000,
+        min_samples: int = 10,
+        cooldown: float = 300.0
+    ):
+        self.method = method
+        self.bucket_seconds = bucket_seconds
+        self.alpha = alpha
+        self.threshold = threshold
+        self.min_volume = min_volume     # 구간 거래량 하한 (저유동 종목 오탐 방지)
+        self.min_samples = min_samples   # EWMA 사용 전 최소 관측 구간 수 (체결 있는 구간만)
+        self.cooldown = cooldown
+
+        self._states: Dict[str, _SurgeState] = {}
+        self._profiles: Dict[str, np.ndarray] = {}   # {종목코드: 구간별 평균 거래량 (하루 전체)}
+
+        self.on_surge: List[Callable[[SurgeEvent], Any]] = []
+
+        # 통계
+        self.ticks = 0
+        self.events = 0
+
+    def on_tick(
+        self,
+        code: str,
+        price: float,
+        volume: int,
+        trade_time: str = "",
+        now: Optional[datetime] = None
+    ) -> Optional[SurgeEvent]:
+        """
+        체결 틱 반영 (급증 기준을 넘는 틱이면 이벤트 발생/반환)
+
+        Args:
+            volume: 체결량 (부호 무관)
+            trade_time: 체결시간 'HHMMSS' (0B 20번)
+        """
+        if not volume:
+            return None
+        second = seconds_of_day(trade_time, now)
+        bucket = second // self.bucket_seconds
+        self.ticks += 1
+
+        state = self._states.get(code)
+        if state is None:
+            state = self._states[code] = _SurgeState(bucket)
+        elif bucket != state.bucket:
+            if bucket < state.bucket:
+                if state.bucket - bucket < 3600 // self.bucket_seconds:
+                    bucket = state.bucket   # 늦게 도착한 틱은 현재 구간에 합산
+                else:
+                    state = self._states[code] = _SurgeState(bucket)   # 일자 변경
+            else:
+                self._close_bucket(state, bucket)
+
+        state.volume += abs(volume)
+        if state.volume < self.min_volume:
+            return None
+        baseline = self._baseline(code, state)
+        if baseline is None or state.volume < baseline * self.threshold:
+            return None
+        if state.last_event is not None and second - state.last_event < self.cooldown:
+            return None
+
+        state.last_event = second
+        event = SurgeEvent(code, state.volume / max(baseline, 1.0), state.volume, baseline, price, second)
+        self._publish(event)
+        return event
+
+    def _close_bucket(self, state: _SurgeState, bucket: int):
+        """진행 중 구간 종료 → EWMA 반영 (사이 체결 없는 구간은 0 거래량으로 감쇠)"""
+        if state.samples == 0:
+            state.ewma = state.volume
+        else:
+            state.ewma += self.alpha * (state.volume - state.ewma)
+        gap = bucket - state.bucket - 1
+        if gap > 0:
+            state.ewma *= (1 - self.alpha) ** gap
+        state.samples += 1
+        state.bucket = bucket
+        state.volume = 0.0
+
+    def _baseline(self, code: str, state: _SurgeState) -> Optional[float]:
+        """현재 구간 기준 거래량 (관측 부족 시 None)"""
+        if self.method == METHOD_TIME_OF_DAY:
+            profile = self._profiles.get(code)
+            if profile is not None and profile[state.bucket] > 0:
+                return float(profile[state.bucket])
+        return state.ewma if state.samples >= self.min_samples else None
+
+    def baseline(self, code: str) -> Optional[float]:
+        state = self._states.get(code)
+        return self._baseline(code, state) if state is not None else None
+
+    def _publish(self, event: SurgeEvent):
+        self.events += 1
+        for callback in self.on_surge:
+            try:
+                result = callback(event)
+                if asyncio.iscoroutine(result):
+                    asyncio.ensure_future(result)
+            except Exception as e:
+                logger.error(f"거래량 급증 콜백 오류 ({event.code}): {e}")
+
+    def load_profile(self, store: Any, days: int = 20, codes: Optional[Iterable[str]] = None) -> int:
+        """
+        시간대별 기준 거래량 구성 (이력 저장소 1분봉, 당일 제외 최근 days일 평균)
+
+        Args:
+            store: HistoryStore
+            codes: 대상 종목 (None이면 이력이 있는 전체)
+        Returns:
+            프로필이 구성된 종목 수
+        """
+        if self.bucket_seconds % 60 or _MINUTES_PER_DAY % (self.bucket_seconds // 60):
+            logger.warning(f"시간대별 기준 거래량은 1440분을 나누는 분 단위 구간만 지원: {self.bucket_seconds}초")
+            return 0
+        today = datetime.now().strftime('%Y%m%d')
+        history_days = [d for d in store.days() if d < today][-days:]
+        if not history_days:
+            return 0
+
+        minutes = self.bucket_seconds // 60
+        totals: Dict[str, np.ndarray] = {}
+        for day in history_days:
+            day_start_ns = int(datetime.strptime(day, '%Y%m%d').timestamp() * 1e9)
+            for code in (codes if codes is not None else store.codes(day, 'bar')):
+                bars = store.bars(code, day)
+                if len(bars) == 0:
+                    continue
+                minute = ((bars['ts'] - day_start_ns) // 60_000_000_000).astype(np.int64)
+                valid = (minute >= 0) & (minute < _MINUTES_PER_DAY)
+                total = totals.setdefault(code, np.zeros(_MINUTES_PER_DAY))
+                np.add.at(total, minute[valid], bars['volume'][valid])
+
+        for code, total in totals.items():
+            self._profiles[code] = total.reshape(-1, minutes).sum(axis=1) / len(history_days)
+        logger.info(f"시간대별 기준 거래량: {len(totals)}종목 ({len(history_days)}일)")
+        return len(totals)
+
+    def remove(self, code: str):
+        self._states.pop(code, None)
+
+    def reset(self):
+        """새 거래일 시작 (진행 중 구간/EWMA 삭제, 시간대별 프로필은 유지)"""
+        self._states.clear()
+
+    def codes(self) -> Iterable[str]:
+        return self._states.keys()
+
+
+__all__ = ["VolumeSurgeDetector", "SurgeEvent", "METHOD_EWMA", "METHOD_TIME_OF_DAY"]
@@ -0,0 +1,312 @@
+"""
+Deep Scan 데이터 소스
+평가 항목이 선언한 소스별 조회 방법과 비용 - 시장 단위 소스는 스캔당 1회만 조회
+"""
+
+import asyncio
+import heapq
+import pandas as pd
+from abc import ABC, abstractmethod
+from typing import Dict, Any, Callable, Awaitable, Type, List, Optional
+from src.kiwoom.rest_client import KiwoomRestClient
+from src.realtime.orderbook import OrderBookStore
+from src.realtime.trade_strength import TradeStrengthTracker
+from src.scanner.indicators import TechnicalIndicators
+
+
+class ScanContext:
+    """Deep Scan 1회분 조회 상태 (시장 단위 캐시 + 통계)"""
+
+    def __init__(
+        self,
+        api_client: KiwoomRestClient,
+        top_k: int = 20,
+        orderbooks: Optional[OrderBookStore] = None,
+        trade_strength: Optional[TradeStrengthTracker] = None
+    ):
+        self.api = api_client
+        self.orderbooks = orderbooks   # 실시간 호가 (있으면 REST 호가 조회 대신 사용)
+        self.trade_strength = trade_strength   # 실시간 체결강도 (있으면 REST 체결강도 조회 대신 사용)
+        self._shared: Dict[str, asyncio.Future] = {}
+
+        # 평가 완료 종목 중 상위 top_k 점수 (최소 힙)
+        self.top_k = top_k
+        self._best: List[float] = []
+
+        # 통계
+        self.fetch_counts: Dict[str, int] = {}
+        self.pruned = 0
+        self.skipped = 0  # 조회 없이 제외된 종목
+        self.live_hits = 0  # 실시간 데이터로 대체한 조회
+
+    async def shared(self, name: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """시장 단위 데이터 조회 (동시 요청은 첫 조회 결과를 공유)"""
+        future = self._shared.get(name)
+        if future is None:
+            future = asyncio.ensure_future(loader())
+            self._shared[name] = future
+            self.count(name)
+        return await future
+
+    def add_result(self, score: float):
+        """평가 완료 종목 점수 반영"""
+        if len(self._best) < self.top_k:
+            heapq.heappush(self._best, score)
+        elif score > self._best[0]:
+            heapq.heapreplace(self._best, score)
+
+    def kth_score(self) -> float:
+        """현재 top_k 번째 점수 (top_k개 미만이면 -inf) - 이보다 낮은 상한의 종목은 상위권 진입 불가"""
+        return self._best[0] if len(self._best) >= self.top_k else float('-inf')
+
+    def count(self, name: str):
+        self.fetch_counts[name] = self.fetch_counts.get(name, 0) + 1
+
+    @property
+    def total_fetches(self) -> int:
+        return sum(self.fetch_counts.values())
+
+
+class DataSource(ABC):
+    """
+    데이터 소스 기본 클래스
+
+    Attributes:
+        name: 소스 이름 (ScoringFactor.sources)
+        cost: 종목당 조회 비용 (API 호출 수 기준, 시장 단위 소스는 분할 비용)
+    """
+
+    name = ""
+    cost = 1.0
+
+    def __init__(self, criteria: Dict[str, Any]):
+        self.criteria = criteria
+
+    @abstractmethod
+    async def fetch(self, record: Dict[str, Any], context: ScanContext):
+        """조회 결과를 종목 데이터(record)에 기록"""
+
+
+_REGISTRY: List[Type[DataSource]] = []
+
+
+def register_source(cls: Type[DataSource]) -> Type[DataSource]:
+    """데이터 소스 등록"""
+    _REGISTRY.append(cls)
+    return cls
+
+
+def build_sources(criteria: Dict[str, Any]) -> Dict[str, DataSource]:
+    """등록된 데이터 소스 생성 {이름: 소스}"""
+    return {cls.name: cls(criteria) for cls in _REGISTRY}
+
+
+@register_source
+class RankingSource(DataSource):
+    """Fast Scan 순위 데이터 (추가 조회 없음)"""
+
+    name = "ranking"
+    cost = 0.0
+
+    async def fetch(self, record: Dict[str, Any], context: ScanContext):
+        pass
+
+
+@register_source
+class QuoteSource(DataSource):
+    """현재가/고가 근접도 (ka10001)"""
+
+    name = "quote"
+
+    async def fetch(self, record: Dict[str, Any], context: ScanContext):
+        context.count(self.name)
+        quote = await context.api.get_quote(record['code'])
+        record['current_price'] = quote.get('price', 0) or record.get('current_price', 0)
+        record['high_proximity_pct'] = quote.get('high_proximity', 0)
+
+
+@register_source
+class OrderbookSource(DataSource):
+    """호가 잔량 비율 (실시간 호가 우선, 없으면 ka10004)"""
+
+    name = "orderbook"
+
+    async def fetch(self, record: Dict[str, Any], context: ScanContext):
+        ratio = context.orderbooks.bid_ask_ratio(record['code']) if context.orderbooks else None
+        if ratio is not None:
+            context.live_hits += 1
+            record['bid_ask_ratio'] = ratio
+            return
+
+        context.count(self.name)
+        orderbook = await context.api.get_orderbook(record['code'])
+        bid = sum(b.get('volume', 0) for b in orderbook.get('bids', []))
+        ask = sum(a.get('volume', 0) for a in orderbook.get('asks', []))
+        record['bid_ask_ratio'] = (bid / ask) * 100 if ask > 0 else 0
+
+
+@register_source
+class InvestorSource(DataSource):
+    """외국인/기관 연속 순매수 (ka10131, 코스피/코스닥 1회씩)"""
+
+    name = "investor"
+    cost = 0.1
+
+    async def fetch(self, record: Dict[str, Any], context: ScanContext):
+        investors = await context.shared(self.name, lambda: self._load(context.api))
+        item = investors.get(record['code'], {})
+        record['foreign_consecutive_days'] = item.get('foreign_days', 0)
+        # 백만원 → 억원
+        record['institute_buy_billion'] = item.get('institute_amount', 0) / 100
+
+    @staticmethod
+    async def _load(api: KiwoomRestClient) -> Dict[str, Dict]:
+        investors = {}
+        for market in ("001", "101"):
+            investors.update(await api.get_investor_continuous(market))
+        return investors
+
+
+@register_source
+class StrengthSource(DataSource):
+    """체결강도 (실시간 체결 틱 우선, 없으면 ka10046)"""
+
+    name = "strength"
+
+    async def fetch(self, record: Dict[str, Any], context: ScanContext):
+        strength = context.trade_strength.strength(record['code']) if context.trade_strength else None
+        if strength is not None:
+            context.live_hits += 1
+            record['trade_strength'] = strength
+            return
+
+        context.count(self.name)
+        trend = await context.api.get_strength_trend(record['code'])
+        record['trade_strength'] = trend[0]['strength'] if trend else 0
+
+
+@register_source
+class BrokerSource(DataSource):
+    """거래원 순매수 (ka10002)"""
+
+    name = "broker"
+
+    async def fetch(self, record: Dict[str, Any], context: ScanContext):
+        context.count(self.name)
+        brokers = await context.api.get_brokers(record['code'])
+        sells = {b['id']: b['quantity'] for b in brokers.get('sell', [])}
+        record['broker_net_buy_count'] = sum(
+            1 for b in brokers.get('buy', [])
+            if b['quantity'] > sells.get(b['id'], 0)
+        )
+
+
+@register_source
+class ProgramSource(DataSource):
+    """프로그램 순매수 상위 (ka90003, 코스피/코스닥 1회씩)"""
+
+    name = "program"
+    cost = 0.1
+
+    async def fetch(self, record: Dict[str, Any], context: ScanContext):
+        ranking = await context.shared(self.name, lambda: self._load(context.api))
+        item = ranking.get(record['code'], {})
+        record['program_rank'] = item.get('rank', 0)
+        record['program_net_buy'] = item.get('net_buy_amount', 0)
+
+    @staticmethod
+    async def _load(api: KiwoomRestClient) -> Dict[str, Dict]:
+        ranking = {}
+        for market in ("P00101", "P10102"):
+            for item in await api.get_program_net_buy_top(market):
+                ranking[item['code']] = item
+        return ranking
+
+
+@register_source
+class ChartSource(DataSource):
+    """일봉 기술적 지표 (ka10081)"""
+
+    name = "chart"
+    cost = 2.0  # 응답 크기 + 지표 계산
+
+    async def fetch(self, record: Dict[str, Any], context: ScanContext):
+        context.count(self.name)
+        candles = await context.api.get_daily_chart(record['code'])
+        if len(candles) < 2:
+            return
+
+        close = pd.Series([c['close'] for c in candles], dtype=float)
+        prev_close = close.iloc[:-1]
+
+        record['rsi'] = TechnicalIndicators.rsi(close)['value']
+
+        # MACD 히스토그램 음→양 전환
+        histogram = TechnicalIndicators.macd(close)['histogram']
+        prev_histogram = TechnicalIndicators.macd(prev_close)['histogram']
+        record['macd_golden_cross'] = prev_histogram <= 0 < histogram
+
+        record['ma_alignment'] = TechnicalIndicators.moving_averages(close)['alignment'] == 'BULLISH'
+
+        # 볼린저 중심선 상향 돌파
+        middle = TechnicalIndicators.bollinger_bands(close)['middle']
+        prev_middle = TechnicalIndicators.bollinger_bands(prev_close)['middle']
+        record['bollinger_breakout'] = bool(prev_close.iloc[-1] < prev_middle and close.iloc[-1] >= middle)
+
+
+@register_source
+class ThemeSource(DataSource):
+    """소속 테마 (ka90001 종목검색) + 등락률 상위 테마 (스캔당 1회)"""
+
+    name = "theme"
+
+    async def fetch(self, record: Dict[str, Any], context: ScanContext):
+        hot_count = self.criteria['theme_news']['hot_theme_count']
+        hot_themes = await context.shared(
+            "hot_themes",
+            lambda: self._load_hot(context.api, hot_count)
+        )
+
+        context.count(self.name)
+        themes = await context.api.get_themes(record['code'])
+        codes = {t['code'] for t in themes if t.get('code')}
+        record['theme_member'] = bool(codes)
+        record['hot_theme'] = bool(codes & hot_themes)
+
+    @staticmethod
+    async def _load_hot(api: KiwoomRestClient, count: int) -> set:
+        themes = await api.get_themes(sort_type="3")  # 상위등락률
+        return {t['code'] for t in themes[:count] if t.get('code')}
+
+
+@register_source
+class SearchRankSource(DataSource):
+    """실시간 종목조회순위 (ka00198)"""
+
+    name = "search_rank"
+    cost = 0.1
+
+    async def fetch(self, record: Dict[str, Any], context: ScanContext):
+        ranking = await context.shared(self.name, lambda: self._load(context.api))
+        record['search_rank_change'] = ranking.get(record['code'], 0)
+
+    @staticmethod
+    async def _load(api: KiwoomRestClient) -> Dict[str, int]:
+        return {item['code']: item['rank_change'] for item in await api.get_search_rank() if item['code']}
+
+
+@register_source
+class VISource(DataSource):
+    """VI 발동 여부/발동가 (ka10054)"""
+
+    name = "vi"
+
+    async def fetch(self, record: Dict[str, Any], context: ScanContext):
+        context.count(self.name)
+        code = record['code']
+        triggers = [v for v in await context.api.get_vi_stocks(code) if v['code'].startswith(code)]
+        record['vi_triggered'] = bool(triggers)
+        record['vi_trigger_price'] = triggers[0]['trigger_price'] if triggers else 0
+
+
+__all__ = ["ScanContext", "DataSource", "register_source", "build_sources"]
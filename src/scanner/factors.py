@@ -0,0 +1,361 @@
+"""
+종목 평가 항목 (Scoring Factors)
+항목별 점수 규칙과 필요한 데이터 소스를 선언 - 새 항목은 ScoringFactor 상속 후 register_factor로 등록
+"""
+
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Tuple, Type
+
+
+def compile_table(entries: List[Dict[str, Any]], key: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    기준표 컴파일
+
+    기준표는 목록 순서대로 '값 >= 임계값'인 첫 항목의 점수를 사용한다.
+    임계값 오름차순 정렬 후 구간 k(임계값 k개 이하 충족)마다 충족 항목 중
+    목록 순서가 가장 빠른 항목의 점수를 미리 계산해 두면
+    searchsorted 한 번으로 동일한 결과를 얻는다.
+
+    Returns:
+        (오름차순 임계값, 구간별 점수 [len+1]) - 구간 0은 미충족(0점)
+    """
+    order = sorted(range(len(entries)), key=lambda i: entries[i][key])
+    thresholds = np.array([entries[i][key] for i in order], dtype=np.float64)
+
+    bucket_scores = np.zeros(len(entries) + 1, dtype=np.float64)
+    first_index = len(entries)
+    for k, i in enumerate(order, start=1):
+        if i < first_index:
+            first_index = i
+        bucket_scores[k] = entries[first_index]['score']
+
+    return thresholds, bucket_scores
+
+
+def lookup_table(table: Tuple[np.ndarray, np.ndarray], values: np.ndarray) -> np.ndarray:
+    """기준표 조회 (벡터화, NaN은 미충족)"""
+    thresholds, bucket_scores = table
+    scores = bucket_scores[np.searchsorted(thresholds, values, side='right')]
+    return np.where(np.isnan(values), 0.0, scores)
+
+
+def first_match(entries: List[Dict[str, Any]], key: str, value: float) -> float:
+    """목록 순서대로 '값 >= 임계값'인 첫 항목의 점수 (없으면 0)"""
+    for c in entries:
+        if value >= c[key]:
+            return c['score']
+    return 0
+
+
+class ScoringFactor(ABC):
+    """
+    평가 항목 기본 클래스
+
+    Attributes:
+        name: 점수 키 (score_info['scores'])
+        weight_key: scanning_rules.yaml weights 키
+        sources: 점수 계산에 필요한 데이터 소스 (src.scanner.data_sources)
+        vectorized: score_array 지원 여부 (배치 점수 계산)
+    """
+
+    name = ""
+    weight_key = ""
+    sources: Tuple[str, ...] = ()
+    vectorized = False
+
+    def __init__(self, criteria: Dict[str, Any]):
+        self.criteria = criteria
+
+    @abstractmethod
+    def score(self, data: Dict[str, Any]) -> float:
+        """종목 데이터로 점수 계산 (누락 데이터는 미충족 처리)"""
+
+    def score_array(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        """배치 점수 계산 (vectorized 항목은 재정의, 기본은 종목별 score)"""
+        keys = list(columns)
+        rows = zip(*(columns[k] for k in keys))
+        return np.array([self.score(dict(zip(keys, row))) for row in rows], dtype=np.float64)
+
+    @abstractmethod
+    def max_score(self) -> float:
+        """최대 점수 (가지치기 상한 계산용)"""
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(name={self.name}, sources={self.sources})"
+
+
+_REGISTRY: List[Type[ScoringFactor]] = []
+
+
+def register_factor(cls: Type[ScoringFactor]) -> Type[ScoringFactor]:
+    """평가 항목 등록 (등록 순서 = 점수 합산 순서)"""
+    _REGISTRY.append(cls)
+    return cls
+
+
+def build_factors(criteria: Dict[str, Any]) -> List[ScoringFactor]:
+    """등록된 평가 항목 생성"""
+    return [cls(criteria) for cls in _REGISTRY]
+
+
+# 1~5: 기준표 기반 항목 (배치 계산 지원)
+
+@register_factor
+class VolumeFactor(ScoringFactor):
+    """1. 거래량 급증"""
+
+    name = "volume"
+    weight_key = "volume"
+    sources = ("ranking",)
+    vectorized = True
+
+    def __init__(self, criteria: Dict[str, Any]):
+        super().__init__(criteria)
+        self._table = compile_table(criteria['volume'], 'threshold')
+
+    def score(self, data: Dict[str, Any]) -> float:
+        return first_match(self.criteria['volume'], 'threshold', data.get('volume_change_pct', 0))
+
+    def score_array(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        return lookup_table(self._table, columns['volume_change_pct'])
+
+    def max_score(self) -> float:
+        return max(c['score'] for c in self.criteria['volume'])
+
+
+@register_factor
+class PriceFactor(ScoringFactor):
+    """2. 가격 급등 + 고가 근접"""
+
+    name = "price"
+    weight_key = "price"
+    sources = ("ranking", "quote")
+    vectorized = True
+
+    def __init__(self, criteria: Dict[str, Any]):
+        super().__init__(criteria)
+        self._table = compile_table(criteria['price'], 'threshold')
+        self._proximity_table = compile_table(criteria['price_proximity_to_high'], 'threshold')
+
+    def score(self, data: Dict[str, Any]) -> float:
+        score = first_match(self.criteria['price'], 'threshold', data.get('price_change_pct', 0))
+        score += first_match(self.criteria['price_proximity_to_high'], 'threshold',
+                             data.get('high_proximity_pct', -999))
+        return score
+
+    def score_array(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        return (
+            lookup_table(self._table, columns['price_change_pct'])
+            + lookup_table(self._proximity_table, columns['high_proximity_pct'])
+        )
+
+    def max_score(self) -> float:
+        return (
+            max(c['score'] for c in self.criteria['price'])
+            + max(c['score'] for c in self.criteria['price_proximity_to_high'])
+        )
+
+
+@register_factor
+class ForeignInstituteFactor(ScoringFactor):
+    """3. 외국인 연속 순매수 + 기관 순매수 금액"""
+
+    name = "foreign_institute"
+    weight_key = "foreign_institute"
+    sources = ("investor",)
+    vectorized = True
+
+    def __init__(self, criteria: Dict[str, Any]):
+        super().__init__(criteria)
+        self._foreign_table = compile_table(criteria['foreign'], 'consecutive_days')
+        self._institute_table = compile_table(criteria['institute'], 'amount_billion')
+
+    def score(self, data: Dict[str, Any]) -> float:
+        score = first_match(self.criteria['foreign'], 'consecutive_days',
+                            data.get('foreign_consecutive_days', 0))
+        score += first_match(self.criteria['institute'], 'amount_billion',
+                             data.get('institute_buy_billion', 0))
+        return score
+
+    def score_array(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        return (
+            lookup_table(self._foreign_table, columns['foreign_consecutive_days'])
+            + lookup_table(self._institute_table, columns['institute_buy_billion'])
+        )
+
+    def max_score(self) -> float:
+        return (
+            max(c['score'] for c in self.criteria['foreign'])
+            + max(c['score'] for c in self.criteria['institute'])
+        )
+
+
+@register_factor
+class BidAskFactor(ScoringFactor):
+    """4. 호가 강도 (매수/매도 잔량 비율)"""
+
+    name = "bid_ask"
+    weight_key = "bid_ask_ratio"
+    sources = ("orderbook",)
+    vectorized = True
+
+    def __init__(self, criteria: Dict[str, Any]):
+        super().__init__(criteria)
+        self._table = compile_table(criteria['bid_ask_ratio'], 'threshold')
+
+    def score(self, data: Dict[str, Any]) -> float:
+        return first_match(self.criteria['bid_ask_ratio'], 'threshold', data.get('bid_ask_ratio', 0))
+
+    def score_array(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        return lookup_table(self._table, columns['bid_ask_ratio'])
+
+    def max_score(self) -> float:
+        return max(c['score'] for c in self.criteria['bid_ask_ratio'])
+
+
+@register_factor
+class StrengthFactor(ScoringFactor):
+    """5. 체결 강도"""
+
+    name = "strength"
+    weight_key = "trade_strength"
+    sources = ("strength",)
+    vectorized = True
+
+    def __init__(self, criteria: Dict[str, Any]):
+        super().__init__(criteria)
+        self._table = compile_table(criteria['trade_strength'], 'threshold')
+
+    def score(self, data: Dict[str, Any]) -> float:
+        return first_match(self.criteria['trade_strength'], 'threshold', data.get('trade_strength', 0))
+
+    def score_array(self, columns: Dict[str, np.ndarray]) -> np.ndarray:
+        return lookup_table(self._table, columns['trade_strength'])
+
+    def max_score(self) -> float:
+        return max(c['score'] for c in self.criteria['trade_strength'])
+
+
+# 6~10: 조건 기반 항목
+
+@register_factor
+class BrokerFactor(ScoringFactor):
+    """6. 거래원 순매수 (상위 거래원 중 순매수 거래원 수)"""
+
+    name = "broker"
+    weight_key = "broker"
+    sources = ("broker",)
+
+    def score(self, data: Dict[str, Any]) -> float:
+        return first_match(self.criteria['broker'], 'brokers', data.get('broker_net_buy_count', 0))
+
+    def max_score(self) -> float:
+        return max(c['score'] for c in self.criteria['broker'])
+
+
+@register_factor
+class ProgramTradeFactor(ScoringFactor):
+    """7. 프로그램 순매수 (순매수 상위 순위)"""
+
+    name = "program_trade"
+    weight_key = "program_trade"
+    sources = ("program",)
+
+    def score(self, data: Dict[str, Any]) -> float:
+        config = self.criteria['program_trade']
+        rank = data.get('program_rank', 0)
+        if rank > 0:
+            for c in config['rank']:
+                if rank <= c['max_rank']:
+                    return c['score']
+        if data.get('program_net_buy', 0) > 0:
+            return config['net_buy']
+        return 0
+
+    def max_score(self) -> float:
+        config = self.criteria['program_trade']
+        return max([c['score'] for c in config['rank']] + [config['net_buy']])
+
+
+@register_factor
+class TechnicalFactor(ScoringFactor):
+    """8. 기술적 지표 (RSI 구간, MACD 골든크로스, 이평선 정배열, 볼린저 중심선 돌파)"""
+
+    name = "technical"
+    weight_key = "technical"
+    sources = ("chart",)
+
+    def score(self, data: Dict[str, Any]) -> float:
+        config = self.criteria['technical']
+        score = 0
+        rsi = data.get('rsi')
+        if rsi is not None and config['rsi_range']['min'] <= rsi <= config['rsi_range']['max']:
+            score += config['rsi_range']['score']
+        if data.get('macd_golden_cross'):
+            score += config['macd_golden_cross']
+        if data.get('ma_alignment'):
+            score += config['ma_alignment']
+        if data.get('bollinger_breakout'):
+            score += config['bollinger_breakout']
+        return score
+
+    def max_score(self) -> float:
+        config = self.criteria['technical']
+        return (
+            config['rsi_range']['score'] + config['macd_golden_cross']
+            + config['ma_alignment'] + config['bollinger_breakout']
+        )
+
+
+@register_factor
+class ThemeNewsFactor(ScoringFactor):
+    """9. 테마/뉴스 (테마 소속, 인기 테마, 검색 순위 급등)"""
+
+    name = "theme_news"
+    weight_key = "theme_news"
+    sources = ("theme", "search_rank")
+
+    def score(self, data: Dict[str, Any]) -> float:
+        config = self.criteria['theme_news']
+        score = 0
+        if data.get('theme_member'):
+            score += config['theme_member']
+        if data.get('hot_theme'):
+            score += config['hot_theme']
+        if data.get('search_rank_change', 0) >= config['search_surge_rank_change']:
+            score += config['search_surge']
+        return min(score, config['max_score'])
+
+    def max_score(self) -> float:
+        config = self.criteria['theme_news']
+        total = config['theme_member'] + config['hot_theme'] + config['search_surge']
+        return min(total, config['max_score'])
+
+
+@register_factor
+class VIStatusFactor(ScoringFactor):
+    """10. VI 발동 후 흐름 (발동가 대비 현재가)"""
+
+    name = "vi_status"
+    weight_key = "vi_status"
+    sources = ("vi", "quote")
+
+    def score(self, data: Dict[str, Any]) -> float:
+        config = self.criteria['vi_status']
+        trigger_price = data.get('vi_trigger_price', 0)
+        if not data.get('vi_triggered') or trigger_price <= 0:
+            return config['no_vi']
+        if data.get('current_price', 0) >= trigger_price:
+            return config['resumed_rise']
+        return config['fell_after_vi']
+
+    def max_score(self) -> float:
+        config = self.criteria['vi_status']
+        return max(config['resumed_rise'], config['no_vi'], config['fell_after_vi'])
+
+
+__all__ = [
+    "ScoringFactor", "register_factor", "build_factors",
+    "compile_table", "lookup_table", "first_match",
+]
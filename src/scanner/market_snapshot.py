@@ -0,0 +1,227 @@
+"""
+시장 스냅샷 (컬럼형)
+Fast Scan 순위 조회 결과를 종목코드 인덱스 + 필드별 NumPy 배열로 병합/보관
+"""
+
+import numpy as np
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable, Iterator
+
+
+class MarketSnapshot:
+    """순위 조회 소스 병합 스냅샷 (종목 1개 = 1행)"""
+
+    # 숫자 필드별 병합 방식 - first: 소스 순서상 첫 값, max: 소스 중 최대값 (누적 수치)
+    FIELDS = {
+        'price': 'first',
+        'price_change': 'first',
+        'volume': 'max',
+        'trading_value': 'max',
+        'volume_change': 'max',
+        'strength': 'max',
+    }
+
+    # to_records 시 정수로 변환할 필드
+    INT_FIELDS = ('price', 'volume', 'trading_value')
+
+    def __init__(
+        self,
+        codes: List[str],
+        names: List[str],
+        status: List[str],
+        source_columns: Dict[str, Dict[str, np.ndarray]],
+        ranks: Dict[str, np.ndarray],
+        timestamp: Optional[datetime] = None
+    ):
+        self.timestamp = timestamp or datetime.now()
+        self.codes = np.array(codes, dtype=str)
+        self.names = np.array(names, dtype=str)
+        self.status = np.array(status, dtype=str)
+        self.index: Dict[str, int] = {code: i for i, code in enumerate(codes)}
+
+        # 소스별 원본 필드 (미포함 NaN) / 소스별 순위 (미포함 0)
+        self.source_columns = source_columns
+        self.ranks = ranks
+        self.sources = list(source_columns)
+
+        self.columns = {field: self._merge(field, how) for field, how in self.FIELDS.items()}
+        self.source_count = (
+            np.sum([r > 0 for r in ranks.values()], axis=0).astype(np.int32)
+            if ranks else np.zeros(len(codes), dtype=np.int32)
+        )
+
+    @classmethod
+    def from_sources(
+        cls,
+        sources: Dict[str, List[Dict[str, Any]]],
+        timestamp: Optional[datetime] = None
+    ) -> "MarketSnapshot":
+        """
+        순위 조회 결과 병합
+
+        Args:
+            sources: {소스명: 순위 목록 (_parse_ranking_result 결과, 순위 순)}
+        """
+        index: Dict[str, int] = {}
+        names: List[str] = []
+        status: List[str] = []
+        for items in sources.values():
+            for item in items:
+                code = item.get('code', '')
+                if code and code not in index:
+                    index[code] = len(index)
+                    names.append(item.get('name', ''))
+                    status.append(item.get('status', ''))
+
+        size = len(index)
+        source_columns = {}
+        ranks = {}
+        for source, items in sources.items():
+            columns = {field: np.full(size, np.nan) for field in cls.FIELDS}
+            rank = np.zeros(size, dtype=np.int32)
+            for position, item in enumerate(items, start=1):
+                i = index.get(item.get('code', ''))
+                if i is None or rank[i]:
+                    continue  # 같은 소스 내 중복은 상위 순위만 사용
+                rank[i] = position
+                for field in cls.FIELDS:
+                    if field in item:
+                        columns[field][i] = item[field]
+            source_columns[source] = columns
+            ranks[source] = rank
+
+        return cls(list(index), names, status, source_columns, ranks, timestamp)
+
+    def _merge(self, field: str, how: str) -> np.ndarray:
+        """소스별 필드 병합 (모든 소스에 없으면 NaN)"""
+        if not self.sources:
+            return np.full(len(self.codes), np.nan)
+        stack = np.vstack([self.source_columns[s][field] for s in self.sources])
+        if how == 'max':
+            return np.fmax.reduce(stack, axis=0)
+        first = np.argmax(~np.isnan(stack), axis=0)
+        return stack[first, np.arange(stack.shape[1])]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def column(self, field: str) -> np.ndarray:
+        """병합 필드 배열"""
+        return self.columns[field]
+
+    def index_of(self, codes: Iterable[str]) -> np.ndarray:
+        """종목코드 → 행 번호 배열 (없으면 -1)"""
+        return np.array([self.index.get(code, -1) for code in codes], dtype=np.int64)
+
+    @property
+    def best_rank(self) -> np.ndarray:
+        """소스 중 최고 순위 (어느 소스에도 없으면 0)"""
+        if not self.sources:
+            return np.zeros(len(self.codes), dtype=np.int32)
+        stack = np.vstack([self.ranks[s] for s in self.sources]).astype(np.int64)
+        best = np.where(stack > 0, stack, np.iinfo(np.int64).max).min(axis=0)
+        return np.where(best == np.iinfo(np.int64).max, 0, best).astype(np.int32)
+
+    def deltas(self, previous: "MarketSnapshot") -> Dict[str, np.ndarray]:
+        """
+        이전 스냅샷 대비 변화량 (현재 스냅샷 행 기준)
+
+        Returns:
+            {
+                'is_new': 이전 스냅샷에 없던 종목,
+                'volume_pct': 거래량 변화율 (%),
+                'price_pct': 가격 변화율 (%),
+                'rank_change': 최고 순위 변화 (양수: 상승)
+            }
+            이전 값이 0/없음이고 현재 값이 있으면 변화율은 inf
+        """
+        rows = previous.index_of(self.codes)
+        is_new = rows < 0
+        safe_rows = np.where(is_new, 0, rows)
+
+        def pct(field: str) -> np.ndarray:
+            if len(previous) == 0:
+                return np.zeros(len(self.codes))
+            cur = np.nan_to_num(self.columns[field])
+            prev = np.nan_to_num(previous.columns[field][safe_rows])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                change = (cur - prev) / prev * 100
+            return np.where(prev > 0, change, np.where(cur > 0, np.inf, 0.0))
+
+        prev_rank = previous.best_rank[safe_rows] if len(previous) else np.zeros(len(self.codes), dtype=np.int32)
+        return {
+            'is_new': is_new,
+            'volume_pct': np.where(is_new, 0.0, pct('volume')),
+            'price_pct': np.where(is_new, 0.0, pct('price')),
+            'rank_change': np.where(is_new, 0, prev_rank - self.best_rank),
+        }
+
+    def status_contains(self, conditions: Iterable[str]) -> np.ndarray:
+        """상태 문자열에 조건 중 하나라도 포함된 행"""
+        mask = np.zeros(len(self.codes), dtype=bool)
+        for condition in conditions:
+            mask |= np.char.find(self.status, condition) >= 0
+        return mask
+
+    def top_k(self, field: str, k: int, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        필드 기준 상위 k개 행 번호 (내림차순, NaN 제외)
+
+        Args:
+            mask: 대상 행 (None이면 전체)
+        """
+        values = self.columns[field]
+        candidates = np.flatnonzero(~np.isnan(values) if mask is None else mask & ~np.isnan(values))
+        if len(candidates) > k:
+            # 상위 k개만 부분 정렬
+            part = np.argpartition(-values[candidates], k - 1)[:k]
+            candidates = candidates[part]
+        order = np.argsort(-values[candidates], kind='stable')
+        return candidates[order]
+
+    def to_records(self, rows: Iterable[int]) -> List[Dict[str, Any]]:
+        """행 → 종목 dict (기존 순위 파싱 결과 형식 + 소스별 순위)"""
+        records = []
+        for i in rows:
+            record = {
+                'code': str(self.codes[i]),
+                'name': str(self.names[i]),
+                'status': str(self.status[i]),
+            }
+            for field in self.FIELDS:
+                value = self.columns[field][i]
+                value = 0 if np.isnan(value) else value
+                record[field] = int(value) if field in self.INT_FIELDS else float(value)
+            record['ranks'] = {s: int(self.ranks[s][i]) for s in self.sources if self.ranks[s][i]}
+            record['source_count'] = int(self.source_count[i])
+            records.append(record)
+        return records
+
+
+class SnapshotHistory:
+    """스캔별 스냅샷 보관 (최근 max_size개)"""
+
+    def __init__(self, max_size: int = 30):
+        self._snapshots: deque = deque(maxlen=max_size)
+
+    def add(self, snapshot: MarketSnapshot):
+        self._snapshots.append(snapshot)
+
+    @property
+    def latest(self) -> Optional[MarketSnapshot]:
+        return self._snapshots[-1] if self._snapshots else None
+
+    @property
+    def previous(self) -> Optional[MarketSnapshot]:
+        """직전 스캔 스냅샷"""
+        return self._snapshots[-2] if len(self._snapshots) >= 2 else None
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def __iter__(self) -> Iterator[MarketSnapshot]:
+        return iter(self._snapshots)
+
+
+__all__ = ["MarketSnapshot", "SnapshotHistory"]
@@ -0,0 +1,112 @@
+"""
+Deep Scan 점수 캐시
+직전 평가 이후 Fast Scan 입력(거래량/가격/순위) 변화가 작은 종목은 이전 점수 재사용
+"""
+
+import time
+import numpy as np
+from typing import Dict, Any, List, Tuple
+from src.scanner.market_snapshot import MarketSnapshot
+
+
+class CachedScore:
+    """캐시된 평가 결과"""
+
+    __slots__ = ('record', 'scored_at', 'snapshot')
+
+    def __init__(self, record: Dict[str, Any], scored_at: float, snapshot: MarketSnapshot):
+        self.record = record
+        self.scored_at = scored_at   # monotonic
+        self.snapshot = snapshot     # 평가 시점 Fast Scan 스냅샷
+
+
+class ScoreCache:
+    """변화 기반 재평가용 점수 캐시"""
+
+    def __init__(self, config: Dict[str, Any]):
+        # 재평가 기준 (평가 시점 스냅샷 대비)
+        self.volume_change_pct = config.get('volume_change_pct', 20.0)
+        self.price_change_pct = config.get('price_change_pct', 1.0)
+        self.rank_change = config.get('rank_change', 10)
+        self.max_age = config.get('max_score_age', 300)  # 초 - 변화 없어도 이 시간이 지나면 재평가
+
+        self._entries: Dict[str, CachedScore] = {}
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+
+    def partition(
+        self,
+        stocks: List[Dict[str, Any]],
+        snapshot: MarketSnapshot
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        재평가 대상 / 캐시 재사용 분리
+
+        Returns:
+            (재평가할 Fast Scan 종목, 재사용 평가 결과 - score_age(초) 갱신)
+        """
+        now = time.monotonic()
+        self._expire(now)
+
+        # 평가 시점 스냅샷별로 묶어 변화량을 한 번에 계산
+        groups: Dict[int, List[int]] = {}
+        for i, stock in enumerate(stocks):
+            entry = self._entries.get(stock['code'])
+            if entry is not None and snapshot is not None:
+                groups.setdefault(id(entry.snapshot), []).append(i)
+
+        unchanged = set()
+        for positions in groups.values():
+            previous = self._entries[stocks[positions[0]]['code']].snapshot
+            deltas = snapshot.deltas(previous)
+            rows = snapshot.index_of(stocks[i]['code'] for i in positions)
+            valid = rows >= 0
+            safe_rows = np.where(valid, rows, 0)
+            changed = (
+                ~valid
+                | deltas['is_new'][safe_rows]
+                | (np.abs(deltas['volume_pct'][safe_rows]) >= self.volume_change_pct)
+                | (np.abs(deltas['price_pct'][safe_rows]) >= self.price_change_pct)
+                | (np.abs(deltas['rank_change'][safe_rows]) >= self.rank_change)
+            )
+            unchanged.update(i for i, c in zip(positions, changed.tolist()) if not c)
+
+        to_score, reused = [], []
+        for i, stock in enumerate(stocks):
+            if i in unchanged:
+                entry = self._entries[stock['code']]
+                record = dict(entry.record)   # 캐시 원본은 호출측 수정과 분리
+                record['score_age'] = round(now - entry.scored_at, 1)
+                reused.append(record)
+            else:
+                to_score.append(stock)
+
+        self.hits += len(reused)
+        self.misses += len(to_score)
+        return to_score, reused
+
+    def store(self, records: List[Dict[str, Any]], snapshot: MarketSnapshot):
+        """평가 결과 저장"""
+        if snapshot is None:
+            return
+        now = time.monotonic()
+        for record in records:
+            record['score_age'] = 0.0
+            self._entries[record['code']] = CachedScore(dict(record), now, snapshot)
+
+    def discard(self, code: str):
+        """종목 캐시 삭제 (다음 Deep Scan에서 재평가)"""
+        self._entries.pop(code, None)
+
+    def _expire(self, now: float):
+        expired = [code for code, e in self._entries.items() if now - e.scored_at >= self.max_age]
+        for code in expired:
+            del self._entries[code]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+__all__ = ["CachedScore", "ScoreCache"]
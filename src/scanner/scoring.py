@@ -3,30 +3,52 @@
 10가지 평가 기준으로 종목 점수화
 """
 
-from typing import Dict, Any
+import numpy as np
+from typing import Dict, Any, List, Optional
+from src.scanner.factors import ScoringFactor, build_factors
 from src.utils.config_loader import load_config
+from src.utils.logger import logger
 
 
 class StockScorer:
     """종목 점수 계산기"""
 
-    def __init__(self):
-        config = load_config("scanning_rules")
+    # 배치 점수 입력 컬럼 (컬럼명, 누락 시 기본값) - calculate_score의 data.get 기본값과 동일
+    BATCH_COLUMNS = {
+        'volume_change_pct': 0,
+        'price_change_pct': 0,
+        'high_proximity_pct': -999,
+        'foreign_consecutive_days': 0,
+        'institute_buy_billion': 0,
+        'bid_ask_ratio': 0,
+        'trade_strength': 0,
+    }
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or load_config("scanning_rules")
         self.weights = config['scanning']['weights']
         self.criteria = config['scanning']['criteria']
         self.grading = config['scanning']['grading']
 
+        # 평가 항목 (등록 순서 = 합산 순서)
+        self.factors: List[ScoringFactor] = build_factors(self.criteria)
+        for factor in self.factors:
+            if factor.weight_key not in self.weights:
+                logger.warning(f"가중치 미설정 평가 항목: {factor.name} (weights.{factor.weight_key}) - 1.0 적용")
+
+    def weight(self, factor: ScoringFactor) -> float:
+        """항목 가중치"""
+        return self.weights.get(factor.weight_key, 1.0)
+
+    def max_weighted_score(self, factor: ScoringFactor) -> float:
+        """항목 최대 가중 점수 (가지치기 상한)"""
+        return factor.max_score() * self.weight(factor)
+
     def calculate_score(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
         """종목 종합 점수 계산"""
-        scores = {
-            'volume': self._score_volume(stock_data),
-            'price': self._score_price(stock_data),
-            'foreign_institute': self._score_foreign_institute(stock_data),
-            'bid_ask': self._score_bid_ask(stock_data),
-            'strength': self._score_strength(stock_data)
-        }
+        scores = {f.name: f.score(stock_data) for f in self.factors}
 
-        weighted = {k: v * self.weights.get(k, 1.0) for k, v in scores.items()}
+        weighted = {f.name: scores[f.name] * self.weight(f) for f in self.factors}
         total = sum(weighted.values())
         grade = self._determine_grade(total)
 
@@ -37,59 +59,105 @@ class StockScorer:
             'weighted_scores': weighted
         }
 
-    def _score_volume(self, data: Dict) -> float:
-        """거래량 점수"""
-        change = data.get('volume_change_pct', 0)
-        for c in self.criteria['volume']:
-            if change >= c['threshold']:
-                return c['score']
-        return 0
-
-    def _score_price(self, data: Dict) -> float:
-        """가격 점수"""
-        change = data.get('price_change_pct', 0)
-        score = 0
-        for c in self.criteria['price']:
-            if change >= c['threshold']:
-                score = c['score']
-                break
-        prox = data.get('high_proximity_pct', -999)
-        for c in self.criteria['price_proximity_to_high']:
-            if prox >= c['threshold']:
-                score += c['score']
-                break
-        return score
-
-    def _score_foreign_institute(self, data: Dict) -> float:
-        """외국인/기관 점수"""
-        score = 0
-        foreign_days = data.get('foreign_consecutive_days', 0)
-        for c in self.criteria['foreign']:
-            if foreign_days >= c['consecutive_days']:
-                score += c['score']
-                break
-        institute = data.get('institute_buy_billion', 0)
-        for c in self.criteria['institute']:
-            if institute >= c['amount_billion']:
-                score += c['score']
-                break
-        return score
-
-    def _score_bid_ask(self, data: Dict) -> float:
-        """호가 강도 점수"""
-        ratio = data.get('bid_ask_ratio', 0)
-        for c in self.criteria['bid_ask_ratio']:
-            if ratio >= c['threshold']:
-                return c['score']
-        return 0
-
-    def _score_strength(self, data: Dict) -> float:
-        """체결 강도 점수"""
-        strength = data.get('trade_strength', 0)
-        for c in self.criteria['trade_strength']:
-            if strength >= c['threshold']:
-                return c['score']
-        return 0
+    # 배치 점수 계산
+
+    def _columns(self, columns: Dict[str, np.ndarray], size: int) -> Dict[str, np.ndarray]:
+        """배치 입력 컬럼 정리 (누락 컬럼은 기본값)"""
+        return {
+            name: np.asarray(columns[name], dtype=np.float64) if name in columns
+            else np.full(size, default, dtype=np.float64)
+            for name, default in self.BATCH_COLUMNS.items()
+        }
+
+    def _batch_result(
+        self,
+        scores: Dict[str, np.ndarray],
+        factors: List[ScoringFactor],
+        size: int
+    ) -> Dict[str, Any]:
+        """항목별 점수 배열 → 가중 점수/총점/등급"""
+        weighted = {f.name: scores[f.name] * self.weight(f) for f in factors}
+
+        # calculate_score의 sum()과 같은 순서로 누적 (부동소수점 결과 일치)
+        total = np.zeros(size, dtype=np.float64)
+        for v in weighted.values():
+            total = total + v
+
+        return {
+            'total_score': total,
+            'grade': self._determine_grades(total),
+            'scores': scores,
+            'weighted_scores': weighted
+        }
+
+    def score_batch(self, columns: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """
+        배치 점수 계산 (기준표 기반 항목만, calculate_score와 동일한 결과)
+
+        Args:
+            columns: {컬럼명: 값 배열} (BATCH_COLUMNS 참고, 누락 컬럼은 기본값)
+
+        Returns:
+            {
+                'total_score': 총점 배열 (반올림 전),
+                'grade': 등급 배열,
+                'scores': {항목: 점수 배열},
+                'weighted_scores': {항목: 가중 점수 배열}
+            }
+        """
+        size = len(next(iter(columns.values()))) if columns else 0
+        cols = self._columns(columns, size)
+
+        factors = [f for f in self.factors if f.vectorized]
+        scores = {f.name: f.score_array(cols) for f in factors}
+        return self._batch_result(scores, factors, size)
+
+    def score_records(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """종목 목록 배치 점수 계산 (calculate_score 결과 형식으로 반환)"""
+        if not records:
+            return []
+
+        size = len(records)
+        cols = self._columns({
+            name: np.array([r.get(name, default) for r in records], dtype=np.float64)
+            for name, default in self.BATCH_COLUMNS.items()
+        }, size)
+
+        # 기준표 항목은 벡터화, 조건 기반 항목은 종목별 계산
+        scores = {
+            f.name: f.score_array(cols) if f.vectorized
+            else np.array([f.score(r) for r in records], dtype=np.float64)
+            for f in self.factors
+        }
+        batch = self._batch_result(scores, self.factors, size)
+
+        totals = batch['total_score'].tolist()
+        grades = batch['grade'].tolist()
+        scores = {k: v.tolist() for k, v in batch['scores'].items()}
+        weighted = {k: v.tolist() for k, v in batch['weighted_scores'].items()}
+
+        return [
+            {
+                'total_score': round(totals[i], 2),
+                'grade': grades[i],
+                'scores': {k: v[i] for k, v in scores.items()},
+                'weighted_scores': {k: v[i] for k, v in weighted.items()}
+            }
+            for i in range(size)
+        ]
+
+    def _determine_grades(self, totals: np.ndarray) -> np.ndarray:
+        """등급 결정 (벡터화)"""
+        return np.select(
+            [
+                totals >= self.grading['s_grade'],
+                totals >= self.grading['a_grade'],
+                totals >= self.grading['b_grade'],
+                totals >= self.grading['c_grade']
+            ],
+            ['S', 'A', 'B', 'C'],
+            default='D'
+        )
 
     def _determine_grade(self, total: float) -> str:
         """등급 결정"""
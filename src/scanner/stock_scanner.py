@@ -4,18 +4,53 @@ Fast Scan -> Deep Scan -> AI Scan
 """
 
 import asyncio
-from typing import List, Dict, Any
+import time
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple
 from src.kiwoom.rest_client import KiwoomRestClient
+from src.realtime.orderbook import OrderBookStore
+from src.realtime.trade_strength import TradeStrengthTracker
+from src.realtime.volume_surge import SurgeEvent
+from src.scanner.data_sources import ScanContext, build_sources
+from src.scanner.factors import ScoringFactor
+from src.scanner.market_snapshot import MarketSnapshot, SnapshotHistory
+from src.scanner.score_cache import ScoreCache
 from src.scanner.scoring import StockScorer
 from src.utils.config_loader import load_config
 from src.utils.logger import logger
 
 
+class FastScanResult(list):
+    """Fast Scan 결과 (종목 목록 + 결과를 만든 스냅샷)"""
+
+    def __init__(self, records: List[Dict[str, Any]], snapshot: MarketSnapshot):
+        super().__init__(records)
+        self.snapshot = snapshot
+
+
 class StockScanner:
     """종목 스캐닝 엔진"""
 
-    def __init__(self, api_client: KiwoomRestClient):
+    def __init__(
+        self,
+        api_client: KiwoomRestClient,
+        orderbooks: Optional[OrderBookStore] = None,
+        trade_strength: Optional[TradeStrengthTracker] = None,
+        ranking_intervals: Optional[Dict[str, float]] = None,
+        priority_ttl: float = 300.0
+    ):
         self.api = api_client
+        # 실시간 호가/체결강도 (구독 종목은 REST 조회 생략)
+        self.orderbooks = orderbooks
+        self.trade_strength = trade_strength
+
+        # 순위 소스별 최소 조회 간격 (초, 실시간 감지로 대체된 소스는 대사용으로 느리게 조회)
+        self.ranking_intervals = ranking_intervals or {}
+        self._rankings: Dict[str, Tuple[float, List[Dict]]] = {}   # {소스: (조회 시각, 결과)}
+
+        # 실시간 감지 우선 후보 {종목코드: (만료 시각, 이벤트)} - Fast Scan 결과 앞에 추가
+        self.priority_ttl = priority_ttl
+        self._priority: Dict[str, Tuple[float, SurgeEvent]] = {}
         self.scorer = StockScorer()
 
         config = load_config("scanning_rules")
@@ -23,80 +58,184 @@ class StockScanner:
         self.exclude_conditions = config['scanning']['filters']['exclude_conditions']
         self.ai_min_score = config['scanning']['grading']['ai_analysis_min_score']
 
+        # Fast Scan 스냅샷 이력 (스캔 간 변화 비교용)
+        self.snapshots = SnapshotHistory(config['scanning'].get('snapshot_history', 30))
+
+        # 순위 조회 마감 (초) / 실패·지연 소스 대체용 이전 결과 허용 경과시간 (초)
+        ranking_config = config['scanning'].get('ranking', {})
+        self.ranking_deadline = ranking_config.get('deadline', 5.0)
+        self.ranking_max_stale = ranking_config.get('max_stale', 60.0)
+        self.score_cache = ScoreCache(config['scanning'].get('rescore', {}))
+
+        self.batch_size = 10  # Deep Scan 동시 평가 종목 수
+        self.top_k = 20       # Deep Scan 선택 종목 수
+
+        # 평가 항목별 데이터 소스 + 조회 순서 (저비용 항목 우선)
+        self.sources = build_sources(self.scorer.criteria)
+        self._plan = self._build_plan()
+        self._max_total_score = sum(self.scorer.max_weighted_score(f) for f in self.scorer.factors)
+
         logger.info("스캐너 초기화")
 
-    async def fast_scan(self) -> List[Dict[str, Any]]:
-        """Fast Scan: 거래량/가격 기본 스크리닝"""
+    async def fast_scan(self) -> FastScanResult:
+        """Fast Scan: 거래량/가격 기본 스크리닝 (결과에 사용한 스냅샷 포함)"""
         logger.info("=== Fast Scan ===")
 
-        # Rate Limit 회피를 위해 순차적으로 호출
-        all_stocks = []
-
-        try:
-            # 1. 거래량 급증
-            surge_stocks = await self.api.get_volume_surge_stocks(100)
-            all_stocks.extend(surge_stocks)
-        except Exception as e:
-            logger.warning(f"거래량 급증 조회 실패: {e}")
-
-        try:
-            # 2. 거래량 상위
-            volume_stocks = await self.api.get_volume_leaders(100)
-            all_stocks.extend(volume_stocks)
-        except Exception as e:
-            logger.warning(f"거래량 상위 조회 실패: {e}")
-
-        try:
-            # 3. 거래대금 상위
-            turnover_stocks = await self.api.get_turnover_leaders(100)
-            all_stocks.extend(turnover_stocks)
-        except Exception as e:
-            logger.warning(f"거래대금 상위 조회 실패: {e}")
-
-        try:
-            # 4. 등락률 상위
-            price_stocks = await self.api.get_price_change_leaders(100)
-            all_stocks.extend(price_stocks)
-        except Exception as e:
-            logger.warning(f"등락률 상위 조회 실패: {e}")
-
-        unique = {s['code']: s for s in all_stocks}.values()
-        filtered = self._apply_basic_filters(list(unique))
-        top_50 = sorted(filtered, key=lambda x: x.get('trading_value', 0), reverse=True)[:50]
-
-        logger.info(f"Fast Scan 완료: {len(top_50)}개")
-        return top_50
-
-    async def deep_scan(self, stocks: List[Dict]) -> List[Dict]:
-        """Deep Scan: 상세 분석 및 점수 계산 (배치 처리)"""
-        logger.info(f"=== Deep Scan: {len(stocks)}개 ===")
+        sources = await self._fetch_rankings()
 
-        batch_size = 10  # 한 번에 10개씩 처리
-        scored = []
+        # 소스별 필드/순위를 모두 유지한 컬럼형 스냅샷으로 병합
+        snapshot = MarketSnapshot.from_sources(sources)
+        self.snapshots.add(snapshot)
 
-        # 배치로 나눠서 처리
-        for i in range(0, len(stocks), batch_size):
-            batch = stocks[i:i+batch_size]
-            logger.info(f"배치 {i//batch_size + 1}/{(len(stocks)-1)//batch_size + 1} 처리 중 ({len(batch)}개)...")
+        mask = (
+            (np.nan_to_num(snapshot.column('trading_value')) >= self.min_trading_value)
+            & ~snapshot.status_contains(self.exclude_conditions)
+        )
+        top_50 = snapshot.to_records(snapshot.top_k('trading_value', 50, mask))
 
-            for stock in batch:
-                try:
-                    data = await self._collect_detailed_data(stock)
-                    score_result = self.scorer.calculate_score(data)
+        # 실시간 급증 종목 우선 (순위 조회 결과와 중복 제거)
+        priority = self.priority_candidates(snapshot)
+        if priority:
+            codes = {s['code'] for s in priority}
+            top_50 = priority + [s for s in top_50 if s['code'] not in codes]
 
-                    stock['score_info'] = score_result
-                    stock['total_score'] = score_result['total_score']
-                    stock['grade'] = score_result['grade']
-                    scored.append(stock)
+        logger.info(
+            f"Fast Scan 완료: {len(top_50)}개 (전체 {len(snapshot)}개 종목, "
+            f"필터 통과 {int(mask.sum())}개, 실시간 우선 {len(priority)}개)"
+        )
+        return FastScanResult(top_50, snapshot)
 
-                except Exception as e:
-                    logger.error(f"점수 계산 실패 ({stock.get('code')}): {e}")
+    async def _fetch_rankings(self) -> Dict[str, List[Dict]]:
+        """
+        순위 소스 동시 조회 (API ID가 달라 Rate Limit 독립, 왕복 1회 시간)
+
+        마감(ranking_deadline)까지 응답 없는 소스/실패 소스는 max_stale 이내 이전 결과로 대체, 없으면 제외
+        """
+        rankings = (
+            ("volume_surge", "거래량 급증", self.api.get_volume_surge_stocks),
+            ("volume_leaders", "거래량 상위", self.api.get_volume_leaders),
+            ("turnover_leaders", "거래대금 상위", self.api.get_turnover_leaders),
+            ("price_change_leaders", "등락률 상위", self.api.get_price_change_leaders),
+        )
+        sources: Dict[str, List[Dict]] = {}
+        tasks: Dict[asyncio.Task, Tuple[str, str]] = {}
+        now = time.monotonic()
+        for source, label, fetch in rankings:
+            cached = self._rankings.get(source)
+            if cached and now - cached[0] < self.ranking_intervals.get(source, 0):
+                sources[source] = cached[1]
+            else:
+                tasks[asyncio.ensure_future(fetch(100))] = (source, label)
+
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=self.ranking_deadline)
+            for task in pending:
+                task.cancel()   # 공유 요청(single-flight)은 계속 진행
+            fetched_at = time.monotonic()
+            for task, (source, label) in tasks.items():
+                if task in done and task.exception() is None:
+                    sources[source] = task.result()
+                    self._rankings[source] = (fetched_at, sources[source])
                     continue
 
-            # 배치 사이에 추가 대기 (Rate Limit 여유)
-            if i + batch_size < len(stocks):
-                await asyncio.sleep(3.0)
-                logger.info(f"다음 배치 전 3초 대기...")
+                reason = f"{self.ranking_deadline}초 내 응답 없음" if task in pending else task.exception()
+                cached = self._rankings.get(source)
+                if cached and fetched_at - cached[0] <= self.ranking_max_stale:
+                    sources[source] = cached[1]
+                    logger.warning(f"{label} 조회 실패: {reason} - {fetched_at - cached[0]:.0f}초 전 결과 사용")
+                else:
+                    logger.warning(f"{label} 조회 실패: {reason}")
+        return sources
+
+    def add_priority(self, event: SurgeEvent):
+        """실시간 감지 종목을 우선 후보로 등록 (캐시 점수 무효화)"""
+        self._priority[event.code] = (time.monotonic() + self.priority_ttl, event)
+        self.score_cache.discard(event.code)
+
+    def priority_candidates(self, snapshot: Optional[MarketSnapshot] = None) -> List[Dict[str, Any]]:
+        """
+        유효한 우선 후보 (급증 비율 내림차순)
+
+        스냅샷(None이면 최근 Fast Scan 스냅샷)에 있으면 순위 데이터 그대로, 없으면 이벤트 값으로 구성
+        """
+        now = time.monotonic()
+        for code in [c for c, (expires, _) in self._priority.items() if expires <= now]:
+            del self._priority[code]
+
+        snapshot = snapshot or self.snapshots.latest
+        records = []
+        for _, event in sorted(self._priority.values(), key=lambda p: p[1].ratio, reverse=True):
+            row = snapshot.index.get(event.code) if snapshot is not None else None
+            if row is not None:
+                record = snapshot.to_records([row])[0]
+                if any(c in record['status'] for c in self.exclude_conditions):
+                    continue
+            else:
+                # 순위 밖 종목 - 당일 누적 값은 알 수 없어 0 (Deep Scan 조회로 보완)
+                record = {
+                    'code': event.code, 'name': '', 'status': '',
+                    'price': int(event.price), 'price_change': 0.0, 'volume': 0,
+                    'trading_value': 0, 'volume_change': 0.0,
+                    'strength': 0.0, 'ranks': {}, 'source_count': 0,
+                }
+            record['surge_ratio'] = round(event.ratio, 2)
+            records.append(record)
+        return records
+
+    async def deep_scan(self, stocks: List[Dict], snapshot: Optional[MarketSnapshot] = None) -> List[Dict]:
+        """
+        Deep Scan: 상세 분석 및 점수 계산 (입력 변화 종목만 재평가, 기준 점수 도달 불가 종목은 남은 조회 생략)
+
+        Args:
+            stocks: Fast Scan 종목 (FastScanResult면 그 스냅샷 사용)
+            snapshot: stocks를 만든 스냅샷 (None이면 FastScanResult 스냅샷, 아니면 최근 스냅샷)
+        """
+        logger.info(f"=== Deep Scan: {len(stocks)}개 ===")
+
+        # 직전 평가 이후 입력 변화가 없는 종목은 캐시된 점수 재사용
+        # (동시에 실행된 다른 Fast Scan의 스냅샷과 비교하지 않도록 stocks를 만든 스냅샷 기준)
+        if snapshot is None:
+            snapshot = stocks.snapshot if isinstance(stocks, FastScanResult) else self.snapshots.latest
+        stocks, reused = self.score_cache.partition(stocks, snapshot)
+        if reused:
+            logger.info(f"점수 재사용 {len(reused)}개 / 재평가 {len(stocks)}개 (입력 변화 기준)")
+
+        context = ScanContext(self.api, self.top_k, self.orderbooks, self.trade_strength)
+        for record in reused:
+            if not record.get('pruned'):
+                context.add_result(record['total_score'])
+        semaphore = asyncio.Semaphore(self.batch_size)  # 동시 평가 종목 수
+
+        # 낙관 점수(조회 없이 계산 가능한 항목 + 나머지 항목 최대 점수) 내림차순으로 평가
+        # → 상위권 점수가 먼저 확정되어 이후 종목은 조회 없이 제외 가능
+        stocks = sorted(stocks, key=self._optimistic_score, reverse=True)
+
+        async def collect(stock: Dict) -> Optional[Dict]:
+            async with semaphore:
+                try:
+                    return await self._collect_detailed_data(stock, context)
+                except Exception as e:
+                    logger.error(f"상세 데이터 수집 실패 ({stock.get('code')}): {e}")
+                    return None
+
+        # 종목별 조회는 동시에 진행 (세마포어 대기 순서 = 낙관 점수 순서, API ID별 간격은 Rate Limit이 보장)
+        records = [r for r in await asyncio.gather(*(collect(s) for s in stocks)) if r is not None]
+        logger.info(
+            f"상세 조회 {context.total_fetches}건 "
+            f"(가지치기 {context.pruned}/{len(records)}개 종목, 조회 없이 제외 {context.skipped}개, "
+            f"항목별 {context.fetch_counts}, 실시간 대체 {context.live_hits}건)"
+        )
+
+        # 수집된 전체 후보를 한 번에 점수 계산 (벡터화, 가지치기 종목은 조회된 항목까지의 점수)
+        scored = []
+        score_results = self.scorer.score_records(records)
+        for record, score_result in zip(records, score_results):
+            record['score_info'] = score_result
+            record['total_score'] = score_result['total_score']
+            record['grade'] = score_result['grade']
+            scored.append(record)
+        self.score_cache.store(scored, snapshot)
+        scored.extend(reused)
 
         # 점수별 통계
         if scored:
@@ -105,58 +244,104 @@ class StockScanner:
             min_score = min(s['total_score'] for s in scored)
             logger.info(f"점수 통계 - 평균: {avg_score:.1f}, 최고: {max_score}, 최저: {min_score}")
 
-        # 200점 이상이 있으면 우선 선택, 없으면 상위 20개 선택
-        qualified = [s for s in scored if s['total_score'] >= 200]
-        if len(qualified) >= 20:
-            top_20 = sorted(qualified, key=lambda x: x['total_score'], reverse=True)[:20]
-            logger.info(f"Deep Scan 완료: 200점 이상 {len(qualified)}개 중 상위 20개 선택")
+        # 기준 점수 이상이 있으면 우선 선택, 없으면 상위 top_k개 선택
+        qualified = [s for s in scored if s['total_score'] >= self.ai_min_score]
+        if len(qualified) >= self.top_k:
+            top = sorted(qualified, key=lambda x: x['total_score'], reverse=True)[:self.top_k]
+            logger.info(
+                f"Deep Scan 완료: {self.ai_min_score}점 이상 {len(qualified)}개 중 상위 {self.top_k}개 선택"
+            )
         else:
-            top_20 = sorted(scored, key=lambda x: x['total_score'], reverse=True)[:20]
-            logger.info(f"Deep Scan 완료: 200점 이상 {len(qualified)}개뿐 → 전체 중 상위 {len(top_20)}개 선택")
-
-        return top_20
-
-    def _apply_basic_filters(self, stocks: List[Dict]) -> List[Dict]:
-        """기본 필터링"""
-        filtered = []
-        for s in stocks:
-            if s.get('trading_value', 0) < self.min_trading_value:
-                continue
-            if any(c in s.get('status', '') for c in self.exclude_conditions):
-                continue
-            filtered.append(s)
-        return filtered
-
-    async def _collect_detailed_data(self, stock: Dict) -> Dict:
-        """종목 상세 데이터 수집"""
-        code = stock['code']
-        try:
-            quote = await self.api.get_quote(code)
-            orderbook = await self.api.get_orderbook(code)
-
-            return {
-                **stock,
-                'current_price': quote.get('price', 0),
-                'volume_change_pct': stock.get('volume_change', 0),
-                'price_change_pct': stock.get('price_change', 0),
-                'high_proximity_pct': quote.get('high_proximity', 0),
-                'foreign_consecutive_days': stock.get('foreign_days', 0),
-                'institute_buy_billion': stock.get('institute_buy', 0) / 100000000,
-                'bid_ask_ratio': self._calc_bid_ask_ratio(orderbook),
-                'trade_strength': quote.get('strength', 100),
-            }
-        except Exception as e:
-            logger.error(f"데이터 수집 실패 ({code}): {e}")
-            return stock
-
-    def _calc_bid_ask_ratio(self, orderbook: Dict) -> float:
-        """호가 비율 계산"""
-        try:
-            bid = sum(b.get('volume', 0) for b in orderbook.get('bids', []))
-            ask = sum(a.get('volume', 0) for a in orderbook.get('asks', []))
-            return (bid / ask) * 100 if ask > 0 else 0
-        except:
-            return 0
-
-
-__all__ = ["StockScanner"]
+            top = sorted(scored, key=lambda x: x['total_score'], reverse=True)[:self.top_k]
+            logger.info(
+                f"Deep Scan 완료: {self.ai_min_score}점 이상 {len(qualified)}개뿐 "
+                f"→ 전체 중 상위 {len(top)}개 선택"
+            )
+
+        return top
+
+    def _build_plan(self) -> List[Tuple[List[str], ScoringFactor]]:
+        """
+        평가 순서 계획
+
+        추가 조회 비용이 낮은 항목부터 (비용이 같으면 최대 가중 점수가 큰 항목 먼저)
+        평가해 점수 상한이 빨리 좁혀지도록 한다.
+
+        Returns:
+            [(새로 조회할 소스 목록, 평가 항목)]
+        """
+        remaining = list(self.scorer.factors)
+        fetched = set()
+        plan = []
+
+        def order_key(factor: ScoringFactor):
+            cost = sum(self.sources[s].cost for s in factor.sources if s not in fetched)
+            return cost, -self.scorer.max_weighted_score(factor)
+
+        while remaining:
+            factor = min(remaining, key=order_key)
+            new_sources = [s for s in factor.sources if s not in fetched]
+            plan.append((new_sources, factor))
+            fetched.update(new_sources)
+            remaining.remove(factor)
+
+        return plan
+
+    def _base_record(self, stock: Dict) -> Dict:
+        """Fast Scan 데이터 → 평가용 종목 데이터"""
+        return {
+            **stock,
+            'current_price': stock.get('price', 0),
+            'volume_change_pct': stock.get('volume_change', 0),
+            'price_change_pct': stock.get('price_change', 0),
+        }
+
+    def _optimistic_score(self, stock: Dict) -> float:
+        """낙관 점수: 조회 비용 없는 항목 점수 + 나머지 항목 최대 점수"""
+        record = self._base_record(stock)
+        score = 0.0
+        for new_sources, factor in self._plan:
+            if sum(self.sources[s].cost for s in new_sources) > 0:
+                break
+            score += factor.score(record) * self.scorer.weight(factor)
+            score -= self.scorer.max_weighted_score(factor)
+        return score + self._max_total_score
+
+    async def _collect_detailed_data(self, stock: Dict, context: ScanContext) -> Dict:
+        """
+        종목 상세 데이터 수집 (분기 한정)
+
+        항목을 계획 순서대로 평가하면서 '현재 점수 + 남은 항목 최대 점수'가
+        기준 점수(ai_analysis_min_score) 또는 현재 상위 top_k 번째 점수에
+        못 미치면 이후 조회를 생략한다.
+        """
+        record = self._base_record(stock)
+
+        partial = 0.0
+        upper_remaining = self._max_total_score
+        fetched = False
+        for new_sources, factor in self._plan:
+            cost = sum(self.sources[s].cost for s in new_sources)
+            threshold = max(self.ai_min_score, context.kth_score())
+            if cost > 0 and partial + upper_remaining < threshold:
+                record['pruned'] = True
+                context.pruned += 1
+                if not fetched:
+                    context.skipped += 1
+                return record
+
+            for name in new_sources:
+                try:
+                    await self.sources[name].fetch(record, context)
+                except Exception as e:
+                    logger.warning(f"{name} 조회 실패 ({record['code']}): {e}")
+            fetched = fetched or cost > 0
+
+            partial += factor.score(record) * self.scorer.weight(factor)
+            upper_remaining -= self.scorer.max_weighted_score(factor)
+
+        context.add_result(partial)
+        return record
+
+
+__all__ = ["StockScanner", "FastScanResult"]
@@ -0,0 +1,297 @@
+"""
+틱/분봉 이력 저장소
+종목/일자별 고정 폭 레코드 파일을 메모리 매핑해 장중 추가 기록, 읽기는 복사 없는 NumPy 뷰
+
+파일: {root}/{YYYYMMDD}/{종목코드}.{tick|bar}
+    HEADER (매직, 레코드 크기, 레코드 수) + 레코드 배열 (용량 초과 시 2배 확장)
+"""
+
+import mmap
+import os
+import struct
+import time
+import numpy as np
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from src.utils.logger import logger
+
+
+# 체결 틱 (volume: 체결량, 매수체결 +, 매도체결 -)
+TICK_DTYPE = np.dtype([
+    ('ts', '<i8'),           # 수신 시각 (epoch ns)
+    ('price', '<f8'),
+    ('volume', '<i8'),
+    ('cum_volume', '<i8'),   # 누적 거래량
+])
+
+# 분봉 (ts: 봉 시작 시각)
+BAR_DTYPE = np.dtype([
+    ('ts', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<i8'),
+    ('value', '<f8'),        # 거래대금 (원)
+])
+
+KINDS = {'tick': TICK_DTYPE, 'bar': BAR_DTYPE}
+
+# 종류별 초기 레코드 용량 (부족하면 2배씩 확장) - 1분봉은 하루 약 400개
+DEFAULT_CAPACITY = {'tick': 4096, 'bar': 512}
+
+MAGIC = b"KWHIST01"
+# 매직, 레코드 크기, 레코드 수 (64바이트로 패딩 → 레코드 정렬)
+HEADER = struct.Struct('<8sIxxxxq')
+HEADER_SIZE = 64
+
+
+class SeriesFile:
+    """
+    종목/일자/종류별 추가 전용 레코드 파일 (쓰기용)
+
+    레코드를 먼저 쓰고 헤더의 레코드 수를 나중에 갱신 → 다른 프로세스 읽기는 항상 완성된 레코드만 봄
+    """
+
+    def __init__(self, path: Path, dtype: np.dtype, capacity: int = 512):
+        self.path = path
+        self.dtype = dtype
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = os.fstat(self._fd).st_size
+        if size < HEADER_SIZE:
+            self.count = 0
+            self._map(capacity)
+            self._mmap[:HEADER.size] = HEADER.pack(MAGIC, dtype.itemsize, 0)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            self.count = _read_header(self.path, os.read(self._fd, HEADER.size), dtype)
+            self._map(max(capacity, (size - HEADER_SIZE) // dtype.itemsize))
+
+    def _map(self, capacity: int):
+        """파일 크기 확장 + 재매핑 (이전 매핑은 확장 전에 닫음 - Windows는 매핑 중 파일 크기 변경 불가)"""
+        self._release()
+        length = HEADER_SIZE + capacity * self.dtype.itemsize
+        if os.name != 'nt':
+            os.ftruncate(self._fd, length)
+        # Windows는 파일보다 큰 길이로 매핑하면 파일이 그 크기로 확장됨
+        self._mmap = mmap.mmap(self._fd, length)
+        self.capacity = capacity
+        # frombuffer는 매핑의 버퍼를 점유 → 뷰가 남아 있는 동안 매핑이 닫히지 않음
+        self._records = np.frombuffer(self._mmap, dtype=self.dtype, count=capacity, offset=HEADER_SIZE)
+
+    def _release(self):
+        """현재 매핑 닫기 (내보낸 뷰가 남아 있으면 닫지 않고 참조만 해제 → 뷰 해제 시 정리)"""
+        old = getattr(self, '_mmap', None)
+        self._records = None
+        self._mmap = None
+        if old is not None:
+            try:
+                old.close()
+            except BufferError:
+                pass
+
+    def _set_count(self, count: int):
+        self.count = count
+        struct.pack_into('<q', self._mmap, 16, count)
+
+    def append(self, record: Tuple):
+        """레코드 1개 추가 (dtype 필드 순서의 튜플)"""
+        if self.count == self.capacity:
+            self._map(self.capacity * 2)
+        self._records[self.count] = record
+        self._set_count(self.count + 1)
+
+    def extend(self, records: np.ndarray):
+        """레코드 배열 추가"""
+        needed = self.count + len(records)
+        if needed > self.capacity:
+            capacity = self.capacity
+            while capacity < needed:
+                capacity *= 2
+            self._map(capacity)
+        self._records[self.count:needed] = records
+        self._set_count(needed)
+
+    def view(self) -> np.ndarray:
+        """기록된 레코드 뷰 (복사 없음, 읽기 전용)"""
+        records = self._records[:self.count]
+        records.flags.writeable = False
+        return records
+
+    def flush(self):
+        self._mmap.flush()
+
+    def close(self):
+        self.flush()
+        self._release()
+        os.close(self._fd)
+
+
+def _read_header(path: Path, header: bytes, dtype: np.dtype) -> int:
+    magic, itemsize, count = HEADER.unpack(header[:HEADER.size])
+    if magic != MAGIC or itemsize != dtype.itemsize:
+        raise ValueError(f"이력 파일 형식 불일치: {path}")
+    return count
+
+
+class HistoryStore:
+    """
+    이력 저장소
+
+    - 쓰기: append_tick / append_bar (같은 종목·일자 파일은 열린 상태 유지)
+    - 읽기: ticks / bars / lookback → 구조화 NumPy 뷰 (필드 접근: view['price'])
+      같은 프로세스에서 기록 중인 파일은 쓰기 매핑을 그대로, 그 외는 읽기 전용 매핑을 반환
+    """
+
+    def __init__(self, root: str = "data/history", capacity: Optional[Dict[str, int]] = None):
+        self.root = Path(root)
+        self.capacity = {**DEFAULT_CAPACITY, **(capacity or {})}   # 종류별 초기 용량
+        self._writers: Dict[Tuple[str, str, str], SeriesFile] = {}
+        self._write_day = ""
+
+        # 수신 시각 → 일자 변환 캐시 (당일 범위)
+        self._day = ""
+        self._day_start_ns = 0
+        self._day_end_ns = 0
+
+        logger.info(f"이력 저장소 초기화: {self.root}")
+
+    def _day_of(self, ts_ns: int) -> str:
+        if not self._day_start_ns <= ts_ns < self._day_end_ns:
+            moment = datetime.fromtimestamp(ts_ns / 1e9)
+            start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+            self._day = start.strftime('%Y%m%d')
+            self._day_start_ns = int(start.timestamp() * 1e9)
+            self._day_end_ns = int((start + timedelta(days=1)).timestamp() * 1e9)
+        return self._day
+
+    def _path(self, day: str, code: str, kind: str) -> Path:
+        return self.root / day / f"{code}.{kind}"
+
+    def writer(self, code: str, kind: str, day: str) -> SeriesFile:
+        key = (day, code, kind)
+        series = self._writers.get(key)
+        if series is None:
+            if day != self._write_day:
+                # 일자 변경 시 이전 일자 파일 닫기
+                for old in [k for k in self._writers if k[0] != day]:
+                    self._writers.pop(old).close()
+                self._write_day = day
+            series = self._writers[key] = SeriesFile(
+                self._path(day, code, kind), KINDS[kind], self.capacity[kind]
+            )
+        return series
+
+    # 쓰기
+
+    def append_tick(
+        self,
+        code: str,
+        price: float,
+        volume: int,
+        cum_volume: int = 0,
+        ts_ns: Optional[int] = None
+    ):
+        """체결 틱 기록 (ts_ns 기본: 현재 시각)"""
+        if ts_ns is None:
+            ts_ns = time.time_ns()
+        self.writer(code, 'tick', self._day_of(ts_ns)).append((ts_ns, price, volume, cum_volume))
+
+    def append_bar(
+        self,
+        code: str,
+        ts_ns: int,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: int,
+        value: float = 0.0
+    ):
+        """완성된 분봉 기록"""
+        self.writer(code, 'bar', self._day_of(ts_ns)).append((ts_ns, open_, high, low, close, volume, value))
+
+    def rewrite(self, code: str, kind: str, records: np.ndarray, day: Optional[str] = None):
+        """종목/일자 파일 전체 교체 (장 마감 후 대사 보정용, 기존 읽기 매핑은 이전 내용 유지)"""
+        day = day or self._today()
+        series = self._writers.pop((day, code, kind), None)
+        if series is not None:
+            series.close()
+
+        records = np.asarray(records, dtype=KINDS[kind])
+        path = self._path(day, code, kind)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, records.dtype.itemsize, len(records)).ljust(HEADER_SIZE, b'\0'))
+            f.write(records.tobytes())
+        os.replace(tmp_path, path)
+
+    # 읽기
+
+    def _today(self) -> str:
+        return datetime.now().strftime('%Y%m%d')
+
+    def read(self, code: str, kind: str, day: Optional[str] = None) -> np.ndarray:
+        """종목/일자 레코드 뷰 (없으면 빈 배열)"""
+        day = day or self._today()
+        series = self._writers.get((day, code, kind))
+        if series is not None:
+            return series.view()
+
+        path = self._path(day, code, kind)
+        dtype = KINDS[kind]
+        if not path.exists() or path.stat().st_size < HEADER_SIZE:
+            return np.empty(0, dtype=dtype)
+        with open(path, 'rb') as f:
+            count = _read_header(path, f.read(HEADER.size), dtype)
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', offset=HEADER_SIZE, shape=(count,))
+
+    def ticks(self, code: str, day: Optional[str] = None) -> np.ndarray:
+        return self.read(code, 'tick', day)
+
+    def bars(self, code: str, day: Optional[str] = None) -> np.ndarray:
+        return self.read(code, 'bar', day)
+
+    def lookback(
+        self,
+        code: str,
+        kind: str,
+        seconds: float,
+        now_ns: Optional[int] = None
+    ) -> np.ndarray:
+        """최근 seconds초 레코드 (당일 기준, 복사 없는 슬라이스)"""
+        now_ns = now_ns if now_ns is not None else time.time_ns()
+        records = self.read(code, kind, self._day_of(now_ns))
+        start = np.searchsorted(records['ts'], now_ns - int(seconds * 1e9), side='left')
+        return records[start:]
+
+    def days(self) -> List[str]:
+        """기록된 일자 목록"""
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and p.name.isdigit())
+
+    def codes(self, day: str, kind: str = 'bar') -> List[str]:
+        """일자별 기록 종목"""
+        return sorted(p.stem for p in (self.root / day).glob(f"*.{kind}"))
+
+    def flush(self):
+        for series in self._writers.values():
+            series.flush()
+
+    def close(self):
+        """열린 파일 모두 닫기 (세션 종료 시)"""
+        for series in self._writers.values():
+            series.close()
+        if self._writers:
+            logger.info(f"이력 저장소 종료: {len(self._writers)}개 파일")
+        self._writers.clear()
+
+
+__all__ = ["HistoryStore", "SeriesFile", "TICK_DTYPE", "BAR_DTYPE"]
@@ -0,0 +1,202 @@
+"""
+계좌 상태 모델
+실시간 잔고(04)/주문체결(00) 스트림으로 갱신, REST 조회는 주기적 대사에만 사용
+"""
+
+import time
+from typing import Dict, Any, List, Optional, Set
+from src.kiwoom.field_decoder import to_abs_float, to_price
+from src.utils.config_loader import load_config
+from src.utils.logger import logger
+
+
+class Holding:
+    """보유 종목 상태"""
+
+    __slots__ = ('stock_code', 'stock_name', 'quantity', 'avg_price', 'current_price')
+
+    def __init__(self, stock_code: str, stock_name: str, quantity: int,
+                 avg_price: float, current_price: float):
+        self.stock_code = stock_code
+        self.stock_name = stock_name
+        self.quantity = quantity
+        self.avg_price = avg_price
+        self.current_price = current_price
+
+    @property
+    def investment(self) -> float:
+        """매수금액"""
+        return self.avg_price * self.quantity
+
+    @property
+    def valuation(self) -> float:
+        """평가금액"""
+        return self.current_price * self.quantity
+
+
+class AccountState:
+    """계좌 상태 (스트림 증분 갱신 + REST 대사)"""
+
+    def __init__(self):
+        config = load_config("config").get('monitoring', {})
+        # REST 대사 주기 (초) - 스트림 정상 시 이 주기로만 REST 조회
+        self.reconcile_interval = config.get('account_reconcile_interval', 120)
+        # 대사 시 예수금 보정 로그 기준 (원)
+        self.cash_tolerance = config.get('account_cash_tolerance', 10000)
+
+        self.cash = 0.0            # 예수금
+        self.rest_total_asset = 0  # 최근 대사 시 추정예탁자산
+        self._asset_at_reconcile = 0.0
+        self.holdings: Dict[str, Holding] = {}
+
+        # 주문별 누적 체결량 (중복 이벤트 방지)
+        self._order_filled: Dict[str, int] = {}
+
+        self.last_reconciled: Optional[float] = None  # monotonic
+        self.last_stream_update: Optional[float] = None
+        self.drift_reasons: List[str] = []
+
+        # 통계
+        self.stream_updates = 0
+        self.reconcile_count = 0
+
+    # 조회
+
+    @property
+    def total_investment(self) -> float:
+        """총 매수금액"""
+        return sum(h.investment for h in self.holdings.values())
+
+    @property
+    def total_valuation(self) -> float:
+        """총 평가금액"""
+        return sum(h.valuation for h in self.holdings.values())
+
+    @property
+    def total_asset(self) -> float:
+        """추정 총자산 (예수금 + 평가금액)"""
+        return self.cash + self.total_valuation
+
+    @property
+    def estimated_total_asset(self) -> float:
+        """추정예탁자산 (최근 대사값 + 이후 스트림 변동분)"""
+        return self.rest_total_asset + (self.total_asset - self._asset_at_reconcile)
+
+    def needs_reconcile(self) -> bool:
+        """REST 대사 필요 여부 (최초, 주기 도래, 드리프트 감지)"""
+        if self.last_reconciled is None or self.drift_reasons:
+            return True
+        return time.monotonic() - self.last_reconciled >= self.reconcile_interval
+
+    def flag_drift(self, reason: str):
+        """드리프트 기록 → 다음 주기에 REST 대사"""
+        if reason not in self.drift_reasons:
+            self.drift_reasons.append(reason)
+            logger.warning(f"계좌 상태 드리프트 감지: {reason}")
+
+    def check_positions(self, expected: Dict[str, int], pending_codes: Set[str]):
+        """
+        전략 포지션과 보유 수량 비교
+
+        Args:
+            expected: {stock_code: 수량} 전략 포지션
+            pending_codes: 미체결 주문이 있는 종목 (비교 제외)
+        """
+        for code in set(expected) | set(self.holdings):
+            if code in pending_codes:
+                continue
+            qty = expected.get(code, 0)
+            held = self.holdings.get(code)
+            held_qty = held.quantity if held else 0
+            if held_qty != qty:
+                self.flag_drift(f"{code} 수량 불일치 (포지션 {qty}주, 잔고 {held_qty}주)")
+
+    # 실시간 스트림
+
+    def on_balance(self, values: Dict[str, Any]):
+        """잔고(04) 실시간 데이터 반영"""
+        code = values.get('9001', '').lstrip('A')
+        if not code:
+            return
+
+        quantity = to_price(values.get('930'))
+        if quantity <= 0:
+            self.holdings.pop(code, None)
+        else:
+            holding = self.holdings.get(code)
+            avg_price = to_price(values.get('931'))
+            current_price = to_price(values.get('10')) or avg_price
+            if holding is None:
+                self.holdings[code] = Holding(code, values.get('302', '').strip(),
+                                              quantity, avg_price, current_price)
+            else:
+                holding.quantity = quantity
+                holding.avg_price = avg_price or holding.avg_price
+                holding.current_price = current_price
+
+        self._touch()
+
+    def on_execution(self, values: Dict[str, Any]):
+        """주문체결(00) 실시간 데이터 반영 (체결 금액만큼 예수금 증감)"""
+        if values.get('913', '').strip() != '체결':
+            return
+
+        order_no = values.get('9203', '').strip()
+        cum_qty = to_price(values.get('911'))
+        fill_qty = cum_qty - self._order_filled.get(order_no, 0)
+        if fill_qty <= 0:
+            return
+        self._order_filled[order_no] = cum_qty
+
+        fill_price = to_price(values.get('914')) or to_price(values.get('910'))
+        amount = fill_price * fill_qty
+
+        # 매도수구분 (1: 매도, 2: 매수) - 수수료/세금은 REST 대사에서 보정
+        if values.get('907') == '1':
+            self.cash += amount
+        else:
+            self.cash -= amount
+
+        self._touch()
+
+    def on_price(self, stock_code: str, price: float):
+        """현재가 반영 (평가금액 계산용)"""
+        holding = self.holdings.get(stock_code)
+        if holding is not None and price > 0:
+            holding.current_price = price
+
+    # REST 대사
+
+    def reconcile(self, balance: Dict[str, Any], info: Dict[str, Any],
+                  holdings: List[Dict[str, Any]]):
+        """REST 조회 결과로 상태 전체 갱신 (스트림 누적 오차 보정)"""
+        cash = to_price(balance.get('entr'))
+        if self.last_reconciled is not None and abs(cash - self.cash) > self.cash_tolerance:
+            logger.info(f"예수금 보정: {int(self.cash):,}원 → {cash:,}원")
+        self.cash = cash
+        self.rest_total_asset = to_price(info.get('prsm_dpst_aset_amt'))
+
+        self.holdings = {}
+        for h in holdings:
+            code = (h.get('stk_cd') or h.get('sht_cd') or '').lstrip('A')
+            quantity = to_price(h.get('rmnd_qty') or h.get('remn_qty'))
+            if not code or quantity <= 0:
+                continue
+            avg_price = to_abs_float(h.get('pur_pric') or h.get('avg_unpr'))
+            current_price = to_abs_float(h.get('cur_prc') or h.get('prsn_rate')) or avg_price
+            self.holdings[code] = Holding(
+                code, (h.get('stk_nm') or h.get('pdno_hngl_nm') or '').strip(),
+                quantity, avg_price, current_price
+            )
+
+        self._asset_at_reconcile = self.total_asset
+        self.drift_reasons = []
+        self.last_reconciled = time.monotonic()
+        self.reconcile_count += 1
+
+    def _touch(self):
+        self.last_stream_update = time.monotonic()
+        self.stream_updates += 1
+
+
+__all__ = ["Holding", "AccountState"]
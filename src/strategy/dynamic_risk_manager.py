@@ -3,7 +3,7 @@
 원금 대비 잔고 비율에 따라 투자 전략을 동적으로 조정
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from src.utils.config_loader import load_config
 from src.utils.logger import logger
 
@@ -11,8 +11,8 @@ from src.utils.logger import logger
 class DynamicRiskManager:
     """원금 기반 동적 리스크 관리"""
 
-    def __init__(self):
-        self.config = load_config("config")
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config or load_config("config")
         self.trading_config = self.config['trading']
         self.initial_capital = self.trading_config['initial_capital']
         self.dynamic_config = self.trading_config['dynamic_risk_management']
@@ -21,6 +21,10 @@ class DynamicRiskManager:
         self.current_mode = "normal_mode"
         self.mode_params = {}
 
+        # 배치 진입 시 예약된 포지션 슬롯/투자금 (주문 전송 전까지 유지)
+        self.reserved_slots = 0
+        self.reserved_cash = 0.0
+
         logger.info(f"동적 리스크 관리 초기화 - 원금: {self.initial_capital:,}원")
         logger.info(f"동적 리스크 관리: {'활성화' if self.enabled else '비활성화'}")
 
@@ -174,6 +178,66 @@ class DynamicRiskManager:
             'position_size_pct': self.get_position_size_pct()
         }
 
+    def reserve_entries(
+        self,
+        current_capital: float,
+        num_positions: int,
+        candidates: List[Dict[str, Any]],
+        available_cash: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        배치 진입용 슬롯/투자금 예약 (await 없이 한 번에 처리 → 원자적)
+
+        Args:
+            current_capital: 현재 총 자산
+            num_positions: 현재 보유 + 미체결 매수 포지션 수
+            candidates: 매수 후보 (code, name, ai_analysis 포함)
+            available_cash: 주문 가능 현금 (예수금 - 미체결 매수 금액, None이면 현금 한도 미적용)
+
+        Returns:
+            예약 목록 [{'stock': 후보, 'budget': 투자 가능 금액, 'mode': 모드명}]
+            사용 후 release_entries()로 반환해야 함
+        """
+        self.update_risk_level(current_capital)
+        position_budget = current_capital * self.get_position_size_pct() / 100
+        mode_name = self.mode_params.get('mode_name', '')
+
+        reservations = []
+        for stock in candidates:
+            ai_confidence = stock.get('ai_analysis', {}).get('confidence', 0)
+            decision = self.should_buy(
+                current_capital,
+                num_positions + self.reserved_slots,
+                ai_confidence
+            )
+            if not decision['decision']:
+                logger.warning(f"[{decision['mode']}] 매수 불가 ({stock.get('name', '')}): {decision['reason']}")
+                continue
+
+            budget = position_budget
+            if available_cash is not None:
+                budget = min(budget, available_cash - self.reserved_cash)
+                if budget <= 0:
+                    logger.warning(f"[{mode_name}] 매수 불가 ({stock.get('name', '')}): 주문 가능 현금 부족")
+                    break
+
+            self.reserved_slots += 1
+            self.reserved_cash += budget
+            reservations.append({'stock': stock, 'budget': budget, 'mode': mode_name})
+
+        return reservations
+
+    def release_entries(self, reservations: List[Dict[str, Any]]):
+        """예약 슬롯/투자금 반환 (전송된 주문은 미체결 매수로 집계되므로 전액 반환)"""
+        self.reserved_slots = max(0, self.reserved_slots - len(reservations))
+        self.reserved_cash = max(0.0, self.reserved_cash - sum(r['budget'] for r in reservations))
+
+    def calculate_quantity(self, budget: float, stock_price: float) -> int:
+        """예약된 투자금 기준 수량 계산"""
+        if stock_price <= 0:
+            return 0
+        return int(budget / stock_price)
+
     def get_current_status(self) -> Dict[str, Any]:
         """현재 리스크 관리 상태 반환"""
         return {
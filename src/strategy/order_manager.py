@@ -0,0 +1,397 @@
+"""
+주문 관리 시스템
+주문 생명주기 추적, 실시간 체결(00) 기반 포지션 반영, 미체결 주문 정리
+"""
+
+import asyncio
+from datetime import datetime
+from itertools import count
+from typing import Dict, Any, List, Optional, Set, Callable
+from src.kiwoom.field_decoder import to_price
+from src.kiwoom.rest_client import KiwoomRestClient
+from src.strategy.trading_strategy import TradingStrategy
+from src.utils.config_loader import load_config
+from src.utils.logger import logger
+
+
+class Order:
+    """주문 정보"""
+
+    # 주문 상태
+    SUBMITTED = "SUBMITTED"            # 전송 (접수 전)
+    ACCEPTED = "ACCEPTED"              # 접수
+    PARTIAL = "PARTIAL"                # 부분 체결
+    FILLED = "FILLED"                  # 전량 체결
+    CANCEL_PENDING = "CANCEL_PENDING"  # 취소 요청
+    CANCELLED = "CANCELLED"            # 취소 확인
+    REJECTED = "REJECTED"              # 거부
+    UNKNOWN = "UNKNOWN"                # 미체결 목록에 없음 (계좌 대사로 확정)
+
+    ACTIVE_STATES = (SUBMITTED, ACCEPTED, PARTIAL, CANCEL_PENDING)
+
+    __slots__ = (
+        'order_no', 'stock_code', 'stock_name', 'side', 'quantity', 'price',
+        'filled_qty', 'filled_amount', 'status', 'submitted_at', 'updated_at',
+        'reprice_count', 'reprice_on_cancel', 'timer'
+    )
+
+    def __init__(
+        self,
+        order_no: str,
+        stock_code: str,
+        stock_name: str,
+        side: str,
+        quantity: int,
+        price: int,
+        reprice_count: int = 0
+    ):
+        self.order_no = order_no
+        self.stock_code = stock_code
+        self.stock_name = stock_name
+        self.side = side  # 'BUY' | 'SELL'
+        self.quantity = quantity
+        self.price = price
+        self.filled_qty = 0
+        self.filled_amount = 0.0
+        self.status = self.SUBMITTED
+        self.submitted_at = datetime.now()
+        self.updated_at = self.submitted_at
+        self.reprice_count = reprice_count
+        self.reprice_on_cancel = False
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def remaining_qty(self) -> int:
+        """미체결 수량"""
+        return self.quantity - self.filled_qty
+
+    @property
+    def avg_fill_price(self) -> float:
+        """평균 체결가"""
+        return self.filled_amount / self.filled_qty if self.filled_qty else 0.0
+
+    @property
+    def is_active(self) -> bool:
+        """진행 중 주문 여부"""
+        return self.status in self.ACTIVE_STATES
+
+    def to_dict(self) -> Dict[str, Any]:
+        """딕셔너리 변환"""
+        return {
+            'order_no': self.order_no,
+            'stock_code': self.stock_code,
+            'stock_name': self.stock_name,
+            'side': self.side,
+            'quantity': self.quantity,
+            'price': self.price,
+            'filled_qty': self.filled_qty,
+            'avg_fill_price': self.avg_fill_price,
+            'status': self.status,
+            'submitted_at': self.submitted_at.isoformat(),
+            'updated_at': self.updated_at.isoformat()
+        }
+
+    def __repr__(self):
+        return (
+            f"Order(no={self.order_no}, code={self.stock_code}, side={self.side}, "
+            f"qty={self.filled_qty}/{self.quantity}, price={self.price}, status={self.status})"
+        )
+
+
+class OrderManager:
+    """주문 관리자 (WebSocket 주문체결 스트림 기반)"""
+
+    def __init__(
+        self,
+        api_client: KiwoomRestClient,
+        strategy: TradingStrategy,
+        price_provider: Optional[Callable[[str], Optional[float]]] = None
+    ):
+        self.api = api_client
+        self.strategy = strategy
+        self.price_provider = price_provider
+
+        config = load_config("config").get('order_management', {})
+        self.stale_order_timeout = config.get('stale_order_timeout', 30)
+        self.reprice_buy = config.get('reprice_buy', False)
+        self.reprice_sell = config.get('reprice_sell', True)
+        self.max_reprices = config.get('max_reprices', 2)
+
+        # 주문 인덱스
+        self.orders: Dict[str, Order] = {}              # {order_no: Order}
+        self.orders_by_code: Dict[str, Set[str]] = {}   # {stock_code: {order_no}} (진행 중)
+        self._temp_ids = count(1)
+
+        # 포지션 청산 완료 콜백 (구독 해제 등)
+        self.on_position_closed: List[Callable] = []
+
+        logger.info(
+            f"주문 관리자 초기화 - 미체결 정리 {self.stale_order_timeout}초, "
+            f"재호가(매수/매도): {self.reprice_buy}/{self.reprice_sell}"
+        )
+
+    # 주문 전송
+
+    async def submit_buy(self, stock_code: str, stock_name: str, quantity: int, price: int,
+                         reprice_count: int = 0) -> Optional[Order]:
+        """매수 주문 전송 (포지션은 체결 시 반영)"""
+        result = await self.api.order_buy(stock_code, quantity, price)
+        return self._register(result, stock_code, stock_name, 'BUY', quantity, price, reprice_count)
+
+    async def submit_sell(self, stock_code: str, stock_name: str, quantity: int, price: int,
+                          reprice_count: int = 0) -> Optional[Order]:
+        """매도 주문 전송 (포지션은 체결 시 반영)"""
+        result = await self.api.order_sell(stock_code, quantity, price)
+        return self._register(result, stock_code, stock_name, 'SELL', quantity, price, reprice_count)
+
+    def _register(self, result: Dict[str, Any], stock_code: str, stock_name: str, side: str,
+                  quantity: int, price: int, reprice_count: int) -> Order:
+        """전송된 주문 등록"""
+        order_no = str(result.get('ord_no') or result.get('order_no') or '')
+        if not order_no:
+            # 주문번호 미수신: 접수 이벤트 도착 시 종목/구분으로 매칭
+            order_no = f"PENDING-{next(self._temp_ids)}"
+
+        order = Order(order_no, stock_code, stock_name, side, quantity, price, reprice_count)
+        self._index(order)
+        self._schedule_stale_check(order)
+
+        logger.info(f"주문 등록: {order}")
+        return order
+
+    # 조회
+
+    def get_order(self, order_no: str) -> Optional[Order]:
+        """주문 조회"""
+        return self.orders.get(order_no)
+
+    def get_active_orders(self, stock_code: Optional[str] = None) -> List[Order]:
+        """진행 중 주문 조회"""
+        if stock_code is not None:
+            order_nos = self.orders_by_code.get(stock_code, ())
+        else:
+            order_nos = [no for nos in self.orders_by_code.values() for no in nos]
+        return [self.orders[no] for no in order_nos]
+
+    def has_pending(self, stock_code: str, side: Optional[str] = None) -> bool:
+        """진행 중 주문 존재 여부"""
+        return any(
+            side is None or order.side == side
+            for order in self.get_active_orders(stock_code)
+        )
+
+    def pending_buy_count(self) -> int:
+        """미체결 매수 주문 종목 수 (신규 진입 예정)"""
+        return sum(
+            1 for code, nos in self.orders_by_code.items()
+            if code not in self.strategy.positions
+            and any(self.orders[no].side == 'BUY' for no in nos)
+        )
+
+    def pending_buy_amount(self) -> float:
+        """미체결 매수 주문 잔량 금액 (주문가 기준)"""
+        return sum(
+            order.remaining_qty * order.price
+            for order in self.orders.values()
+            if order.side == 'BUY' and order.is_active
+        )
+
+    # 주문체결 스트림 (00)
+
+    async def on_execution(self, data: Dict[str, Any]):
+        """주문체결(00) 실시간 데이터 처리"""
+        values = data.get('values', {})
+        order_no = values.get('9203', '').strip()
+        status = values.get('913', '').strip()
+        order_kind = values.get('905', '')
+
+        # 취소 확인: 원주문 잔량 취소
+        if '취소' in order_kind:
+            if status in ('확인', '취소'):
+                self._on_cancelled(values.get('904', '').strip())
+            return
+
+        order = self.orders.get(order_no) or self._bind_pending(order_no, values)
+        if order is None:
+            logger.debug(f"관리 대상 아닌 주문 체결 이벤트: {order_no} {status}")
+            return
+
+        order.updated_at = datetime.now()
+
+        if status == '접수':
+            if order.status == Order.SUBMITTED:
+                order.status = Order.ACCEPTED
+            return
+
+        if status == '거부':
+            order.status = Order.REJECTED
+            logger.warning(f"주문 거부: {order} - {values.get('919', '')}")
+            self._finish(order)
+            return
+
+        if status == '체결':
+            self._on_fill(order, values)
+
+    def _on_fill(self, order: Order, values: Dict[str, Any]):
+        """체결 반영 (누적 체결량 기준으로 중복 이벤트에 안전)"""
+        cum_qty = to_price(values.get('911'))
+        fill_qty = cum_qty - order.filled_qty
+        if fill_qty <= 0:
+            return
+
+        fill_price = to_price(values.get('914')) or to_price(values.get('910')) or order.price
+        order.filled_qty = cum_qty
+        order.filled_amount += fill_price * fill_qty
+
+        if order.side == 'BUY':
+            self.strategy.apply_buy_fill(
+                order.stock_code, order.stock_name, fill_qty, fill_price, order_no=order.order_no
+            )
+        else:
+            self.strategy.apply_sell_fill(
+                order.stock_code, fill_qty, fill_price, order_no=order.order_no
+            )
+
+        unfilled = values.get('902')
+        remaining = to_price(unfilled) if unfilled not in (None, '') else order.remaining_qty
+        if remaining <= 0:
+            order.status = Order.FILLED
+            logger.info(f"전량 체결: {order} 평균가 {order.avg_fill_price:,.0f}원")
+            self._finish(order)
+        elif order.status != Order.CANCEL_PENDING:
+            order.status = Order.PARTIAL
+            logger.info(f"부분 체결: {order}")
+
+    def _on_cancelled(self, orig_order_no: str):
+        """원주문 취소 확인 → 필요 시 잔량 재호가"""
+        order = self.orders.get(orig_order_no)
+        if order is None or not order.is_active:
+            return
+
+        order.status = Order.CANCELLED
+        order.updated_at = datetime.now()
+        logger.info(f"주문 취소 확인: {order}")
+        self._finish(order)
+
+        if order.reprice_on_cancel and order.remaining_qty > 0:
+            asyncio.ensure_future(self._reprice(order))
+
+    def _bind_pending(self, order_no: str, values: Dict[str, Any]) -> Optional[Order]:
+        """주문번호 없이 등록된 주문을 접수 이벤트와 매칭"""
+        if not order_no:
+            return None
+
+        stock_code = values.get('9001', '').lstrip('A')
+        side = 'SELL' if values.get('907') == '1' else 'BUY'
+        for order in self.get_active_orders(stock_code):
+            if order.order_no.startswith('PENDING-') and order.side == side:
+                self._unindex(order)
+                order.order_no = order_no
+                self._index(order)
+                return order
+        return None
+
+    # 미체결 정리 (타이머 기반, 폴링 없음)
+
+    def _schedule_stale_check(self, order: Order):
+        """주문별 미체결 타임아웃 예약"""
+        if self.stale_order_timeout <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        order.timer = loop.call_later(
+            self.stale_order_timeout,
+            lambda: asyncio.ensure_future(self._handle_stale(order))
+        )
+
+    async def _handle_stale(self, order: Order):
+        """타임아웃된 주문 취소 (재호가 대상이면 취소 확인 후 재주문)"""
+        order.timer = None
+        if order.status not in (Order.SUBMITTED, Order.ACCEPTED, Order.PARTIAL):
+            return
+
+        try:
+            open_orders = await self.api.get_open_orders()
+            open_nos = {str(o.get('ord_no') or o.get('order_no') or '') for o in open_orders}
+
+            if order.order_no not in open_nos:
+                # 체결/취소 이벤트 유실 가능성 - 계좌 대사에서 확정
+                order.status = Order.UNKNOWN
+                logger.warning(f"미체결 목록에 없는 주문: {order} (계좌 대사 필요)")
+                self._finish(order)
+                return
+
+            reprice = self.reprice_sell if order.side == 'SELL' else self.reprice_buy
+            order.reprice_on_cancel = reprice and order.reprice_count < self.max_reprices
+            order.status = Order.CANCEL_PENDING
+
+            logger.info(f"미체결 주문 취소: {order} ({self.stale_order_timeout}초 경과)")
+            await self.api.cancel_order(order.order_no)
+
+        except Exception as e:
+            logger.error(f"미체결 주문 정리 실패 ({order.order_no}): {e}", exc_info=True)
+            if order.status == Order.CANCEL_PENDING:
+                order.status = Order.PARTIAL if order.filled_qty else Order.ACCEPTED
+            self._schedule_stale_check(order)
+
+    async def _reprice(self, order: Order):
+        """취소된 잔량을 현재가로 재주문"""
+        price = self.price_provider(order.stock_code) if self.price_provider else None
+        if not price:
+            logger.warning(f"재호가 불가 (현재가 없음): {order}")
+            return
+
+        qty = order.remaining_qty
+        if order.side == 'SELL':
+            position = self.strategy.get_position(order.stock_code)
+            qty = min(qty, position.quantity) if position else 0
+        if qty <= 0:
+            return
+
+        try:
+            submit = self.submit_sell if order.side == 'SELL' else self.submit_buy
+            new_order = await submit(
+                order.stock_code, order.stock_name, qty, int(price),
+                reprice_count=order.reprice_count + 1
+            )
+            logger.info(f"재호가 주문: {order.order_no} → {new_order.order_no} @{int(price):,}원")
+        except Exception as e:
+            logger.error(f"재호가 주문 실패 ({order.stock_name}): {e}", exc_info=True)
+
+    # 인덱스 관리
+
+    def _index(self, order: Order):
+        self.orders[order.order_no] = order
+        self.orders_by_code.setdefault(order.stock_code, set()).add(order.order_no)
+
+    def _unindex(self, order: Order):
+        self.orders.pop(order.order_no, None)
+        nos = self.orders_by_code.get(order.stock_code)
+        if nos is not None:
+            nos.discard(order.order_no)
+            if not nos:
+                del self.orders_by_code[order.stock_code]
+
+    def _finish(self, order: Order):
+        """주문 종료 처리 (진행 중 인덱스에서 제거)"""
+        if order.timer is not None:
+            order.timer.cancel()
+            order.timer = None
+
+        nos = self.orders_by_code.get(order.stock_code)
+        if nos is not None:
+            nos.discard(order.order_no)
+            if not nos:
+                del self.orders_by_code[order.stock_code]
+
+        if (order.side == 'SELL' and order.filled_qty > 0
+                and order.stock_code not in self.strategy.positions):
+            for callback in self.on_position_closed:
+                try:
+                    result = callback(order.stock_code)
+                    if asyncio.iscoroutine(result):
+                        asyncio.ensure_future(result)
+                except Exception as e:
+                    logger.error(f"청산 콜백 오류 ({order.stock_code}): {e}")
+
+
+__all__ = ["Order", "OrderManager"]
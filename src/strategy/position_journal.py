@@ -0,0 +1,162 @@
+"""
+포지션/체결 저널
+SQLite 기반 영속 저장소 (재시작 시 포지션 복원)
+"""
+
+import sqlite3
+from datetime import datetime, date
+from pathlib import Path
+from typing import List, Optional, Tuple
+from src.utils.logger import logger
+
+
+class PositionJournal:
+    """포지션 및 체결 저널 (SQLite, WAL 모드)"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS positions (
+        stock_code        TEXT PRIMARY KEY,
+        stock_name        TEXT NOT NULL,
+        quantity          INTEGER NOT NULL,
+        entry_price       REAL NOT NULL,
+        entry_time        TEXT NOT NULL,
+        stop_loss_price   REAL NOT NULL DEFAULT 0,
+        take_profit_price REAL NOT NULL DEFAULT 0,
+        updated_at        TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS fills (
+        id           INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts           TEXT NOT NULL,
+        stock_code   TEXT NOT NULL,
+        side         TEXT NOT NULL,
+        quantity     INTEGER NOT NULL,
+        price        REAL NOT NULL,
+        order_no     TEXT NOT NULL DEFAULT '',
+        realized_pnl REAL NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_fills_ts ON fills (ts);
+    CREATE INDEX IF NOT EXISTS idx_fills_code ON fills (stock_code);
+    """
+
+    def __init__(self, path: str = "data/trading_journal.db"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 단일 이벤트 루프 스레드에서만 사용 (autocommit 대신 명시적 트랜잭션)
+        self.conn = sqlite3.connect(str(self.path), isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")  # 커밋 시 fsync (크래시 안전)
+        self.conn.executescript(self.SCHEMA)
+
+        logger.info(f"포지션 저널 초기화: {self.path}")
+
+    def upsert_position(self, record: Tuple) -> None:
+        """포지션 저장 (Position.to_record() 형식)"""
+        with self._transaction():
+            self.conn.execute(
+                "INSERT OR REPLACE INTO positions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (*record, datetime.now().isoformat())
+            )
+
+    def delete_position(self, stock_code: str) -> None:
+        """포지션 삭제"""
+        with self._transaction():
+            self.conn.execute("DELETE FROM positions WHERE stock_code = ?", (stock_code,))
+
+    def record_fill(
+        self,
+        stock_code: str,
+        side: str,
+        quantity: int,
+        price: float,
+        order_no: str = "",
+        realized_pnl: float = 0.0,
+        position_record: Optional[Tuple] = None,
+        ts: Optional[datetime] = None
+    ) -> None:
+        """
+        체결 기록 (포지션 변경과 하나의 트랜잭션으로 저장)
+
+        Args:
+            side: 'BUY' | 'SELL'
+            position_record: 체결 후 포지션 (None이면 포지션 삭제)
+        """
+        ts = ts or datetime.now()
+        with self._transaction():
+            self.conn.execute(
+                "INSERT INTO fills (ts, stock_code, side, quantity, price, order_no, realized_pnl) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (ts.isoformat(), stock_code, side, quantity, price, order_no, realized_pnl)
+            )
+            if position_record is None:
+                self.conn.execute("DELETE FROM positions WHERE stock_code = ?", (stock_code,))
+            else:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO positions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*position_record, ts.isoformat())
+                )
+
+    def load_positions(self) -> List[Tuple]:
+        """저장된 포지션 레코드 로드"""
+        cursor = self.conn.execute(
+            "SELECT stock_code, stock_name, quantity, entry_price, entry_time, "
+            "stop_loss_price, take_profit_price FROM positions"
+        )
+        return cursor.fetchall()
+
+    def load_realized_pnl(self, day: Optional[date] = None) -> float:
+        """특정일 실현손익 합계 (기본: 오늘)"""
+        day = day or date.today()
+        cursor = self.conn.execute(
+            "SELECT COALESCE(SUM(realized_pnl), 0) FROM fills WHERE substr(ts, 1, 10) = ?",
+            (day.isoformat(),)
+        )
+        return float(cursor.fetchone()[0])
+
+    def get_fills(self, stock_code: Optional[str] = None, limit: int = 100) -> List[Tuple]:
+        """체결 내역 조회 (최신순)"""
+        if stock_code:
+            cursor = self.conn.execute(
+                "SELECT ts, stock_code, side, quantity, price, order_no, realized_pnl "
+                "FROM fills WHERE stock_code = ? ORDER BY id DESC LIMIT ?",
+                (stock_code, limit)
+            )
+        else:
+            cursor = self.conn.execute(
+                "SELECT ts, stock_code, side, quantity, price, order_no, realized_pnl "
+                "FROM fills ORDER BY id DESC LIMIT ?",
+                (limit,)
+            )
+        return cursor.fetchall()
+
+    def close(self) -> None:
+        """저널 종료"""
+        self.conn.close()
+        logger.info("포지션 저널 종료")
+
+    def _transaction(self):
+        """명시적 트랜잭션 (BEGIN IMMEDIATE ... COMMIT/ROLLBACK)"""
+        return _Transaction(self.conn)
+
+
+class _Transaction:
+    """sqlite3 트랜잭션 컨텍스트"""
+
+    __slots__ = ('conn',)
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+        return False
+
+
+__all__ = ["PositionJournal"]
@@ -4,7 +4,9 @@
 """
 
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from src.strategy.account_state import Holding
+from src.strategy.position_journal import PositionJournal
 from src.utils.config_loader import load_config
 from src.utils.logger import logger
 
@@ -12,9 +14,15 @@ from src.utils.logger import logger
 class TradingStrategy:
     """거래 전략"""
 
-    def __init__(self):
-        self.trading_config = load_config("trading_rules")
-        self.config = load_config("config")
+    def __init__(
+        self,
+        journal: Optional[PositionJournal] = None,
+        trading_config: Optional[Dict[str, Any]] = None,
+        config: Optional[Dict[str, Any]] = None
+    ):
+        # 설정 직접 전달 가능 (백테스트/파라미터 탐색)
+        self.trading_config = trading_config or load_config("trading_rules")
+        self.config = config or load_config("config")
 
         # 손익 설정
         self.stop_loss_pct = self.trading_config['profit_loss']['stop_loss_percentage']
@@ -34,13 +42,18 @@ class TradingStrategy:
         self.positions: Dict[str, Position] = {}
         self.daily_realized_pnl = 0.0
 
+        # 포지션/체결 저널 (재시작 시 복원)
+        self.journal = journal
+        if self.journal:
+            self._restore_from_journal()
+
         logger.info("거래 전략 초기화")
 
-    def should_buy(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
-        """매수 판단"""
+    def should_buy(self, stock_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+        """매수 판단 (now: 판단 시각, 기본 현재 시각)"""
         # 기본 체크
         checks = {
-            'time_check': self._check_trading_time(),
+            'time_check': self._check_trading_time(now),
             'position_limit': len(self.positions) < self.max_positions,
             'daily_loss_limit': self.daily_realized_pnl > -self.max_daily_loss,
             'score_check': stock_data.get('total_score', 0) >= 200,
@@ -64,8 +77,13 @@ class TradingStrategy:
             'reason': self._get_buy_reason(checks)
         }
 
-    def should_sell(self, position: 'Position', current_price: float) -> Dict[str, Any]:
-        """매도 판단"""
+    def should_sell(
+        self,
+        position: 'Position',
+        current_price: float,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """매도 판단 (now: 판단 시각, 기본 현재 시각)"""
         pnl_pct = position.get_pnl_percentage(current_price)
 
         # 손절 체크
@@ -87,7 +105,7 @@ class TradingStrategy:
             }
 
         # 장 마감 임박 (15:10 이후)
-        if self._is_market_closing():
+        if self._is_market_closing(now):
             return {
                 'decision': True,
                 'reason': 'MARKET_CLOSING',
@@ -139,7 +157,9 @@ class TradingStrategy:
         stock_code: str,
         stock_name: str,
         quantity: int,
-        entry_price: float
+        entry_price: float,
+        entry_time: Optional[datetime] = None,
+        order_no: str = ""
     ) -> 'Position':
         """포지션 추가"""
         position = Position(
@@ -147,14 +167,24 @@ class TradingStrategy:
             stock_name=stock_name,
             quantity=quantity,
             entry_price=entry_price,
-            entry_time=datetime.now()
+            entry_time=entry_time or datetime.now()
         )
 
         self.positions[stock_code] = position
+        if self.journal:
+            self.journal.record_fill(
+                stock_code, 'BUY', quantity, entry_price,
+                order_no=order_no, position_record=position.to_record()
+            )
         logger.info(f"포지션 추가: {stock_name} {quantity}주 @{entry_price}원")
         return position
 
-    def remove_position(self, stock_code: str, exit_price: float) -> Optional[float]:
+    def remove_position(
+        self,
+        stock_code: str,
+        exit_price: float,
+        order_no: str = ""
+    ) -> Optional[float]:
         """포지션 제거 및 손익 계산"""
         if stock_code not in self.positions:
             return None
@@ -163,6 +193,12 @@ class TradingStrategy:
         realized_pnl = position.get_realized_pnl(exit_price)
         self.daily_realized_pnl += realized_pnl
 
+        if self.journal:
+            self.journal.record_fill(
+                stock_code, 'SELL', position.quantity, exit_price,
+                order_no=order_no, realized_pnl=realized_pnl, position_record=None
+            )
+
         logger.info(
             f"포지션 청산: {position.stock_name} "
             f"손익={realized_pnl:+,.0f}원 ({position.get_pnl_percentage(exit_price):+.2f}%)"
@@ -171,6 +207,70 @@ class TradingStrategy:
         del self.positions[stock_code]
         return realized_pnl
 
+    def apply_buy_fill(
+        self,
+        stock_code: str,
+        stock_name: str,
+        quantity: int,
+        price: float,
+        order_no: str = "",
+        fill_time: Optional[datetime] = None
+    ) -> 'Position':
+        """매수 체결 반영 (신규 진입 또는 평균단가 갱신)"""
+        position = self.positions.get(stock_code)
+        if position is None:
+            return self.add_position(
+                stock_code, stock_name, quantity, price, entry_time=fill_time, order_no=order_no
+            )
+
+        total_qty = position.quantity + quantity
+        position.entry_price = (
+            position.entry_price * position.quantity + price * quantity
+        ) / total_qty
+        position.quantity = total_qty
+
+        if self.journal:
+            self.journal.record_fill(
+                stock_code, 'BUY', quantity, price,
+                order_no=order_no, position_record=position.to_record()
+            )
+        logger.info(
+            f"추가 체결: {position.stock_name} +{quantity}주 @{price}원 "
+            f"(보유 {total_qty}주, 평단 {position.entry_price:,.0f}원)"
+        )
+        return position
+
+    def apply_sell_fill(
+        self,
+        stock_code: str,
+        quantity: int,
+        price: float,
+        order_no: str = ""
+    ) -> Optional[float]:
+        """매도 체결 반영 (부분 청산 지원), 실현손익 반환"""
+        position = self.positions.get(stock_code)
+        if position is None:
+            return None
+
+        if quantity >= position.quantity:
+            return self.remove_position(stock_code, price, order_no=order_no)
+
+        realized_pnl = (price - position.entry_price) * quantity
+        self.daily_realized_pnl += realized_pnl
+        position.quantity -= quantity
+
+        if self.journal:
+            self.journal.record_fill(
+                stock_code, 'SELL', quantity, price,
+                order_no=order_no, realized_pnl=realized_pnl,
+                position_record=position.to_record()
+            )
+        logger.info(
+            f"부분 청산: {position.stock_name} -{quantity}주 @{price}원 "
+            f"손익={realized_pnl:+,.0f}원 (잔여 {position.quantity}주)"
+        )
+        return realized_pnl
+
     def get_position(self, stock_code: str) -> Optional['Position']:
         """포지션 조회"""
         return self.positions.get(stock_code)
@@ -179,22 +279,88 @@ class TradingStrategy:
         """모든 포지션 조회"""
         return list(self.positions.values())
 
+    def _restore_from_journal(self):
+        """저널에서 포지션 및 당일 실현손익 복원"""
+        for record in self.journal.load_positions():
+            position = Position.from_record(record)
+            self.positions[position.stock_code] = position
+
+        self.daily_realized_pnl = self.journal.load_realized_pnl()
+
+        if self.positions:
+            logger.info(
+                f"저널에서 포지션 복원: {len(self.positions)}개 "
+                f"(당일 실현손익 {self.daily_realized_pnl:+,.0f}원)"
+            )
+
+    def sync_with_holdings(self, holdings: Dict[str, Holding]) -> Dict[str, int]:
+        """
+        저널 포지션을 실제 보유종목(잔고 조회)에 맞춤 (재시작 시 봇 밖에서 변경된 포지션 정리)
+
+        - 보유하지 않은 포지션: 삭제
+        - 수량이 다른 포지션: 잔고 수량/평균단가로 갱신
+        - 저널에 없는 보유종목: 포지션 복원 (진입시각 알 수 없음 - 현재 시각)
+        체결이 아니므로 체결 기록 없이 저널 포지션만 저장
+
+        Returns:
+            {'removed': 삭제 수, 'adjusted': 수량 보정 수, 'restored': 복원 수}
+        """
+        summary = {'removed': 0, 'adjusted': 0, 'restored': 0}
+
+        for code in [c for c in self.positions if c not in holdings]:
+            position = self.positions.pop(code)
+            if self.journal:
+                self.journal.delete_position(code)
+            summary['removed'] += 1
+            logger.warning(f"잔고에 없는 포지션 삭제: {position.stock_name} {position.quantity}주")
+
+        for code, holding in holdings.items():
+            position = self.positions.get(code)
+            if position is None:
+                position = self.positions[code] = Position(
+                    stock_code=code,
+                    stock_name=holding.stock_name,
+                    quantity=holding.quantity,
+                    entry_price=holding.avg_price,
+                    entry_time=datetime.now()
+                )
+                summary['restored'] += 1
+                logger.warning(
+                    f"저널에 없는 보유종목 복원: {holding.stock_name} {holding.quantity}주 "
+                    f"@{holding.avg_price:,.0f}원"
+                )
+            elif position.quantity != holding.quantity:
+                logger.warning(
+                    f"포지션 수량 보정: {position.stock_name} {position.quantity}주 → {holding.quantity}주 "
+                    f"(평단 {position.entry_price:,.0f}원 → {holding.avg_price:,.0f}원)"
+                )
+                position.quantity = holding.quantity
+                if holding.avg_price > 0:
+                    position.entry_price = holding.avg_price
+                summary['adjusted'] += 1
+            else:
+                continue
+            if self.journal:
+                self.journal.upsert_position(position.to_record())
+
+        return summary
+
     def reset_daily_pnl(self):
         """일일 손익 초기화 (매일 장 시작 전)"""
         self.daily_realized_pnl = 0.0
         logger.info("일일 손익 초기화")
 
-    def _check_trading_time(self) -> bool:
+    def _check_trading_time(self, now: Optional[datetime] = None) -> bool:
         """거래 가능 시간 체크"""
-        now = datetime.now().time()
+        now = (now or datetime.now()).time()
         market_open = datetime.strptime(self.market_open, "%H:%M:%S").time()
         new_buy_close = datetime.strptime(self.new_buy_close, "%H:%M:%S").time()
 
         return market_open <= now <= new_buy_close
 
-    def _is_market_closing(self) -> bool:
+    def _is_market_closing(self, now: Optional[datetime] = None) -> bool:
         """장 마감 임박 체크 (15:10 이후)"""
-        now = datetime.now().time()
+        now = (now or datetime.now()).time()
         closing_time = datetime.strptime("15:10:00", "%H:%M:%S").time()
         return now >= closing_time
 
@@ -221,6 +387,11 @@ class TradingStrategy:
 class Position:
     """포지션 정보"""
 
+    __slots__ = (
+        'stock_code', 'stock_name', 'quantity', 'entry_price', 'entry_time',
+        'stop_loss_price', 'take_profit_price'
+    )
+
     def __init__(
         self,
         stock_code: str,
@@ -268,6 +439,33 @@ class Position:
             'investment': self.get_total_investment()
         }
 
+    def to_record(self) -> Tuple:
+        """저널 저장용 레코드 (필드 순서 고정)"""
+        return (
+            self.stock_code,
+            self.stock_name,
+            self.quantity,
+            self.entry_price,
+            self.entry_time.isoformat(),
+            self.stop_loss_price,
+            self.take_profit_price
+        )
+
+    @classmethod
+    def from_record(cls, record: Tuple) -> 'Position':
+        """저널 레코드에서 복원"""
+        code, name, quantity, entry_price, entry_time, stop_loss, take_profit = record
+        position = cls(
+            stock_code=code,
+            stock_name=name,
+            quantity=int(quantity),
+            entry_price=float(entry_price),
+            entry_time=datetime.fromisoformat(entry_time)
+        )
+        position.stop_loss_price = float(stop_loss)
+        position.take_profit_price = float(take_profit)
+        return position
+
     def __repr__(self):
         return (
             f"Position(code={self.stock_code}, name={self.stock_name}, "
@@ -328,7 +526,11 @@ class PortfolioManager:
             'positions': position_details
         }
 
-    def check_all_positions(self, current_prices: Dict[str, float]) -> List[Dict[str, Any]]:
+    def check_all_positions(
+        self,
+        current_prices: Dict[str, float],
+        now: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
         """모든 포지션 손익 체크"""
         sell_signals = []
 
@@ -337,7 +539,7 @@ class PortfolioManager:
             if not current_price:
                 continue
 
-            sell_decision = self.strategy.should_sell(position, current_price)
+            sell_decision = self.strategy.should_sell(position, current_price, now)
             if sell_decision['decision']:
                 sell_signals.append({
                     'position': position,